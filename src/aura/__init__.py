@@ -1,3 +1,11 @@
 from .aura import Spell, Aura
 
-__all__ = ["Spell", "Aura"]
+__all__ = ["Spell", "Aura", "main"]
+
+
+def main() -> None:
+    """Runs the `aura` command line interface."""
+    # Imported on demand so importing the library does not load the benchmarks
+    from .cli import main as run
+
+    raise SystemExit(run())
@@ -0,0 +1,3 @@
+from aura import main
+
+main()
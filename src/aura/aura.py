@@ -1,16 +1,25 @@
+import copy
+import math
+import time
+from collections import deque
+
 try:
-    from typing import Type, TypeVar
+    from typing import Callable, Iterable, Type, TypeVar
 
     T = TypeVar("T")
 except ImportError:
     pass
 
+from aura.metrics import AuraMetrics
+from aura.timing import TimingWheel
 from aura.values import MinMaxValue, ValueWithModifiers
 
 
 class SpellLevelScaler:
     """Scaling logic for spell levels."""
 
+    __slots__ = ("_value_coefficient", "_percentage_coefficient")
+
     def __init__(
         self, value_coefficient: float = 0.25, percentage_coefficient: float = 0.05
     ) -> None:
@@ -36,16 +45,77 @@ class SpellLevelScaler:
         return min(base_percentage + self._percentage_coefficient * (level - 1), 1)
 
 
+_SPELL_NAMES: dict[type, str] = {}
+
+
 class Spell:
     """Base class for all spells."""
 
+    __slots__ = ("name", "_tags", "_level", "_multiplier_version")
+
     LEVEL_SCALER = SpellLevelScaler()
     """Shared level scaler for all spells. Overridable if needed."""
 
+    PURE_MULTIPLIER: bool = False
+    """Set on spells whose modify_event only multiplies the amount of the events they
+    handle by event_multiplier. Auras fold these factors into one per event type and
+    apply it before the other spells handling the event, without calling
+    modify_event. Spells call multiplier_changed when their factor changes other than
+    through their level. Reset for subclasses overriding modify_event without setting
+    it again."""
+
+    _multiplier_generation: int = 0
+    """Moves on whenever the factor of a PURE_MULTIPLIER spell changes, so auras can
+    skip checking their multipliers while it stays put. Shared by all spells."""
+
+    HANDLED_EVENTS: "tuple[type[AuraEvent], ...] | None" = None
+    """The event types (including subclasses) passed to modify_event. When not set,
+    spells that override modify_event receive every event and other spells none.
+    Reset for subclasses overriding modify_event without setting it again."""
+
+    TIMED: bool = False
+    """Set on spells whose update only checks their duration attribute. The aura binds
+    the duration to its timing wheel and removes the spell once it expires instead of
+    updating the spell every frame. Reset for subclasses overriding update without
+    setting it again."""
+
+    DAMAGE_OVER_TIME: bool = False
+    """Set on spells whose update raises a pooled DamageEvent every frame over a
+    duration. Auras merge the damage raised by these spells during one update into a
+    single event when coalesce_damage is set, and keep the damage of other spells,
+    such as instant hits, separate. Reset for subclasses overriding update without
+    setting it again."""
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Resets the hook flags inherited from a parent spell that no longer hold
+        for the hooks the subclass overrides. Flags set by the subclass itself are
+        kept."""
+        super().__init_subclass__(**kwargs)
+        overridden = cls.__dict__
+        if "modify_event" in overridden and "HANDLED_EVENTS" not in overridden:
+            # The override may handle more event types than the parent
+            cls.HANDLED_EVENTS = None
+        if "modify_event" in overridden and "PURE_MULTIPLIER" not in overridden:
+            # The override may do more than multiply the amount
+            cls.PURE_MULTIPLIER = False
+        if "update" in overridden and "TIMED" not in overridden:
+            # The override may do more than wait for the duration
+            cls.TIMED = False
+        if "update" in overridden and "DAMAGE_OVER_TIME" not in overridden:
+            # The override may raise other damage than the periodic ticks
+            cls.DAMAGE_OVER_TIME = False
+
     def __init__(self, tags: list[str]) -> None:
-        self.name: str = self.__class__.__name__.replace("Spell", "")
+        cls = self.__class__
+        name = _SPELL_NAMES.get(cls)
+        if name is None:
+            # Shared per class so spells do not each carry a copy of the name
+            name = _SPELL_NAMES[cls] = cls.__name__.replace("Spell", "")
+        self.name: str = name
         self._tags: list[str] = tags
         self._level: int = 1
+        # Moves on with every change of the factor returned by event_multiplier
+        self._multiplier_version: int = 0
 
     def start(self, aura: "Aura") -> None:
         """Called when the spell is added to the aura. Can be used to set up initial state.
@@ -62,10 +132,44 @@ class Spell:
         """Called when the spell is removed from the aura. Can be used to clean up state."""
         pass
 
+    def linear_effect(
+        self, aura: "Aura"
+    ) -> "tuple[type[AuraEvent] | None, float, float] | None":
+        """Describes the spell's effect as a constant rate, used by Aura.advance to
+        integrate the effect instead of updating the spell in small steps.
+
+        Returns:
+            None if the effect cannot be integrated. Otherwise a tuple of the event type
+            the spell emits (DamageEvent or HealEvent, or None for spells that change
+            magic directly), the amount per second and the time in seconds the rate
+            holds for, such as the spell's remaining duration.
+        """
+        return None
+
+    def fast_forward(self, aura: "Aura", elapsed_time: float) -> bool:
+        """Moves the spell forward in time without applying the effect described by
+        linear_effect, which the aura integrates. Only called when linear_effect
+        returned a tuple. Return True if the spell should be removed from the aura."""
+        raise NotImplementedError()
+
+    def event_multiplier(self, event_type: "type[AuraEvent]") -> "float | None":
+        """Returns the factor modify_event applies to the amount of events of a type it
+        handles, or None if modify_event does more than scale the amount."""
+        return None
+
     def modify_event(self, aura: "Aura", event: "AuraEvent") -> None:
-        """Modify an incoming event if needed, will only be called for active spells."""
+        """Modify an incoming event if needed, will only be called for active spells
+        and for the event types in HANDLED_EVENTS."""
         pass
 
+    @classmethod
+    def handles_event(cls, event_type: type) -> bool:
+        """Returns True if modify_event should be called for events of the given type."""
+        handled = cls.HANDLED_EVENTS
+        if handled is None:
+            return cls.modify_event is not Spell.modify_event
+        return issubclass(event_type, handled)
+
     def _update_level(self, level: int) -> None:
         """Called when the spell's level is changed, allowing for adjustments based on level."""
         raise NotImplementedError()
@@ -84,6 +188,13 @@ class Spell:
         """Sets the level of the spell, affecting its potency."""
         self._level = max(1, value)
         self._update_level(self._level)
+        if self.PURE_MULTIPLIER:
+            self.multiplier_changed()
+
+    def multiplier_changed(self) -> None:
+        """Tells auras that the factor returned by event_multiplier changed."""
+        self._multiplier_version += 1
+        Spell._multiplier_generation += 1
 
 
 class SpellTags:
@@ -95,8 +206,29 @@ class SpellTags:
 class AuraEvent:
     """Base class for events affecting the aura."""
 
+    __slots__ = ("_canceled", "_pool")
+
     def __init__(self) -> None:
         self._canceled: bool = False
+        self._pool: "EventPool | None" = None
+
+    def freeze(self) -> "AuraEvent":
+        """Returns an event that is safe to keep after processing finishes.
+
+        Pooled events are reused once the aura has processed them, so they are copied.
+        Other events are returned as is.
+        """
+        if self._pool is None:
+            return self
+
+        frozen = copy.copy(self)
+        frozen._pool = None
+        return frozen
+
+    @property
+    def is_pooled(self) -> bool:
+        """Returns True if the event will be reused after it is processed."""
+        return self._pool is not None
 
     @property
     def is_canceled(self) -> bool:
@@ -110,6 +242,8 @@ class AuraEvent:
 class DamageEvent(AuraEvent):
     """Event representing damage taken."""
 
+    __slots__ = ("amount",)
+
     def __init__(self, amount: float) -> None:
         """Initializes a damage event with a specific amount."""
         super().__init__()
@@ -119,6 +253,8 @@ class DamageEvent(AuraEvent):
 class HealEvent(AuraEvent):
     """Event representing healing received."""
 
+    __slots__ = ("amount",)
+
     def __init__(self, amount: float) -> None:
         """Initializes a heal event with a specific amount."""
         super().__init__()
@@ -128,6 +264,8 @@ class HealEvent(AuraEvent):
 class CastEvent(AuraEvent):
     """Event representing a spell cast attempt."""
 
+    __slots__ = ("spell",)
+
     def __init__(self, spell: Spell) -> None:
         """Initializes a cast event."""
         super().__init__()
@@ -137,6 +275,8 @@ class CastEvent(AuraEvent):
 class AddSpellEvent(AuraEvent):
     """Event representing a spell being added to the aura."""
 
+    __slots__ = ("spell",)
+
     def __init__(self, spell: Spell) -> None:
         """Initializes an adding spell event."""
         super().__init__()
@@ -146,52 +286,510 @@ class AddSpellEvent(AuraEvent):
 class RemoveSpellEvent(AuraEvent):
     """Event representing a spell being removed from the aura."""
 
+    __slots__ = ("spell",)
+
     def __init__(self, spell: Spell) -> None:
         """Initializes a removing spell event."""
         super().__init__()
         self.spell = spell
 
 
+class _SpellBatch(AuraEvent):
+    """Spell events of one type queued and dispatched together by Aura.add_spells and
+    Aura.remove_spells."""
+
+    __slots__ = ("events",)
+
+    def __init__(self, events: "list[AddSpellEvent] | list[RemoveSpellEvent]") -> None:
+        super().__init__()
+        self.events = events
+
+
+class _EventChain:
+    """The active spells handling an event type, with the factors of the
+    PURE_MULTIPLIER spells among them folded into one."""
+
+    __slots__ = (
+        "event_type",
+        "handlers",
+        "multipliers",
+        "factor",
+        "versions",
+        "generation",
+    )
+
+    def __init__(self, event_type: type, spells: "Iterable[Spell]") -> None:
+        self.event_type: type = event_type
+        # The spells whose modify_event is called, in spell order
+        self.handlers: list[Spell] = []
+        self.multipliers: list[Spell] = []
+        for spell in spells:
+            if spell.handles_event(event_type):
+                if spell.PURE_MULTIPLIER:
+                    self.multipliers.append(spell)
+                else:
+                    self.handlers.append(spell)
+        self.fold()
+
+    def fold(self) -> None:
+        """Multiplies the factors of the multipliers again."""
+        factor = 1.0
+        for spell in self.multipliers:
+            factor *= spell.event_multiplier(self.event_type)
+        self.factor: float = factor
+        # The factor versions of the multipliers that were folded
+        self.versions: list[int] = [
+            spell._multiplier_version for spell in self.multipliers
+        ]
+        self.generation: int = Spell._multiplier_generation
+
+    def refresh(self) -> bool:
+        """Folds the factors again if one of the multipliers changed since the last
+        fold. Called when the shared generation moved on, which any spell in any aura
+        may have caused.
+
+        Returns:
+            True if the factor was folded again.
+        """
+        self.generation = Spell._multiplier_generation
+        multipliers = self.multipliers
+        versions = self.versions
+        index = 0
+        count = len(multipliers)
+        while index < count:
+            if multipliers[index]._multiplier_version != versions[index]:
+                self.fold()
+                return True
+            index += 1
+        return False
+
+
 class EventListener:
     """Interface for objects that listen to aura events."""
 
+    __slots__ = ()
+
     def on_spell_event(self, aura: "Aura", event: AuraEvent) -> None:
-        """Called when an event occurs in the aura."""
+        """Called when an event occurs in the aura.
+        The event may be pooled and reused after this call, use event.freeze() to keep it.
+        """
         pass
 
+    def on_spell_events(self, aura: "Aura", events: list[AuraEvent]) -> None:
+        """Called once for the events of a batch of spells added or removed that were
+        not canceled. Calls on_spell_event for each event by default."""
+        for event in events:
+            self.on_spell_event(aura, event)
+
 
-class Spells:
-    """A collection manager for Spell objects."""
+class EventPool:
+    """Recycles events of a single type to avoid allocating an event per frame.
+
+    Aura.process_event releases pooled events back to their pool once processing
+    finishes, so a pooled event must not be used after it was processed.
+    """
 
-    def __init__(self, spells: list[Spell]) -> None:
-        self._spells: list[Spell] = spells
+    __slots__ = ("_event_type", "_free", "_created")
+
+    def __init__(self, event_type: "Type[AuraEvent]") -> None:
+        """Initializes an empty pool.
+
+        Args:
+            event_type: The type of events created by this pool.
+        """
+        self._event_type = event_type
+        # A list would free its storage whenever the last free event is taken
+        self._free: deque[AuraEvent] = deque()
+        self._created: int = 0
+
+    def acquire(self, *args) -> AuraEvent:
+        """Returns a free event, or a new one if none are free.
+
+        Args:
+            args: The arguments used to initialize the event.
+        """
+        free = self._free
+        if free:
+            event = free.pop()
+            # Calls spreading *args allocate, and most events take a single argument
+            if len(args) == 1:
+                event.__init__(args[0])
+            else:
+                event.__init__(*args)
+        else:
+            event = self._event_type(*args)
+            self._created += 1
+        event._pool = self
+        return event
+
+    def release(self, event: AuraEvent) -> None:
+        """Returns an event to the pool so it can be reused.
+
+        Args:
+            event: An event acquired from this pool.
+        """
+        if event._pool is self:
+            event._pool = None
+            self._free.append(event)
+
+    @property
+    def created(self) -> int:
+        """Returns the number of events this pool had to allocate."""
+        return self._created
+
+    def __len__(self) -> int:
+        """Returns the number of free events."""
+        return len(self._free)
+
+
+class TagMatch:
+    """How multiple tags are combined when querying spells by tag."""
+
+    ALL = "all"
+    """Spells that have all of the tags."""
+    ANY = "any"
+    """Spells that have at least one of the tags."""
+    NONE = "none"
+    """Spells that have none of the tags."""
+
+
+class AuraChange:
+    """Bits of the change mask of an aura, marking the parts of its state that
+    changed."""
+
+    MAGIC = 1
+    """The magic value or the minimum magic."""
+    MAX_MAGIC = 2
+    """The base maximum magic or its modifiers."""
+    CAST_DELAY = 4
+    """The base cast delay or its modifiers."""
+    SPELL_SET = 8
+    """Spells were added or removed."""
+    SPELL_FIELDS = 16
+    """Active spells updated or handled an event, which may change their state."""
+    ALL = 31
+
+    COUNT = 5
+    """The number of change bits."""
+
+
+class SpellSlots:
+    """An ordered collection of Spell objects without indexes.
+
+    Spells are stored in insertion order in slots keyed by spell identity. Removing a
+    spell leaves a tombstone in its slot, and the slots are compacted once no
+    iteration is in progress, so adding and removing spells are O(1) and iterating
+    is safe while spells are added or removed. Spells added during an iteration are
+    not visited by it. The same spell can be added more than once, each copy taking
+    a slot, and is removed one copy at a time, earliest first.
+    """
+
+    __slots__ = (
+        "_entries",
+        "_positions",
+        "_duplicates",
+        "_tombstones",
+        "_iterating",
+    )
+
+    def __init__(self, spells: "Iterable[Spell]" = ()) -> None:
+        # Spells in insertion order, None where a spell was removed
+        self._entries: list[Spell | None] = []
+        # Maps id(spell) to the slot of the spell's earliest copy in self._entries
+        self._positions: dict[int, int] = {}
+        # Maps id(spell) to the slots of further copies of the spell, if any
+        self._duplicates: dict[int, list[int]] = {}
+        self._tombstones: int = 0
+        self._iterating: int = 0
+        for spell in spells:
+            self._add(spell)
+
+    def _add(self, spell: Spell) -> bool:
+        """Appends a spell. Returns True if it is the spell's first copy."""
+        key = id(spell)
+        position = len(self._entries)
+        self._entries.append(spell)
+        if key in self._positions:
+            self._duplicates.setdefault(key, []).append(position)
+            return False
+
+        self._positions[key] = position
+        return True
+
+    def _remove(self, spell: Spell) -> bool:
+        """Removes the earliest copy of a spell. Returns False if the spell was not
+        present."""
+        key = id(spell)
+        position = self._positions.get(key)
+        if position is None:
+            return False
+
+        self._entries[position] = None
+        self._tombstones += 1
+        duplicates = self._duplicates.get(key)
+        if duplicates:
+            self._positions[key] = duplicates.pop(0)
+            if not duplicates:
+                del self._duplicates[key]
+        else:
+            del self._positions[key]
+        self._compact()
+        return True
+
+    def _copies(self, spell: Spell) -> int:
+        """Returns the number of copies of a spell in the collection."""
+        key = id(spell)
+        if key not in self._positions:
+            return 0
+        return 1 + len(self._duplicates.get(key, ()))
+
+    def _compact(self) -> None:
+        """Drops tombstones once they make up half of the slots, unless iterating."""
+        if self._iterating or self._tombstones * 2 < len(self._entries):
+            return
+
+        self._entries = [spell for spell in self._entries if spell is not None]
+        self._positions.clear()
+        self._duplicates.clear()
+        for position, spell in enumerate(self._entries):
+            key = id(spell)
+            if key in self._positions:
+                self._duplicates.setdefault(key, []).append(position)
+            else:
+                self._positions[key] = position
+        self._tombstones = 0
+
+    def _begin_iteration(self) -> list[Spell | None]:
+        """Defers compaction and returns the slots to iterate over.
+        Must be paired with _end_iteration."""
+        self._iterating += 1
+        return self._entries
+
+    def _end_iteration(self) -> None:
+        self._iterating -= 1
+        if self._tombstones:
+            self._compact()
+
+    def __contains__(self, spell: object) -> bool:
+        return id(spell) in self._positions
+
+    def __len__(self) -> int:
+        return len(self._entries) - self._tombstones
+
+    def __iter__(self):
+        entries = self._begin_iteration()
+        try:
+            # Spells appended during the iteration are not visited
+            for index in range(len(entries)):
+                spell = entries[index]
+                if spell is not None:
+                    yield spell
+        finally:
+            self._end_iteration()
+
+
+class Spells(SpellSlots):
+    """A collection manager for Spell objects.
+
+    Stores spells in insertion order like SpellSlots. Queries return each spell once.
+
+    Also keeps indexes from each tag, exact class and name to the spells they match
+    so queries only visit matching spells. Tags and names are indexed when a spell
+    is added to the collection.
+    """
+
+    __slots__ = (
+        "_tag_index",
+        "_class_index",
+        "_name_index",
+        "_subclasses",
+    )
+
+    def __init__(self, spells: "Iterable[Spell]" = ()) -> None:
+        # Each bucket maps id(spell) to the spell, keeping insertion order
+        self._tag_index: dict[str, dict[int, Spell]] = {}
+        self._class_index: dict[type, dict[int, Spell]] = {}
+        self._name_index: dict[str, dict[int, Spell]] = {}
+        # Indexed classes matching a queried class, cleared when the classes change
+        self._subclasses: dict[type, list[type]] = {}
+        super().__init__(spells)
+
+    def _add(self, spell: Spell) -> bool:
+        """Appends a spell and indexes it."""
+        if not super()._add(spell):
+            # Another copy of an indexed spell
+            return False
+
+        key = id(spell)
+        for tag in spell._tags:
+            Spells._bucket(self._tag_index, tag)[key] = spell
+        Spells._bucket(self._name_index, spell.name)[key] = spell
+        cls = type(spell)
+        if cls not in self._class_index:
+            self._subclasses.clear()
+        Spells._bucket(self._class_index, cls)[key] = spell
+        return True
+
+    def _remove(self, spell: Spell) -> bool:
+        """Removes the earliest copy of a spell and drops the spell from the indexes
+        once no copies remain. Returns False if the spell was not present."""
+        if not super()._remove(spell):
+            return False
+        key = id(spell)
+        if key in self._positions:
+            # Other copies remain
+            return True
+
+        for tag in spell._tags:
+            Spells._unindex(self._tag_index, tag, key)
+        if not Spells._unindex(self._name_index, spell.name, key):
+            # The spell was renamed after it was added
+            for name, bucket in self._name_index.items():
+                if key in bucket:
+                    Spells._unindex(self._name_index, name, key)
+                    break
+        if Spells._unindex(self._class_index, type(spell), key):
+            self._subclasses.clear()
+        return True
+
+    @staticmethod
+    def _bucket(index: dict, key) -> dict[int, Spell]:
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = {}
+        return bucket
+
+    @staticmethod
+    def _unindex(index: dict, key, spell_key: int) -> bool:
+        """Removes a spell from a bucket, dropping the bucket once empty.
+        Returns True if the spell was in the bucket."""
+        bucket = index.get(key)
+        if bucket is None or bucket.pop(spell_key, None) is None:
+            return False
+        if not bucket:
+            del index[key]
+        return True
+
+    def _in_order(self, found: dict[int, Spell]) -> list[Spell]:
+        """Returns the spells of a merged set of buckets in insertion order."""
+        return sorted(found.values(), key=lambda spell: self._positions[id(spell)])
+
+    def _matching_classes(self, cls: type) -> list[type]:
+        """Returns the indexed spell classes that are cls or one of its subclasses."""
+        classes = self._subclasses.get(cls)
+        if classes is None:
+            classes = [
+                indexed for indexed in self._class_index if issubclass(indexed, cls)
+            ]
+            self._subclasses[cls] = classes
+        return classes
 
     def get_by_name(self, name: str) -> list[Spell]:
         """Finds a spell by its name."""
-        return [spell for spell in self._spells if spell.name == name]
+        bucket = self._name_index.get(name)
+        if bucket is None:
+            return []
+        return list(bucket.values())
+
+    def get_by_tag(self, *tags: str, match: str = TagMatch.ALL) -> list[Spell]:
+        """Finds spells by tag, in the order they were added.
 
-    def get_by_tag(self, *tags: str) -> list[Spell]:
-        """Finds spells that have all of the specified tags."""
+        Args:
+            tags: The tags to look for. No tags matches no spells.
+            match: How the tags are combined, one of the TagMatch values.
+                Defaults to spells that have all of the tags.
+        """
+        if match == TagMatch.ANY and len(tags) > 1:
+            found: dict[int, Spell] = {}
+            for tag in tags:
+                bucket = self._tag_index.get(tag)
+                if bucket:
+                    found.update(bucket)
+            return self._in_order(found)
+
+        return list(self.iter_by_tag(*tags, match=match))
+
+    def iter_by_tag(self, *tags: str, match: str = TagMatch.ALL):
+        """Iterates over spells by tag without merging or sorting the matches.
+
+        Spells are yielded in the order they were added, except for TagMatch.ANY with
+        several tags where they are yielded grouped by the first matching tag. Spells
+        may be removed while iterating: removed spells are skipped and spells added
+        are not visited.
+
+        Args:
+            tags: The tags to look for. No tags matches no spells.
+            match: How the tags are combined, one of the TagMatch values.
+                Defaults to spells that have all of the tags.
+        """
         if not tags:
-            return []
-        return [
-            spell for spell in self._spells if all(tag in spell.tags for tag in tags)
-        ]
+            return
+
+        index = self._tag_index
+        if match == TagMatch.ALL:
+            smallest = index.get(tags[0])
+            for tag in tags:
+                bucket = index.get(tag)
+                if not bucket:
+                    return
+                if len(bucket) < len(smallest):
+                    smallest = bucket
+            # Copied, so spells can be removed from the buckets while iterating
+            for key, spell in tuple(smallest.items()):
+                for tag in tags:
+                    if key not in index.get(tag, ()):
+                        break
+                else:
+                    yield spell
+        elif match == TagMatch.ANY:
+            for position, tag in enumerate(tags):
+                bucket = index.get(tag)
+                if not bucket:
+                    continue
+                for key, spell in tuple(bucket.items()):
+                    if key not in bucket:
+                        # Removed by the caller while iterating
+                        continue
+                    for earlier in range(position):
+                        if key in index.get(tags[earlier], ()):
+                            break
+                    else:
+                        yield spell
+        elif match == TagMatch.NONE:
+            for spell in self:
+                key = id(spell)
+                for tag in tags:
+                    if key in index.get(tag, ()):
+                        break
+                else:
+                    yield spell
+        else:
+            raise ValueError(f"Unknown tag match: {match}")
 
     def get_by_class(self, cls: "Type[T]") -> "list[T]":
-        """Finds spells by their class type."""
-        matching = list()
-        for spell in self._spells:
-            if isinstance(spell, cls):
-                matching.append(spell)
+        """Finds spells by their class type, including subclasses, in the order they were added."""
+        classes = self._matching_classes(cls)
+        if not classes:
+            return []
+        if len(classes) == 1:
+            return list(self._class_index[classes[0]].values())
 
-        return matching
+        found: dict[int, Spell] = {}
+        for matching in classes:
+            found.update(self._class_index[matching])
+        return self._in_order(found)
 
-    def __len__(self) -> int:
-        return len(self._spells)
+    def count_by_tag(self, tag: str) -> int:
+        """Counts the spells with a tag without building a list."""
+        bucket = self._tag_index.get(tag)
+        return len(bucket) if bucket else 0
 
-    def __iter__(self):
-        return iter(self._spells)
+    def count_by_class(self, cls: type) -> int:
+        """Counts spells by their class type, including subclasses, without building a list."""
+        count = 0
+        for matching in self._matching_classes(cls):
+            count += len(self._class_index[matching])
+        return count
 
 
 class Aura:
@@ -200,6 +798,35 @@ class Aura:
     Handles incoming events (damage/healing) and updates spells over time.
     """
 
+    __slots__ = (
+        "magic",
+        "_spells",
+        "_ticking",
+        "_wheel",
+        "_expired",
+        "_expiring",
+        "_awake",
+        "_on_wake",
+        "_generation",
+        "_change_generations",
+        "_generation_read",
+        "_changes",
+        "_on_change",
+        "_cast_delay",
+        "_event_listeners",
+        "_handlers",
+        "_event_pools",
+        "_queue",
+        "_draining",
+        "_coalescing",
+        "_pending_damage",
+        "max_events_per_drain",
+        "coalesce_damage",
+        "metrics",
+        "_hook_timer",
+        "__weakref__",
+    )
+
     def __init__(self, min_magic: float, max_magic: float, cast_delay: float) -> None:
         """Initialize the Aura with magic bounds and cast delay.
 
@@ -208,11 +835,61 @@ class Aura:
             max_magic: The maximum value the magic attribute can reach.
             cast_delay: The base cast delay in seconds.
         """
-        self.magic = MinMaxValue(value=max_magic, min=min_magic, max=max_magic)
-        self._spell_list: list[Spell] = []
-        self._spells = Spells(self._spell_list)
-        self._cast_delay = ValueWithModifiers(base_value=cast_delay)
+        # The generation of the state, with the generation of each kind's last change
+        self._generation: int = 0
+        self._change_generations: list[int] = [0] * AuraChange.COUNT
+        # The generation only moves past a value that was read, so changes repeated
+        # every update between reads allocate no new integers
+        self._generation_read: bool = False
+        # The AuraChange bits set since the changes were last collected
+        self._changes: int = 0
+        self._on_change: "Callable[[Aura], None] | None" = None
+        self.magic = MinMaxValue(
+            value=max_magic,
+            min=min_magic,
+            max=max_magic,
+            value_changed=self._magic_changed,
+            max_changed=self._max_magic_changed,
+        )
+        self._spells = Spells()
+        # The active spells that are not TIMED and are updated every frame
+        self._ticking = SpellSlots()
+        # Expires modifiers and TIMED spells, advanced by update
+        self._wheel = TimingWheel()
+        # TIMED spells whose duration expired, removed on the next spell update
+        self._expired: list[Spell] = []
+        # Ticking spells that expired during a spell update, one entry per copy
+        self._expiring: list[Spell] = []
+        # Cleared by a scheduler that stops updating the aura while it is idle
+        self._awake: bool = True
+        self._on_wake: "Callable[[Aura], None] | None" = None
+        self._wheel.on_schedule = self._wake
+        self._cast_delay = ValueWithModifiers(
+            base_value=cast_delay, value_changed=self._cast_delay_changed
+        )
+        self.magic.max.modifiers.bind(self._wheel)
+        self._cast_delay.modifiers.bind(self._wheel)
         self._event_listeners: list[EventListener] = []
+        # Spells handling each event type, rebuilt when the active spells change
+        self._handlers: dict[type, _EventChain] = {}
+        self._event_pools: dict[type, EventPool] = {}
+        # Events waiting to be processed, in order. Unlike a list, a deque keeps its
+        # storage when emptied, so an event per frame allocates nothing.
+        self._queue: deque[AuraEvent] = deque()
+        self._draining: bool = False
+        self._coalescing: bool = False
+        self._pending_damage: DamageEvent | None = None
+        self.max_events_per_drain: int = 1000
+        """The most events processed in one drain of the event queue. Events past this
+        cap stay queued until the next event or update."""
+        self.coalesce_damage: bool = True
+        """Merge the pooled damage events raised by DAMAGE_OVER_TIME spells during one
+        update into a single event."""
+        self.metrics: "AuraMetrics | None" = None
+        """Counters of the events and spells of the aura and the durations of its
+        updates, or None while metrics are off."""
+        # Times the spell hooks while a TickWatchdog updates the aura
+        self._hook_timer: "_HookTimer | None" = None
 
     def add_spell(self, spell: Spell) -> None:
         """Adds a spell to the aura and starts it.
@@ -230,6 +907,33 @@ class Aura:
         """
         self.process_event(RemoveSpellEvent(spell))
 
+    def add_spells(self, spells: "Iterable[Spell]") -> None:
+        """Adds spells to the aura and starts them, processing their events as a
+        batch.
+
+        Each event passes through the spells handling it as they were when the batch
+        is processed, so spells of the batch do not modify the other events of the
+        batch. Events are still canceled one by one. Listeners are notified once with
+        the events that were not canceled.
+
+        Args:
+            spells: The spells to add.
+        """
+        events = [AddSpellEvent(spell) for spell in spells]
+        if events:
+            self.process_event(_SpellBatch(events))
+
+    def remove_spells(self, spells: "Iterable[Spell]") -> None:
+        """Removes spells from the aura and stops them, processing their events as a
+        batch like add_spells.
+
+        Args:
+            spells: The spells to remove.
+        """
+        events = [RemoveSpellEvent(spell) for spell in spells]
+        if events:
+            self.process_event(_SpellBatch(events))
+
     def cast_spell(self, spell: Spell) -> None:
         """Attempts to cast a spell, allow the spell and other active spells to react to it.
 
@@ -242,21 +946,244 @@ class Aura:
         """Processes an incoming event through all active spells.
 
         If an event is canceled by a spell, it is not applied to the magic value.
+        Pooled events are released back to their pool afterwards.
+
+        Events are queued and processed in order. Events raised while another event or
+        the spell updates are being processed, such as a spell adding another spell
+        from modify_event, are processed once the current work finishes.
 
         Args:
             event: The incoming event to process.
         """
-        for spell in self.spells:
-            spell.modify_event(self, event)
-            if event.is_canceled:
+        if not self._awake:
+            self._wake()
+        if self._coalescing and type(event) is DamageEvent and event._pool is not None:
+            pending = self._pending_damage
+            if pending is not None:
+                pending.amount += event.amount
+                event._pool.release(event)
                 return
+            self._pending_damage = event
+
+        self._queue.append(event)
+        if not self._draining:
+            self._drain()
+
+    def _wake(self) -> None:
+        """Tells the scheduler of a sleeping aura that it needs updates again."""
+        if self._awake:
+            return
+        self._awake = True
+        if self._on_wake is not None:
+            self._on_wake(self)
+
+    def _mark_changed(self, change: int) -> None:
+        """Records a change of the aura and tells the collector of changes the first
+        time the aura changes after a collection.
+
+        Args:
+            change: A single AuraChange bit.
+        """
+        if self._generation_read:
+            self._generation += 1
+            self._generation_read = False
+        self._change_generations[change.bit_length() - 1] = self._generation
+        if self._changes:
+            self._changes |= change
+            return
+        self._changes = change
+        if self._on_change is not None:
+            self._on_change(self)
+
+    def _magic_changed(self) -> None:
+        self._mark_changed(AuraChange.MAGIC)
+
+    def _max_magic_changed(self) -> None:
+        self._mark_changed(AuraChange.MAX_MAGIC)
+
+    def _cast_delay_changed(self) -> None:
+        self._mark_changed(AuraChange.CAST_DELAY)
+
+    def changes_since(self, generation: int) -> int:
+        """Returns the AuraChange bits of the state that changed after a generation.
+
+        Args:
+            generation: A generation returned earlier by the generation property, or -1
+                for all of the state.
+        """
+        changes = 0
+        for bit, changed in enumerate(self._change_generations):
+            if changed > generation:
+                changes |= 1 << bit
+        return changes
+
+    def collect_changes(self) -> int:
+        """Returns the AuraChange bits set since the last collection and clears them."""
+        changes = self._changes
+        self._changes = 0
+        return changes
+
+    def _drain(self) -> None:
+        """Processes queued events in order, up to max_events_per_drain events."""
+        queue = self._queue
+        self._draining = True
+        try:
+            # Counted up, small integers are cached where a countdown would allocate
+            limit = self.max_events_per_drain
+            processed = 0
+            while queue and processed < limit:
+                event = queue.popleft()
+                processed += 1
+                if type(event) is _SpellBatch:
+                    self._dispatch_batch(event.events)
+                else:
+                    self._dispatch(event)
+        finally:
+            self._draining = False
+
+    def _dispatch(self, event: AuraEvent) -> None:
+        """Passes an event through the spells handling it, applies it and notifies the
+        listeners unless it was canceled.
+
+        Args:
+            event: The event to dispatch.
+        """
+        chain = self._handlers.get(type(event))
+        if chain is None:
+            chain = self._build_handlers(type(event))
+        if chain.multipliers:
+            if chain.generation != Spell._multiplier_generation:
+                chain.refresh()
+            # Multipliers handling every event type leave the ones without an amount
+            if hasattr(event, "amount"):
+                event.amount *= chain.factor
+        handlers = chain.handlers
+        metrics = self.metrics
+        if handlers:
+            self._mark_changed(AuraChange.SPELL_FIELDS)
+            # Indexed rather than iterated, which would allocate an iterator per event
+            index = 0
+            count = len(handlers)
+            while index < count:
+                spell = handlers[index]
+                if self._hook_timer is None:
+                    spell.modify_event(self, event)
+                else:
+                    self._hook_timer.modify_event(self, spell, event)
+                index += 1
+                if event.is_canceled:
+                    if metrics is not None:
+                        metrics.canceled_by[type(spell)] = (
+                            metrics.canceled_by.get(type(spell), 0) + 1
+                        )
+                        if isinstance(event, AddSpellEvent):
+                            metrics.spells_absorbed += 1
+                    break
+
+        if not event.is_canceled:
+            self._apply_event(event)
+        if metrics is not None:
+            event_type = type(event)
+            metrics.events[event_type] = metrics.events.get(event_type, 0) + 1
+            if event.is_canceled:
+                metrics.canceled[event_type] = metrics.canceled.get(event_type, 0) + 1
+        if not event.is_canceled and self._event_listeners:
+            for listener in self._event_listeners:
+                listener.on_spell_event(self, event)
+
+        if event._pool is not None:
+            event._pool.release(event)
+
+    def _dispatch_batch(
+        self, events: "list[AddSpellEvent] | list[RemoveSpellEvent]"
+    ) -> None:
+        """Dispatches spell events of one type with the handlers of the first event,
+        and notifies the listeners once with the events that were not canceled.
+
+        Args:
+            events: The events to dispatch.
+        """
+        event_type = type(events[0])
+        chain = self._handlers.get(event_type)
+        if chain is None:
+            chain = self._build_handlers(event_type)
+        # Spell events have no amount for multipliers to scale
+        handlers = chain.handlers
+        if handlers:
+            self._mark_changed(AuraChange.SPELL_FIELDS)
+        metrics = self.metrics
+        applied = []
+        for event in events:
+            index = 0
+            count = len(handlers)
+            while index < count:
+                spell = handlers[index]
+                if self._hook_timer is None:
+                    spell.modify_event(self, event)
+                else:
+                    self._hook_timer.modify_event(self, spell, event)
+                index += 1
+                if event.is_canceled:
+                    if metrics is not None:
+                        metrics.canceled_by[type(spell)] = (
+                            metrics.canceled_by.get(type(spell), 0) + 1
+                        )
+                        if event_type is AddSpellEvent:
+                            metrics.spells_absorbed += 1
+                    break
+            if not event.is_canceled:
+                # Clears the handlers, which the batch keeps using
+                self._apply_event(event)
+            if event.is_canceled:
+                if metrics is not None:
+                    metrics.canceled[event_type] = (
+                        metrics.canceled.get(event_type, 0) + 1
+                    )
+            else:
+                applied.append(event)
+        if metrics is not None:
+            metrics.events[event_type] = metrics.events.get(event_type, 0) + len(events)
+
+        if applied:
+            for listener in self._event_listeners:
+                listener.on_spell_events(self, applied)
+
+    def event_pool(self, event_type: "Type[AuraEvent]") -> EventPool:
+        """Returns this aura's pool of reusable events of a type.
+
+        Args:
+            event_type: The type of pooled events.
+        """
+        pool = self._event_pools.get(event_type)
+        if pool is None:
+            pool = self._event_pools[event_type] = EventPool(event_type)
+        return pool
 
-        self._apply_event(event)
-        for listener in self._event_listeners:
-            listener.on_spell_event(self, event)
+    def acquire_event(self, event_type: "Type[T]", *args) -> "T":
+        """Returns a pooled event for per-frame traffic, to be passed to process_event.
+
+        Args:
+            event_type: The type of event to acquire.
+            args: The arguments used to initialize the event.
+        """
+        pool = self.event_pool(event_type)
+        if len(args) == 1:
+            return pool.acquire(args[0])
+        return pool.acquire(*args)
+
+    def _build_handlers(self, event_type: type) -> _EventChain:
+        """Collects the active spells that handle an event type, in spell order.
+
+        Args:
+            event_type: The type of the event being processed.
+        """
+        chain = _EventChain(event_type, self._spells)
+        self._handlers[event_type] = chain
+        return chain
 
     def _apply_event(self, event: AuraEvent) -> None:
-        """Applies the event to the magic value.
+        """Applies the event to the magic value or the active spells.
+        Removing a spell that is not active cancels the event.
 
         Args:
             event: The event to apply.
@@ -266,11 +1193,49 @@ class Aura:
         elif isinstance(event, HealEvent):
             self.magic.value += event.amount
         elif isinstance(event, AddSpellEvent):
-            self._spell_list.append(event.spell)
+            self._attach_spell(event.spell)
             event.spell.start(self)
+            if self.metrics is not None:
+                self.metrics.spells_added += 1
         elif isinstance(event, RemoveSpellEvent):
-            self._spell_list.remove(event.spell)
+            if not self._detach_spell(event.spell):
+                # Already removed by an earlier event
+                event.is_canceled = True
+                return
             event.spell.stop(self)
+            if self.metrics is not None:
+                self.metrics.spells_removed += 1
+
+    def _attach_spell(self, spell: Spell) -> None:
+        """Adds a spell to the active spells without starting it or raising events.
+
+        Args:
+            spell: The spell to add.
+        """
+        self._spells._add(spell)
+        if spell.TIMED:
+            spell.duration.bind(self._wheel, self._expired.append, (spell,))
+        else:
+            self._ticking._add(spell)
+        self._handlers.clear()
+        self._mark_changed(AuraChange.SPELL_SET)
+
+    def _detach_spell(self, spell: Spell) -> bool:
+        """Removes a spell from the active spells without stopping it or raising
+        events. Returns False if the spell was not active.
+
+        Args:
+            spell: The spell to remove.
+        """
+        if not self._spells._remove(spell):
+            return False
+        if not spell.TIMED:
+            self._ticking._remove(spell)
+        elif spell not in self._spells:
+            spell.duration.unbind()
+        self._handlers.clear()
+        self._mark_changed(AuraChange.SPELL_SET)
+        return True
 
     def update(self, elapsed_time: float) -> None:
         """Updates the aura state, magic, and spells.
@@ -278,22 +1243,196 @@ class Aura:
         Args:
             elapsed_time: The time passed since the last update.
         """
-        self.magic.update(elapsed_time)
-        self._cast_delay.update(elapsed_time)
+        metrics = self.metrics
+        start = 0 if metrics is None else time.perf_counter_ns()
+        self._wheel.advance(elapsed_time)
+        self._update_spells(elapsed_time)
+        if metrics is not None:
+            metrics.tick_ns.record(time.perf_counter_ns() - start)
+
+    def advance(self, seconds: float, step: float = 0.1) -> None:
+        """Moves the aura forward by a long stretch of time, such as when an entity
+        comes back into view, with the same outcome as many small updates.
+
+        Time is split at the expiry of timers and spells. Between those boundaries the
+        spells' linear effects are integrated in closed form through the event
+        multipliers of the active spells and clamped by the magic bounds. The
+        integrated amounts change magic directly, without raising events. When a spell
+        or an event handler cannot be integrated, the aura is updated in steps instead
+        until the next boundary is reached.
+
+        Args:
+            seconds: The time to move forward.
+            step: The largest update used while stepping.
+        """
+        remaining = seconds
+        stalls = 0
+        while remaining > 0:
+            linear = self._linear_rate()
+            if linear is None or stalls > 1:
+                elapsed = min(step, remaining)
+                self.update(elapsed)
+                remaining -= elapsed
+                stalls = 0
+                continue
+
+            rate, horizon = linear
+            elapsed = min(remaining, horizon)
+            deadline = self._wheel.next_deadline()
+            if deadline is not None:
+                elapsed = min(elapsed, max(0.0, deadline - self._wheel.now))
+            # Boundaries that do not move on would stop the loop
+            stalls = stalls + 1 if elapsed <= 0.0 else 0
+
+            if rate:
+                # The rate is constant until the boundary, so clamping the end is exact
+                self.magic.value += rate * elapsed
+            self._wheel.advance(elapsed)
+            self._update_spells(elapsed, integrated=True)
+            remaining -= elapsed
+
+    def _linear_rate(self) -> "tuple[float, float] | None":
+        """Returns the net change of magic per second of the ticking spells and the
+        time it holds for, or None if an effect cannot be integrated."""
+        rate = 0.0
+        horizon = math.inf
+        for spell in self._ticking:
+            effect = spell.linear_effect(self)
+            if effect is None:
+                return None
+            event_type, amount, duration = effect
+            horizon = min(horizon, duration)
+            if not amount:
+                continue
+            if event_type is None:
+                rate += amount
+                continue
+
+            multiplier = self._event_multiplier(event_type)
+            if multiplier is None:
+                return None
+            if issubclass(event_type, DamageEvent):
+                rate -= amount * multiplier
+            elif issubclass(event_type, HealEvent):
+                rate += amount * multiplier
+            else:
+                return None
+
+        return rate, horizon
+
+    def _event_multiplier(self, event_type: type) -> float | None:
+        """Returns the factor the active spells apply to the amount of events of a
+        type, or None if one of them does more than scale the amount."""
+        chain = self._handlers.get(event_type)
+        if chain is None:
+            chain = self._build_handlers(event_type)
+        if chain.generation != Spell._multiplier_generation:
+            chain.refresh()
+        multiplier = chain.factor
+        for spell in chain.handlers:
+            factor = spell.event_multiplier(event_type)
+            if factor is None:
+                return None
+            multiplier *= factor
+        return multiplier
+
+    def _update_spells(self, elapsed_time: float, integrated: bool = False) -> None:
+        """Updates the ticking spells and removes the ones that expired, along with the
+        TIMED spells expired by the timing wheel.
+
+        Events raised by the spells are queued and processed after all spells updated.
+        The spells expired by the update or the timing wheel are removed after those
+        events, so every spell active at the start of the update applies to them.
 
-        spells_to_remove = []
-        for spell in self.spells:
-            should_remove = spell.update(self, elapsed_time)
-            if should_remove:
-                spells_to_remove.append(spell)
-        for spell in spells_to_remove:
-            self.remove_spell(spell)
+        Args:
+            elapsed_time: The time passed since the last update.
+            integrated: Fast forward the spells instead, their effects having been
+                integrated by advance.
+        """
+        was_draining = self._draining
+        self._draining = True
+        coalesce = self.coalesce_damage
+        spells = self._ticking
+        if len(spells):
+            self._mark_changed(AuraChange.SPELL_FIELDS)
+        entries = spells._begin_iteration()
+        try:
+            # Spells added while updating are first updated on the next update
+            index = 0
+            count = len(entries)
+            while index < count:
+                spell = entries[index]
+                index += 1
+                if spell is None:
+                    continue
+                # Only the damage ticks of the update are merged
+                self._coalescing = coalesce and spell.DAMAGE_OVER_TIME
+                if integrated:
+                    expired = spell.fast_forward(self, elapsed_time)
+                elif self._hook_timer is not None:
+                    expired = self._hook_timer.update(self, spell, elapsed_time)
+                else:
+                    expired = spell.update(self, elapsed_time)
+                if expired:
+                    self._expiring.append(spell)
+            self._coalescing = False
+
+            # Queued behind the events of the update
+            if self._expired:
+                for spell in self._expired:
+                    # Every copy of the spell shares the expired duration
+                    for _ in range(self._spells._copies(spell)):
+                        self.remove_spell(spell)
+                self._expired.clear()
+            if self._expiring:
+                for spell in self._expiring:
+                    self.remove_spell(spell)
+                self._expiring.clear()
+        finally:
+            spells._end_iteration()
+            self._draining = was_draining
+            self._coalescing = False
+            self._pending_damage = None
+
+        if not was_draining and self._queue:
+            self._drain()
+
+    @property
+    def needs_update(self) -> bool:
+        """Whether update has anything to do: ticking spells, pending expirations or
+        timers such as modifiers and timed spells. Idle auras can skip updates until
+        they receive an event or a timer is scheduled."""
+        return bool(
+            len(self._ticking) or self._expired or len(self._wheel) or self._queue
+        )
+
+    @property
+    def generation(self) -> int:
+        """Returns the generation of the aura's state, which moves forward when the
+        state changes, see changes_since."""
+        self._generation_read = True
+        return self._generation
+
+    @property
+    def changes(self) -> int:
+        """Returns the AuraChange bits set since the changes were last collected."""
+        return self._changes
+
+    @property
+    def pending_events(self) -> int:
+        """Returns the number of queued events that have not been processed yet."""
+        return len(self._queue)
 
     @property
     def spells(self) -> Spells:
         """Returns the active spells collection."""
         return self._spells
 
+    @property
+    def wheel(self) -> TimingWheel:
+        """Returns the timing wheel that expires the aura's modifiers and TIMED spells."""
+        return self._wheel
+
     @property
     def cast_delay(self) -> ValueWithModifiers:
         """Returns the current cast delay including modifiers."""
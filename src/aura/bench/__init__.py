@@ -0,0 +1 @@
+"""Benchmarks and diagnostics for the aura library."""
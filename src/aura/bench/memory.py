@@ -0,0 +1,196 @@
+"""Memory footprint measurements for auras and spells.
+
+Run with `python -m aura.bench.memory` to print the bytes used per Aura for a few
+spell counts, per spell type and per ValueModifier, and the bytes allocated by a
+steady-state Aura.update of each loadout in STEADY_LOADOUTS.
+
+tracemalloc sees the memory allocated, not the number of allocations, so the
+allocation budgets are in bytes allocated per tick. Objects recycled by the
+interpreter's free lists, such as floats, are not traced.
+"""
+
+import sys
+import tracemalloc
+
+try:
+    from typing import Callable
+except ImportError:
+    pass
+
+from aura.aura import Aura, Spell
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.earth_shield import EarthShieldSpell
+from aura.spell.elemental.flash import FlashSpell
+from aura.spell.elemental.freeze import FreezeSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.shock import ShockSpell
+from aura.spell.elemental.vulnerable import VulnerableSpell
+from aura.spell.elemental.weaken import WeakenSpell
+from aura.values import ValueModifier
+
+LOADOUT: "list[Callable[[], Spell]]" = [
+    lambda: IgniteSpell(damage_per_second=5.0, duration=10.0),
+    lambda: RegenSpell(regen_rate=5.0, duration=10.0),
+    lambda: HasteSpell(duration=10.0, cast_delay_percentage=0.25),
+    lambda: FreezeSpell(duration=10.0, cast_delay_modifier=1.5),
+    lambda: ChargeSpell(healing_multiplier=1.5, duration=10.0),
+    lambda: ShockSpell(heal_reduction_percentage=0.25, duration=10.0),
+    lambda: EarthShieldSpell(reduction=0.5, max_hits=3, duration=10.0),
+    lambda: VulnerableSpell(damage_multiplier=1.5, duration=10.0),
+    lambda: WeakenSpell(reduction=0.25, duration=10.0),
+    lambda: FlashSpell(duration=10.0),
+]
+"""A representative mix of built-in spells, cycled through to fill an aura."""
+
+
+STEADY_LOADOUTS: "dict[str, list[Callable[[], Spell]]]" = {
+    "regen_haste": [LOADOUT[1], LOADOUT[2]],
+    "damage_over_time": [LOADOUT[0], LOADOUT[1]],
+    "modifiers": [LOADOUT[3], LOADOUT[4], LOADOUT[5], LOADOUT[8]],
+    "mixed": LOADOUT,
+}
+"""Spell loadouts measured by update_allocations, by name."""
+
+ALLOCATION_BUDGETS: dict[str, float] = {name: 0.0 for name in STEADY_LOADOUTS}
+"""The most bytes a steady-state Aura.update of each loadout may allocate."""
+
+
+def create_aura(spell_count: int) -> Aura:
+    """Creates an aura carrying spell_count spells from the loadout."""
+    aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    for index in range(spell_count):
+        aura.add_spell(LOADOUT[index % len(LOADOUT)]())
+    return aura
+
+
+def measure_bytes(factory: "Callable[[], object]", samples: int = 100) -> float:
+    """Measures the average traced memory retained by objects created by a factory.
+
+    Args:
+        factory: Creates one object to measure.
+        samples: The number of objects to create and average over.
+
+    Returns:
+        The average number of bytes retained per object.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory() for _ in range(samples)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    # Do not count the list holding the samples
+    list_bytes = objects.__sizeof__()
+    return (after - before - list_bytes) / samples
+
+
+def bytes_per_aura(spell_count: int, samples: int = 100) -> float:
+    """Returns the average bytes retained by an aura carrying spell_count spells."""
+    return measure_bytes(lambda: create_aura(spell_count), samples)
+
+
+def bytes_per_spell(samples: int = 100) -> dict[str, float]:
+    """Returns the average bytes retained by each spell of the loadout, by class
+    name. Spells are measured before they are added to an aura."""
+    return {
+        type(factory()).__name__: measure_bytes(factory, samples) for factory in LOADOUT
+    }
+
+
+def bytes_per_value_modifier(samples: int = 100) -> float:
+    """Returns the average bytes retained by a ValueModifier."""
+    return measure_bytes(lambda: ValueModifier(1.5, 10.0), samples)
+
+
+def tick_allocations(run_tick: "Callable[[int], object]", ticks: int) -> dict:
+    """Measures the memory allocated by ticks of a workload.
+
+    Args:
+        run_tick: Runs the tick with the given number.
+        ticks: The number of ticks to measure.
+
+    Returns:
+        The average peak bytes allocated during a tick above the memory in use
+        before it, and the average growth per tick of the memory blocks in use.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    peak_bytes = 0
+    blocks_before = sys.getallocatedblocks()
+    try:
+        for tick in range(ticks):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            run_tick(tick)
+            peak_bytes += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    blocks_after = sys.getallocatedblocks()
+
+    return {
+        "peak_bytes_per_tick": peak_bytes / ticks if ticks else 0.0,
+        "retained_blocks_per_tick": (
+            (blocks_after - blocks_before) / ticks if ticks else 0.0
+        ),
+    }
+
+
+def update_allocations(
+    spells: "list[Callable[[], Spell]]",
+    ticks: int = 300,
+    warmup_ticks: int = 60,
+    elapsed_time: float = 1 / 60,
+) -> dict:
+    """Measures the memory allocated by steady-state updates of an aura.
+
+    Args:
+        spells: Creates the spells of the aura.
+        ticks: The number of updates to measure.
+        warmup_ticks: The number of updates run first, filling the event pools and
+            the caches of the aura.
+        elapsed_time: The time passed to each update.
+
+    Returns:
+        The measurements of tick_allocations.
+    """
+    aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    # Half full, so neither damage nor healing is clamped away
+    aura.magic.value = 50.0
+    for factory in spells:
+        aura.add_spell(factory())
+    for _ in range(warmup_ticks):
+        aura.update(elapsed_time)
+    return tick_allocations(lambda tick: aura.update(elapsed_time), ticks)
+
+
+def memory_report(spell_counts: tuple[int, ...] = (0, 10, 100)) -> dict[int, float]:
+    """Measures the bytes per aura for each spell count.
+
+    Args:
+        spell_counts: The numbers of spells carried by the measured auras.
+
+    Returns:
+        A mapping from spell count to bytes per aura.
+    """
+    return {count: bytes_per_aura(count) for count in spell_counts}
+
+
+if __name__ == "__main__":
+    for count, size in memory_report().items():
+        print(f"{count:>4} spells: {size:>10.0f} bytes per aura")
+    for name, size in bytes_per_spell().items():
+        print(f"{name:>20}: {size:>10.0f} bytes")
+    print(f"{'ValueModifier':>20}: {bytes_per_value_modifier():>10.0f} bytes")
+    for name, spells in STEADY_LOADOUTS.items():
+        allocated = update_allocations(spells)["peak_bytes_per_tick"]
+        budget = ALLOCATION_BUDGETS[name]
+        print(f"{name:>20}: {allocated:>10.1f} bytes per update, budget {budget:.0f}")
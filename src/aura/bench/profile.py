@@ -0,0 +1,88 @@
+"""Profiles of workloads as cProfile statistics or collapsed stacks.
+
+Collapsed stacks have one line per call stack, the frames separated by semicolons
+followed by the microseconds spent in the innermost frame, the input format of
+flame graph tools.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+
+try:
+    from typing import Callable
+except ImportError:
+    pass
+
+
+def profile_stats(run: "Callable[[], object]", limit: int = 30) -> str:
+    """Runs a workload under cProfile.
+
+    Args:
+        run: The workload to profile.
+        limit: The number of functions to report.
+
+    Returns:
+        The statistics of the functions with the most cumulative time.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(run)
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return output.getvalue()
+
+
+class StackCollector:
+    """Collects the time spent in each call stack through a profile hook."""
+
+    def __init__(self) -> None:
+        self._stack: list[str] = []
+        self._times: dict[tuple[str, ...], int] = {}
+        self._last: int = 0
+
+    def run(self, run: "Callable[[], object]") -> None:
+        """Runs a workload, adding the time of its call stacks to the collection."""
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._hook)
+        try:
+            run()
+        finally:
+            sys.setprofile(None)
+
+    def _hook(self, frame, event: str, arg) -> None:
+        now = time.perf_counter_ns()
+        stack = self._stack
+        if stack:
+            key = tuple(stack)
+            self._times[key] = self._times.get(key, 0) + now - self._last
+        if event == "call":
+            code = frame.f_code
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            stack.append(f"{module}:{code.co_qualname}")
+        elif event == "c_call":
+            stack.append(getattr(arg, "__qualname__", repr(arg)))
+        elif stack:
+            # Returns from frames entered before the collection started are ignored
+            stack.pop()
+        # Leaves the time spent in the hook out
+        self._last = time.perf_counter_ns()
+
+    def collapsed(self) -> str:
+        """Returns the collected stacks in the collapsed stack format."""
+        lines = []
+        for stack, elapsed_ns in sorted(self._times.items()):
+            microseconds = elapsed_ns // 1000
+            if microseconds:
+                lines.append(f"{';'.join(stack)} {microseconds}")
+        return "\n".join(lines) + "\n"
+
+
+def collapsed_stacks(run: "Callable[[], object]") -> str:
+    """Runs a workload and returns its call stacks in the collapsed stack format."""
+    collector = StackCollector()
+    collector.run(run)
+    return collector.collapsed()
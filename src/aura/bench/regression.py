@@ -0,0 +1,389 @@
+"""A performance regression gate built from microbenchmarks and scaling curves.
+
+Every benchmark is timed in repeated runs, each long enough to rise above the timer
+resolution, and summarized by the median time per operation and its median
+absolute deviation, which are not thrown off by the occasional slow run on a busy
+machine. Times are divided by the median time of a fixed calibration workload
+measured in the same process, so baselines recorded on one machine carry over to
+faster or slower ones.
+
+A benchmark regresses when its normalized median, less its noise, exceeds the
+baseline times the threshold. Run the gate with `aura perf`, and record a new
+baseline with `aura perf --update` after an intended change in performance.
+"""
+
+import json
+import os
+import statistics
+import time
+
+try:
+    from typing import Callable, Iterable
+except ImportError:
+    pass
+
+from aura.aura import Aura, DamageEvent, HealEvent, SpellTags, TagMatch
+from aura.bench.memory import LOADOUT
+from aura.spell.combo.combo import SpellCombination, SpellCombinations
+from aura.spell.combo.combust import CombustCombination
+from aura.spell.combo.invigorate import InvigorateCombination
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.elements import ElementTags
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.vulnerable import VulnerableSpell
+from aura.values import ValueModifier, ValueModifiers, ValueWithModifiers
+from aura.world import AuraWorld
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+"""The baseline kept with the package, found from any working directory."""
+DEFAULT_THRESHOLD = 1.5
+"""A benchmark regresses when it becomes this many times slower than its baseline."""
+
+MAD_SCALE = 1.4826
+"""Scales the median absolute deviation to the standard deviation of normal noise."""
+
+
+class Microbenchmark:
+    """A named operation timed by the regression gate."""
+
+    def __init__(
+        self,
+        name: str,
+        setup: "Callable[[], Callable[[], object]]",
+        operations: int = 1,
+    ) -> None:
+        """Initializes the benchmark.
+
+        Args:
+            name: The name of the benchmark in reports and baselines.
+            setup: Prepares the state of the benchmark and returns the function timed.
+            operations: The number of operations done by one call of the timed
+                function, results are reported per operation.
+        """
+        self.name: str = name
+        self.setup = setup
+        self.operations: int = operations
+
+
+class BenchmarkStats:
+    """The robust statistics of the repeated runs of a benchmark."""
+
+    def __init__(self, samples: list[float]) -> None:
+        """Summarizes samples.
+
+        Args:
+            samples: The time per operation of each run.
+        """
+        self.samples: list[float] = samples
+        self.median: float = statistics.median(samples)
+        self.mad: float = statistics.median(
+            abs(sample - self.median) for sample in samples
+        )
+
+    @property
+    def noise(self) -> float:
+        """The spread of the samples, comparable to a standard deviation."""
+        return self.mad * MAD_SCALE
+
+    def normalized(self, calibration: "BenchmarkStats") -> "BenchmarkStats":
+        """Returns the statistics in units of the calibration workload's median."""
+        return BenchmarkStats([sample / calibration.median for sample in self.samples])
+
+
+def measure(
+    run: "Callable[[], object]",
+    operations: int = 1,
+    repeats: int = 15,
+    min_time: float = 0.005,
+) -> BenchmarkStats:
+    """Times repeated runs of a function.
+
+    Args:
+        run: The function to time.
+        operations: The number of operations done by one call.
+        repeats: The number of timed runs.
+        min_time: The shortest duration of a run in seconds. Runs call the function
+            as many times as it takes to reach it.
+
+    Returns:
+        The statistics of the time per operation in nanoseconds.
+    """
+    perf_counter_ns = time.perf_counter_ns
+    min_ns = min_time * 1e9
+    number = 1
+    while True:
+        start = perf_counter_ns()
+        for _ in range(number):
+            run()
+        elapsed = perf_counter_ns() - start
+        if elapsed >= min_ns:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeats):
+        start = perf_counter_ns()
+        for _ in range(number):
+            run()
+        samples.append((perf_counter_ns() - start) / (number * operations))
+    return BenchmarkStats(samples)
+
+
+def _calibration() -> float:
+    """A fixed mix of the dictionary, arithmetic and call work the library does."""
+    values: dict[int, float] = {}
+    total = 0.0
+    for index in range(256):
+        values[index & 31] = index * 0.5
+        total += abs(values[index & 31])
+    return total
+
+
+def _dispatch(spell_count: int) -> "Callable[[], object]":
+    aura = Aura(min_magic=0.0, max_magic=1e9, cast_delay=1.0)
+    for index in range(spell_count):
+        if index % 2:
+            aura.add_spell(ChargeSpell(healing_multiplier=1.0, duration=1e9))
+        else:
+            aura.add_spell(VulnerableSpell(damage_multiplier=1.0, duration=1e9))
+    aura.magic.value = 5e8
+    process_event = aura.process_event
+
+    def run() -> None:
+        process_event(DamageEvent(1.0))
+        process_event(HealEvent(1.0))
+
+    return run
+
+
+def _tag_query() -> "Callable[[], object]":
+    aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    for index in range(100):
+        aura.spells._add(LOADOUT[index % len(LOADOUT)]())
+    spells = aura.spells
+
+    def run() -> None:
+        spells.get_by_tag(SpellTags.BUFF)
+        spells.get_by_tag(ElementTags.FIRE, SpellTags.DEBUFF, match=TagMatch.ANY)
+
+    return run
+
+
+def _modifier_recompute() -> "Callable[[], object]":
+    value = ValueWithModifiers(base_value=10.0)
+    for _ in range(10):
+        value.modifiers.add(ValueModifier(1.01, duration=1e9))
+    modifier = ValueModifier(2.0, duration=1e9)
+
+    def run() -> None:
+        value.modifiers.add(modifier)
+        value.modifiers.remove(modifier)
+
+    return run
+
+
+def _modifier_update() -> "Callable[[], object]":
+    modifiers = ValueModifiers()
+    for _ in range(10):
+        modifiers.add(ValueModifier(1.01, duration=1e12))
+
+    def run() -> None:
+        modifiers.update(0.001)
+
+    return run
+
+
+class _ThresholdCombination(SpellCombination):
+    """Stands for the many combinations of a game, checking for a number of active
+    spells of a class that the benchmarks never reach."""
+
+    def __init__(self, spell_class: type) -> None:
+        self.INGREDIENTS = (spell_class,)
+        self._spell_class = spell_class
+
+    def check(self, aura: Aura, counts: "dict | None" = None) -> bool:
+        if counts is None:
+            return aura.spells.count_by_class(self._spell_class) >= 100
+        return counts[self._spell_class] >= 100
+
+
+def _combo_check(combination_count: int = 2) -> "Callable[[], object]":
+    combinations = SpellCombinations()
+    combinations.add(CombustCombination())
+    combinations.add(InvigorateCombination(1.5, duration=1e9))
+    spell_classes = [type(factory()) for factory in LOADOUT]
+    for index in range(combination_count - 2):
+        combinations.add(_ThresholdCombination(spell_classes[index % len(LOADOUT)]))
+    aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    aura.event_listeners.append(combinations)
+    aura.add_spell(IgniteSpell(damage_per_second=0.0, duration=1e9))
+    aura.add_spell(RegenSpell(regen_rate=0.0, duration=1e9))
+    regen = RegenSpell(regen_rate=0.0, duration=1e9)
+
+    def run() -> None:
+        aura.add_spell(regen)
+        aura.remove_spell(regen)
+
+    return run
+
+
+def _world_update(aura_count: int, spell_count: int) -> "Callable[[], object]":
+    world = AuraWorld()
+    for _ in range(aura_count):
+        aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+        for _ in range(spell_count):
+            aura.add_spell(RegenSpell(regen_rate=1.0, duration=1e12))
+        world.add(aura)
+
+    def run() -> None:
+        world.update(0.001)
+
+    return run
+
+
+def _benchmarks() -> list[Microbenchmark]:
+    benchmarks = [
+        Microbenchmark(
+            f"dispatch/spells={count}", lambda count=count: _dispatch(count), 2
+        )
+        for count in (1, 10, 50)
+    ]
+    benchmarks += [
+        Microbenchmark("spells/tag_query", _tag_query, 2),
+        Microbenchmark("modifiers/recompute", _modifier_recompute, 2),
+        Microbenchmark("modifiers/update", _modifier_update),
+        Microbenchmark("combo/check", _combo_check, 2),
+        Microbenchmark("combo/check,combinations=32", lambda: _combo_check(32), 2),
+    ]
+    # Scaling curves, per aura so the cost of a tick reads as a cost per entity
+    benchmarks += [
+        Microbenchmark(
+            f"world/auras={auras},spells={spells}",
+            lambda auras=auras, spells=spells: _world_update(auras, spells),
+            auras,
+        )
+        for auras in (100, 1000)
+        for spells in (1, 10)
+    ]
+    # The largest worlds the update is meant for
+    benchmarks.append(
+        Microbenchmark(
+            "world/auras=50000,spells=1", lambda: _world_update(50000, 1), 50000
+        )
+    )
+    return benchmarks
+
+
+BENCHMARKS: list[Microbenchmark] = _benchmarks()
+"""The benchmarks of the regression gate."""
+
+
+def run_suite(
+    names: "Iterable[str] | None" = None, repeats: int = 15, min_time: float = 0.005
+) -> dict[str, BenchmarkStats]:
+    """Runs benchmarks and normalizes their results by the calibration workload.
+
+    Args:
+        names: The benchmarks to run, all of them when None.
+        repeats: The number of timed runs of each benchmark.
+        min_time: The shortest duration of a run in seconds.
+
+    Returns:
+        The normalized statistics by benchmark name.
+
+    Raises:
+        ValueError: If a name is not a benchmark.
+    """
+    by_name = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+    selected = list(by_name) if names is None else list(names)
+    for name in selected:
+        if name not in by_name:
+            raise ValueError(f"Unknown benchmark {name!r}")
+
+    results = {}
+    for name in selected:
+        benchmark = by_name[name]
+        run = benchmark.setup()
+        stats = measure(run, benchmark.operations, repeats, min_time)
+        # Calibrated next to each benchmark, so a machine that speeds up or slows
+        # down during the suite affects both alike
+        calibration = measure(_calibration, 1, repeats, min_time)
+        results[name] = stats.normalized(calibration)
+    return results
+
+
+class Regression:
+    """A benchmark result compared to its baseline."""
+
+    def __init__(
+        self, name: str, baseline: float, current: BenchmarkStats, threshold: float
+    ) -> None:
+        self.name: str = name
+        self.baseline: float = baseline
+        self.current: BenchmarkStats = current
+        self.threshold: float = threshold
+
+    @property
+    def ratio(self) -> float:
+        """The current median relative to the baseline."""
+        return self.current.median / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        """Whether the result is slower than the threshold allows, beyond its noise."""
+        return self.current.median - self.current.noise > self.baseline * self.threshold
+
+
+def compare(
+    results: dict[str, BenchmarkStats],
+    baseline: dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Compares results to a baseline. Benchmarks without a baseline are skipped.
+
+    Args:
+        results: The normalized results by benchmark name.
+        baseline: The normalized baseline medians by benchmark name.
+        threshold: The slowdown factor at which a benchmark regresses.
+    """
+    return [
+        Regression(name, baseline[name], stats, threshold)
+        for name, stats in results.items()
+        if name in baseline
+    ]
+
+
+def load_baseline(path: str) -> tuple[dict[str, float], float]:
+    """Reads a baseline file.
+
+    Returns:
+        The normalized medians by benchmark name and the threshold stored with them.
+
+    Raises:
+        ValueError: If the file is not a baseline file.
+    """
+    with open(path) as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Baseline file {path} is not JSON: {error}") from error
+    if not isinstance(data, dict) or not isinstance(data.get("benchmarks"), dict):
+        raise ValueError(f"Baseline file {path} has no benchmarks")
+    return (
+        {name: float(value) for name, value in data["benchmarks"].items()},
+        float(data.get("threshold", DEFAULT_THRESHOLD)),
+    )
+
+
+def save_baseline(
+    path: str, results: dict[str, BenchmarkStats], threshold: float
+) -> None:
+    """Writes the medians of results to a baseline file."""
+    data = {
+        "threshold": threshold,
+        "benchmarks": {name: stats.median for name, stats in sorted(results.items())},
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
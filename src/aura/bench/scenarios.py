@@ -0,0 +1,310 @@
+"""Reproducible workloads for benchmarking, profiling and simulating worlds of auras.
+
+A scenario builds an AuraWorld and sends its auras a stream of events every tick,
+drawn from a random generator seeded by the scenario, so every run of a scenario
+with the same parameters does the same work.
+
+Scenario files used by `aura simulate` are JSON objects naming a scenario and its
+parameters, with every field but the scenario optional:
+
+    {"scenario": "dot_heavy", "auras": 10000, "ticks": 600, "tick": 0.0166, "seed": 1}
+"""
+
+import json
+import random
+import time
+
+from aura.aura import Aura, Spell
+from aura.caster import Caster
+from aura.spell.combo.combo import SpellCombinations
+from aura.spell.combo.combust import CombustCombination
+from aura.spell.combo.invigorate import InvigorateCombination
+from aura.spell.elemental.earth_shield import EarthShieldSpell
+from aura.spell.elemental.freeze import FreezeSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ice_shield import IceShieldSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.pause import PauseSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.rock import RockSpell
+from aura.spell.elemental.slice import SliceSpell
+from aura.spell.elemental.unpause import UnpauseSpell
+from aura.spell.elemental.vulnerable import VulnerableSpell
+from aura.spell.elemental.weight import WeightSpell
+from aura.world import AuraWorld
+
+
+class NullCaster(Caster):
+    """A caster that only counts the spells cast through it."""
+
+    def __init__(self) -> None:
+        self.casts: int = 0
+
+    def cast_spell(self, spell: Spell, cast_type: str) -> None:
+        self.casts += 1
+
+
+class Scenario:
+    """A world of auras and the events sent to them each tick."""
+
+    name: str = ""
+    description: str = ""
+
+    def __init__(self, aura_count: int = 1000, seed: int = 0) -> None:
+        """Builds the world of the scenario.
+
+        Args:
+            aura_count: The number of auras in the world.
+            seed: The seed of the random generator choosing the events.
+        """
+        self.aura_count: int = aura_count
+        self.seed: int = seed
+        self.random = random.Random(seed)
+        self.caster = NullCaster()
+        self.world = AuraWorld()
+        self.auras: list[Aura] = []
+        for index in range(aura_count):
+            aura = self.create_aura(index)
+            self.auras.append(aura)
+            self.world.add(aura)
+
+    def create_aura(self, index: int) -> Aura:
+        """Creates the aura at an index of the world."""
+        return Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+
+    def send_events(self, tick: int) -> int:
+        """Sends the events of a tick to the auras.
+
+        Args:
+            tick: The number of ticks run before this one.
+
+        Returns:
+            The number of events sent.
+        """
+        raise NotImplementedError("send_events must be implemented by subclasses.")
+
+    def run_tick(self, tick: int, elapsed_time: float) -> int:
+        """Sends the events of a tick and updates the world. Returns the number of
+        events sent."""
+        events = self.send_events(tick)
+        self.world.update(elapsed_time)
+        return events
+
+    def sample(self, fraction: float) -> list[Aura]:
+        """Returns a random sample of the auras, a fraction of the world in size."""
+        count = min(len(self.auras), int(len(self.auras) * fraction))
+        return self.random.sample(self.auras, count)
+
+
+class DotHeavyScenario(Scenario):
+    name = "dot_heavy"
+    description = "Stacks of damage and heal over time spells on every aura."
+
+    def create_aura(self, index: int) -> Aura:
+        aura = super().create_aura(index)
+        aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=30.0))
+        aura.add_spell(RegenSpell(regen_rate=1.5, duration=30.0))
+        weight = WeightSpell(
+            acceleration_threshold=1.0, damage_per_second=0.5, duration=30.0
+        )
+        weight.movement_detected = index % 2 == 0
+        aura.add_spell(weight)
+        return aura
+
+    def send_events(self, tick: int) -> int:
+        events = 0
+        for aura in self.sample(0.05):
+            aura.add_spell(IgniteSpell(damage_per_second=2.0, duration=1.0))
+            events += 1
+        for aura in self.sample(0.02):
+            aura.add_spell(RegenSpell(regen_rate=3.0, duration=2.0))
+            events += 1
+        return events
+
+
+class ShieldHeavyScenario(Scenario):
+    name = "shield_heavy"
+    description = "Damage and hits absorbed by stacked earth and ice shields."
+
+    def create_aura(self, index: int) -> Aura:
+        aura = super().create_aura(index)
+        self._add_shields(aura)
+        return aura
+
+    def _add_shields(self, aura: Aura) -> None:
+        aura.add_spell(EarthShieldSpell(reduction=0.5, max_hits=20, duration=10.0))
+        aura.add_spell(
+            IceShieldSpell(
+                reduction=0.25,
+                max_hits=10,
+                duration=10.0,
+                freeze_spell=FreezeSpell(duration=1.0, cast_delay_modifier=1.5),
+                caster=self.caster,
+            )
+        )
+
+    def send_events(self, tick: int) -> int:
+        events = 0
+        for aura in self.sample(0.2):
+            aura.cast_spell(SliceSpell(damage=5.0))
+            aura.cast_spell(RockSpell(damage=3.0))
+            events += 2
+        if tick % 30 == 0:
+            for aura in self.auras:
+                if len(aura.spells) < 2:
+                    self._add_shields(aura)
+                    events += 2
+        return events
+
+
+class PauseStormScenario(Scenario):
+    name = "pause_storm"
+    description = "Pauses, unpauses and casts canceled by the pauses."
+
+    def send_events(self, tick: int) -> int:
+        events = 0
+        for aura in self.sample(0.1):
+            aura.cast_spell(PauseSpell(duration=0.5))
+            events += 1
+        for aura in self.sample(0.05):
+            aura.add_spell(UnpauseSpell())
+            events += 1
+        for aura in self.sample(0.2):
+            aura.cast_spell(HasteSpell(duration=1.0, cast_delay_percentage=0.2))
+            events += 1
+        return events
+
+
+class ComboChurnScenario(Scenario):
+    name = "combo_churn"
+    description = "Spells merged, boosted and removed by spell combinations."
+
+    def __init__(self, aura_count: int = 1000, seed: int = 0) -> None:
+        self.combinations = SpellCombinations()
+        self.combinations.add(CombustCombination())
+        self.combinations.add(InvigorateCombination(1.5, duration=2.0))
+        super().__init__(aura_count, seed)
+
+    def create_aura(self, index: int) -> Aura:
+        aura = super().create_aura(index)
+        aura.event_listeners.append(self.combinations)
+        return aura
+
+    def send_events(self, tick: int) -> int:
+        events = 0
+        for aura in self.sample(0.1):
+            aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=2.0))
+            aura.add_spell(RegenSpell(regen_rate=1.0, duration=1.5))
+            events += 2
+        for aura in self.sample(0.05):
+            aura.add_spell(VulnerableSpell(damage_multiplier=1.5, duration=1.0))
+            events += 1
+        for aura in self.sample(0.05):
+            regens = aura.spells.get_by_class(RegenSpell)
+            if regens:
+                aura.remove_spell(regens[0])
+                events += 1
+        return events
+
+
+SCENARIOS: dict[str, type[Scenario]] = {
+    scenario.name: scenario
+    for scenario in (
+        DotHeavyScenario,
+        ShieldHeavyScenario,
+        PauseStormScenario,
+        ComboChurnScenario,
+    )
+}
+"""The built-in scenarios by name."""
+
+
+def create_scenario(name: str, aura_count: int = 1000, seed: int = 0) -> Scenario:
+    """Creates a built-in scenario by name.
+
+    Raises:
+        ValueError: If there is no scenario with the name.
+    """
+    scenario_type = SCENARIOS.get(name)
+    if scenario_type is None:
+        raise ValueError(
+            f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}"
+        )
+    return scenario_type(aura_count, seed)
+
+
+class ScenarioRun:
+    """The counts and wall clock time of running a scenario."""
+
+    def __init__(self, ticks: int, events: int, elapsed_ns: int) -> None:
+        self.ticks: int = ticks
+        self.events: int = events
+        self.elapsed_ns: int = elapsed_ns
+
+    @property
+    def ticks_per_second(self) -> float:
+        """Returns the ticks run per second of wall clock time."""
+        if self.elapsed_ns == 0:
+            return 0.0
+        return self.ticks * 1e9 / self.elapsed_ns
+
+    @property
+    def events_per_second(self) -> float:
+        """Returns the events sent per second of wall clock time."""
+        if self.elapsed_ns == 0:
+            return 0.0
+        return self.events * 1e9 / self.elapsed_ns
+
+
+def run_scenario(
+    scenario: Scenario, ticks: int, elapsed_time: float = 1 / 60, first_tick: int = 0
+) -> ScenarioRun:
+    """Runs ticks of a scenario as fast as possible.
+
+    Args:
+        scenario: The scenario to run.
+        ticks: The number of ticks to run.
+        elapsed_time: The simulated time of each tick.
+        first_tick: The tick number to start counting from, for runs that continue
+            an earlier run of the scenario.
+    """
+    events = 0
+    start = time.perf_counter_ns()
+    for tick in range(first_tick, first_tick + ticks):
+        events += scenario.run_tick(tick, elapsed_time)
+    return ScenarioRun(ticks, events, time.perf_counter_ns() - start)
+
+
+class ScenarioFile:
+    """A scenario and its run settings read from a scenario file."""
+
+    def __init__(self, path: str) -> None:
+        """Reads a scenario file.
+
+        Raises:
+            ValueError: If the file is not a valid scenario file.
+        """
+        with open(path) as file:
+            try:
+                spec = json.load(file)
+            except json.JSONDecodeError as error:
+                raise ValueError(
+                    f"Scenario file {path} is not JSON: {error}"
+                ) from error
+        if not isinstance(spec, dict) or "scenario" not in spec:
+            raise ValueError(f"Scenario file {path} does not name a scenario")
+        unknown = set(spec) - {"scenario", "auras", "ticks", "tick", "seed"}
+        if unknown:
+            raise ValueError(
+                f"Unknown fields in scenario file {path}: {', '.join(sorted(unknown))}"
+            )
+
+        self.name: str = spec["scenario"]
+        self.aura_count: int = int(spec.get("auras", 1000))
+        self.ticks: int = int(spec.get("ticks", 600))
+        self.elapsed_time: float = float(spec.get("tick", 1 / 60))
+        self.seed: int = int(spec.get("seed", 0))
+
+    def create_scenario(self) -> Scenario:
+        """Creates the scenario named by the file."""
+        return create_scenario(self.name, self.aura_count, self.seed)
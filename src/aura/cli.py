@@ -0,0 +1,239 @@
+"""The `aura` command line interface.
+
+aura bench [--scenario NAME ...]   Runs the built-in scenarios and prints the
+                                   ticks/s, events/s and allocations per tick as
+                                   JSON.
+aura profile SCENARIO              Profiles a scenario with cProfile or as
+                                   collapsed stacks, or the cost of each spell,
+                                   listener and combination class.
+aura simulate SCENARIO_FILE        Runs the scenario described by a JSON file as
+                                   fast as possible.
+aura perf [--update]               Runs the microbenchmarks of the regression gate
+                                   and fails when one is slower than its baseline.
+"""
+
+import argparse
+import json
+import sys
+
+from aura.bench.memory import tick_allocations
+from aura.bench.profile import collapsed_stacks, profile_stats
+from aura.bench.regression import (
+    BENCHMARKS,
+    DEFAULT_BASELINE,
+    DEFAULT_THRESHOLD,
+    compare,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+from aura.bench.scenarios import (
+    SCENARIOS,
+    ScenarioFile,
+    create_scenario,
+    run_scenario,
+)
+from aura.monitoring import SpellMonitor
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="aura", description="Benchmarks and simulations of aura worlds."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench = commands.add_parser("bench", help="benchmark the built-in scenarios")
+    bench.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="a scenario to run, all scenarios when omitted",
+    )
+    _add_run_arguments(bench, ticks=200)
+    bench.add_argument(
+        "--allocation-ticks",
+        type=int,
+        default=30,
+        help="ticks measured for allocations after the timed ticks",
+    )
+    bench.add_argument("--output", help="write the JSON report to a file")
+
+    profile = commands.add_parser("profile", help="profile a scenario")
+    profile.add_argument("scenario", choices=sorted(SCENARIOS))
+    _add_run_arguments(profile, ticks=120)
+    profile.add_argument(
+        "--format",
+        choices=("pstats", "collapsed", "spells", "spells-collapsed"),
+        default="pstats",
+        help="cProfile statistics or collapsed stacks for flame graphs, of all "
+        "functions or of the spell, listener and combination methods",
+    )
+    profile.add_argument(
+        "--limit", type=int, default=30, help="functions listed by the tables"
+    )
+    profile.add_argument("--output", help="write the profile to a file")
+
+    simulate = commands.add_parser("simulate", help="run a scenario file")
+    simulate.add_argument("scenario_file", help="a JSON scenario file")
+    simulate.add_argument("--ticks", type=int, help="override the ticks of the file")
+    simulate.add_argument("--output", help="write the JSON report to a file")
+
+    perf = commands.add_parser("perf", help="check for performance regressions")
+    perf.add_argument(
+        "--benchmark",
+        action="append",
+        choices=[benchmark.name for benchmark in BENCHMARKS],
+        help="a benchmark to run, all benchmarks when omitted",
+    )
+    perf.add_argument("--baseline", default=DEFAULT_BASELINE, help="the baseline file")
+    perf.add_argument(
+        "--threshold",
+        type=float,
+        help="the slowdown factor that fails a benchmark, from the baseline when omitted",
+    )
+    perf.add_argument(
+        "--repeats", type=int, default=15, help="timed runs of each benchmark"
+    )
+    perf.add_argument(
+        "--min-time", type=float, default=0.005, help="shortest timed run in seconds"
+    )
+    perf.add_argument(
+        "--update",
+        action="store_true",
+        help="record the results as the new baseline instead of checking them",
+    )
+    perf.add_argument("--output", help="write the JSON report to a file")
+    return parser
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser, ticks: int) -> None:
+    parser.add_argument("--auras", type=int, default=1000, help="auras in the world")
+    parser.add_argument("--ticks", type=int, default=ticks, help="ticks to run")
+    parser.add_argument(
+        "--tick", type=float, default=1 / 60, help="simulated seconds per tick"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+
+
+def _write(text: str, output: str | None) -> None:
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        with open(output, "w") as file:
+            file.write(text)
+
+
+def _bench(args: argparse.Namespace) -> dict:
+    report = {}
+    for name in args.scenario or sorted(SCENARIOS):
+        scenario = create_scenario(name, args.auras, args.seed)
+        run = run_scenario(scenario, args.ticks, args.tick)
+        # Allocations are measured separately, tracing slows the timed ticks down
+        allocations = tick_allocations(
+            lambda tick: scenario.run_tick(args.ticks + tick, args.tick),
+            args.allocation_ticks,
+        )
+        report[name] = {
+            "auras": args.auras,
+            "ticks": run.ticks,
+            "events": run.events,
+            "seconds": run.elapsed_ns / 1e9,
+            "ticks_per_second": run.ticks_per_second,
+            "events_per_second": run.events_per_second,
+            **allocations,
+        }
+    return report
+
+
+def _profile(args: argparse.Namespace) -> str:
+    scenario = create_scenario(args.scenario, args.auras, args.seed)
+
+    def run() -> None:
+        run_scenario(scenario, args.ticks, args.tick)
+
+    if args.format == "collapsed":
+        return collapsed_stacks(run)
+    if args.format.startswith("spells"):
+        monitor = SpellMonitor()
+        with monitor:
+            run()
+        if args.format == "spells-collapsed":
+            return monitor.collapsed()
+        return monitor.table(args.limit)
+    return profile_stats(run, args.limit)
+
+
+def _simulate(args: argparse.Namespace) -> dict:
+    scenario_file = ScenarioFile(args.scenario_file)
+    ticks = scenario_file.ticks if args.ticks is None else args.ticks
+    scenario = scenario_file.create_scenario()
+    run = run_scenario(scenario, ticks, scenario_file.elapsed_time)
+    magic = [aura.magic.value for aura in scenario.auras]
+    return {
+        "scenario": scenario_file.name,
+        "auras": scenario_file.aura_count,
+        "ticks": run.ticks,
+        "events": run.events,
+        "seconds": run.elapsed_ns / 1e9,
+        "ticks_per_second": run.ticks_per_second,
+        "events_per_second": run.events_per_second,
+        "awake_auras": scenario.world.awake_count,
+        "active_spells": sum(len(aura.spells) for aura in scenario.auras),
+        "mean_magic": sum(magic) / len(magic) if magic else 0.0,
+    }
+
+
+def _perf(args: argparse.Namespace) -> tuple[dict, bool]:
+    results = run_suite(args.benchmark, args.repeats, args.min_time)
+    if args.update:
+        threshold = DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+        save_baseline(args.baseline, results, threshold)
+        report = {
+            name: {"median": stats.median, "noise": stats.noise}
+            for name, stats in results.items()
+        }
+        return report, True
+
+    baseline, threshold = load_baseline(args.baseline)
+    if args.threshold is not None:
+        threshold = args.threshold
+    report = {
+        name: {"median": stats.median, "noise": stats.noise, "baseline": None}
+        for name, stats in results.items()
+    }
+    passed = True
+    for result in compare(results, baseline, threshold):
+        report[result.name].update(
+            baseline=result.baseline, ratio=result.ratio, regressed=result.regressed
+        )
+        passed = passed and not result.regressed
+    return report, passed
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Runs the command line interface.
+
+    Args:
+        argv: The arguments without the program name, sys.argv when None.
+
+    Returns:
+        The exit status.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    status = 0
+    try:
+        if args.command == "bench":
+            _write(json.dumps(_bench(args), indent=2) + "\n", args.output)
+        elif args.command == "profile":
+            _write(_profile(args), args.output)
+        elif args.command == "simulate":
+            _write(json.dumps(_simulate(args), indent=2) + "\n", args.output)
+        else:
+            report, passed = _perf(args)
+            _write(json.dumps(report, indent=2) + "\n", args.output)
+            if not passed:
+                status = 1
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    return status
@@ -0,0 +1,549 @@
+"""An append-only binary journal of the calls made on a set of auras, for replaying
+them deterministically.
+
+A JournalRecorder stands in for the auras while recording: events, added, removed
+and cast spells, and updates of all auras go through the recorder, which applies
+them and appends them to the journal. Events raised by spells while processing
+those calls are not recorded, replaying the calls raises them again.
+
+The journal is split in chunks, each starting with a keyframe snapshot of all
+auras, optionally compressed with zlib. Closing the recorder appends an index of
+the keyframes and the hash of the final state. A JournalReader maps the file into
+memory, restores the state at any tick from the nearest keyframe and replays the
+calls at full speed, checking the replayed state against every keyframe it passes
+and the final state hash, so a replay doubles as a regression test and a
+throughput benchmark.
+
+The file is a sequence of little-endian struct records:
+
+    header   b"AURJ", format version
+    chunk    first tick, raw size, stored size, compressed flag, then the stored
+             payload: keyframe size, keyframe snapshot and entries
+    entry    an operation code followed by its fields
+    index    keyframe count, then the first tick and file offset of each chunk
+    footer   index offset, tick count, final state hash, b"AJIX"
+
+Spells are recorded by value with their snapshot codecs. Keyframes re-anchor the
+durations that follow each aura's clock, the same way restoring a snapshot does,
+so the recorded auras and the replayed ones stay identical to the last bit.
+"""
+
+import bisect
+import hashlib
+import mmap
+import struct
+import time
+import zlib
+
+try:
+    from typing import Iterable
+except ImportError:
+    pass
+
+from aura.aura import (
+    AddSpellEvent,
+    Aura,
+    AuraEvent,
+    CastEvent,
+    DamageEvent,
+    HealEvent,
+    RemoveSpellEvent,
+    Spell,
+)
+from aura.caster import Caster
+from aura.snapshot import (
+    _SPELL,
+    SnapshotContext,
+    _pack_spell,
+    _unpack_spell,
+    pack_auras,
+    unpack_auras,
+)
+
+MAGIC = b"AURJ"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+_CHUNK = struct.Struct("<QII?")
+_KEYFRAME = struct.Struct("<I")
+_INDEX_COUNT = struct.Struct("<I")
+_INDEX_ENTRY = struct.Struct("<QQ")
+_FOOTER = struct.Struct("<QQ8s4s")
+_FOOTER_MAGIC = b"AJIX"
+
+_UPDATE = 1
+_DAMAGE = 2
+_HEAL = 3
+_ADD_SPELL = 4
+_REMOVE_SPELL = 5
+_CAST_SPELL = 6
+
+_OP_AMOUNT = struct.Struct("<BId")
+_OP_AURA = struct.Struct("<BI")
+_OP_POSITION = struct.Struct("<BII")
+_OP_UPDATE = struct.Struct("<Bd")
+_AURA_INDEX = struct.Struct("<I")
+_FLOAT = struct.Struct("<d")
+
+
+def state_hash(auras: "Iterable[Aura]") -> bytes:
+    """Returns an 8 byte hash of the snapshot of auras."""
+    return hashlib.blake2b(pack_auras(auras), digest_size=8).digest()
+
+
+def _anchor_durations(aura: Aura) -> None:
+    """Reschedules the durations following the aura's clock in the order restoring a
+    snapshot binds them, so the aura matches its restored copy exactly."""
+    for modifiers in (aura.magic.max.modifiers, aura.cast_delay.modifiers):
+        for modifier in modifiers:
+            duration = modifier.duration
+            duration.elapsed = duration.elapsed
+    for spell in aura._spells._entries:
+        if spell is not None and spell.TIMED:
+            duration = spell.duration
+            duration.elapsed = duration.elapsed
+
+
+class JournalRecorder:
+    """Applies calls to a fixed list of auras and records them in a journal file."""
+
+    def __init__(
+        self,
+        path: str,
+        auras: "Iterable[Aura]",
+        keyframe_interval: int = 600,
+        compress: bool = False,
+    ) -> None:
+        """Creates the journal file and records the first keyframe.
+
+        Args:
+            path: The file to write, replaced if it exists.
+            auras: The auras to record, referred to by their position in the journal.
+            keyframe_interval: The number of updates between keyframes.
+            compress: Compress each chunk with zlib.
+
+        Raises:
+            ValueError: If an aura carries a spell without a registered codec.
+        """
+        self._auras: list[Aura] = list(auras)
+        self._indices: dict[Aura, int] = {
+            aura: index for index, aura in enumerate(self._auras)
+        }
+        self._keyframe_interval: int = keyframe_interval
+        self._compress: bool = compress
+        self._tick: int = 0
+        self._chunks: list[tuple[int, int]] = []
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self._chunk_tick: int = 0
+        self._entries = bytearray()
+        self._start_chunk()
+
+    def process_event(self, aura: Aura, event: AuraEvent) -> None:
+        """Records an event and processes it on an aura.
+
+        Args:
+            aura: The recorded aura receiving the event.
+            event: A damage, heal, add spell, remove spell or cast event.
+
+        Raises:
+            ValueError: If the event type cannot be recorded.
+        """
+        index = self._indices[aura]
+        event_type = type(event)
+        if event_type is DamageEvent:
+            self._entries += _OP_AMOUNT.pack(_DAMAGE, index, event.amount)
+        elif event_type is HealEvent:
+            self._entries += _OP_AMOUNT.pack(_HEAL, index, event.amount)
+        elif event_type is AddSpellEvent:
+            self._record_spell(_ADD_SPELL, index, event.spell)
+        elif event_type is CastEvent:
+            self._record_spell(_CAST_SPELL, index, event.spell)
+        elif event_type is RemoveSpellEvent:
+            position = _position(aura, event.spell)
+            # Removing a spell that is not active cancels the event and is not recorded
+            if position is not None:
+                self._entries += _OP_POSITION.pack(_REMOVE_SPELL, index, position)
+        else:
+            raise ValueError(f"Cannot record {event_type.__name__} in a journal")
+        aura.process_event(event)
+
+    def add_spell(self, aura: Aura, spell: Spell) -> None:
+        """Records and adds a spell to an aura."""
+        self.process_event(aura, AddSpellEvent(spell))
+
+    def remove_spell(self, aura: Aura, spell: Spell) -> None:
+        """Records and removes a spell from an aura."""
+        self.process_event(aura, RemoveSpellEvent(spell))
+
+    def cast_spell(self, aura: Aura, spell: Spell) -> None:
+        """Records and casts a spell on an aura."""
+        self.process_event(aura, CastEvent(spell))
+
+    def update(self, elapsed_time: float) -> None:
+        """Records an update and updates every aura in order. Starts a new chunk with
+        a keyframe every keyframe_interval updates.
+
+        Args:
+            elapsed_time: The time passed since the last update.
+        """
+        self._entries += _OP_UPDATE.pack(_UPDATE, elapsed_time)
+        for aura in self._auras:
+            aura.update(elapsed_time)
+        self._tick += 1
+        if self._tick - self._chunk_tick >= self._keyframe_interval:
+            self._write_chunk()
+            self._start_chunk()
+
+    def close(self) -> None:
+        """Writes the last chunk, the keyframe index and the final state hash."""
+        if self._file.closed:
+            return
+        self._write_chunk()
+        index_offset = self._file.tell()
+        self._file.write(_INDEX_COUNT.pack(len(self._chunks)))
+        for tick, offset in self._chunks:
+            self._file.write(_INDEX_ENTRY.pack(tick, offset))
+        self._file.write(
+            _FOOTER.pack(
+                index_offset, self._tick, state_hash(self._auras), _FOOTER_MAGIC
+            )
+        )
+        self._file.close()
+
+    def _record_spell(self, op: int, index: int, spell: Spell) -> None:
+        # Packed separately so a spell without a codec leaves the entries intact
+        entry = bytearray(_OP_AURA.pack(op, index))
+        _pack_spell(entry, spell, SnapshotContext(self._auras[index]))
+        self._entries += entry
+
+    def _start_chunk(self) -> None:
+        for aura in self._auras:
+            _anchor_durations(aura)
+        keyframe = pack_auras(self._auras)
+        self._chunk_tick = self._tick
+        self._entries = bytearray(_KEYFRAME.pack(len(keyframe)))
+        self._entries += keyframe
+
+    def _write_chunk(self) -> None:
+        raw = self._entries
+        stored = zlib.compress(raw) if self._compress else raw
+        self._chunks.append((self._chunk_tick, self._file.tell()))
+        self._file.write(
+            _CHUNK.pack(self._chunk_tick, len(raw), len(stored), self._compress)
+        )
+        self._file.write(stored)
+        self._entries = bytearray()
+
+    @property
+    def auras(self) -> list[Aura]:
+        """The recorded auras, in journal order."""
+        return self._auras
+
+    @property
+    def tick(self) -> int:
+        """The number of recorded updates."""
+        return self._tick
+
+    def __enter__(self) -> "JournalRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _position(aura: Aura, spell: Spell) -> int | None:
+    """Returns the position of a spell in the aura's spells, or None if it is not
+    active."""
+    for position, active in enumerate(aura.spells):
+        if active is spell:
+            return position
+    return None
+
+
+class ReplayResult:
+    """The auras at the end of a replay and how fast it ran."""
+
+    def __init__(
+        self, auras: list[Aura], ticks: int, entries: int, elapsed_ns: int
+    ) -> None:
+        """Initializes the result.
+
+        Args:
+            auras: The replayed auras.
+            ticks: The number of updates replayed.
+            entries: The number of recorded calls replayed, including updates.
+            elapsed_ns: The wall clock time of the replay in nanoseconds.
+        """
+        self.auras: list[Aura] = auras
+        self.ticks: int = ticks
+        self.entries: int = entries
+        self.elapsed_ns: int = elapsed_ns
+
+    @property
+    def entries_per_second(self) -> float:
+        """Returns the replayed calls per second of wall clock time."""
+        if self.elapsed_ns == 0:
+            return 0.0
+        return self.entries * 1e9 / self.elapsed_ns
+
+
+class JournalReader:
+    """Reads a journal through a memory map and replays it."""
+
+    def __init__(self, path: str) -> None:
+        """Opens a journal. Journals that were not closed are read up to their last
+        complete chunk, without a final state hash.
+
+        Args:
+            path: The journal file.
+
+        Raises:
+            ValueError: If the file is not a journal of a supported version.
+        """
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Journal file is empty")
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError("Data is too short for an aura journal")
+        magic, version = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Data is not an aura journal")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported aura journal version {version}")
+
+        self._tick_count: int | None = None
+        self._final_hash: bytes | None = None
+        self._chunks: list[tuple[int, int]] = self._read_index()
+        if self._chunks is None:
+            self._chunks = self._scan_chunks()
+        self._chunk_ticks: list[int] = [tick for tick, _ in self._chunks]
+
+    def _read_index(self) -> "list[tuple[int, int]] | None":
+        """Reads the keyframe index written when the journal was closed."""
+        size = len(self._map)
+        if size < _HEADER.size + _FOOTER.size:
+            return None
+        index_offset, tick_count, final_hash, magic = _FOOTER.unpack_from(
+            self._map, size - _FOOTER.size
+        )
+        if magic != _FOOTER_MAGIC:
+            return None
+        (count,) = _INDEX_COUNT.unpack_from(self._map, index_offset)
+        offset = index_offset + _INDEX_COUNT.size
+        chunks = []
+        for _ in range(count):
+            chunks.append(_INDEX_ENTRY.unpack_from(self._map, offset))
+            offset += _INDEX_ENTRY.size
+        self._tick_count = tick_count
+        self._final_hash = final_hash
+        return chunks
+
+    def _scan_chunks(self) -> list[tuple[int, int]]:
+        """Finds the complete chunks of a journal that has no index."""
+        size = len(self._map)
+        offset = _HEADER.size
+        chunks = []
+        while offset + _CHUNK.size <= size:
+            tick, _, stored_size, _ = _CHUNK.unpack_from(self._map, offset)
+            end = offset + _CHUNK.size + stored_size
+            if end > size:
+                break
+            chunks.append((tick, offset))
+            offset = end
+        return chunks
+
+    def _payload(self, chunk: int) -> tuple[int, memoryview]:
+        """Returns the first tick and the raw payload of a chunk."""
+        offset = self._chunks[chunk][1]
+        tick, raw_size, stored_size, compressed = _CHUNK.unpack_from(self._map, offset)
+        start = offset + _CHUNK.size
+        stored = self._map[start : start + stored_size]
+        if compressed:
+            stored = zlib.decompress(stored)
+        if len(stored) != raw_size:
+            raise ValueError(f"Corrupt aura journal chunk at tick {tick}")
+        return tick, memoryview(stored)
+
+    def _keyframe(self, payload: memoryview) -> tuple[memoryview, int]:
+        """Returns the keyframe of a chunk payload and the offset of its entries."""
+        (size,) = _KEYFRAME.unpack_from(payload, 0)
+        start = _KEYFRAME.size
+        return payload[start : start + size], start + size
+
+    def seek(self, tick: int, caster: Caster | None = None) -> list[Aura]:
+        """Restores the auras as they were right after an update.
+
+        Args:
+            tick: The number of updates, zero for the state when recording started.
+            caster: The caster given to restored spells that cast other spells.
+
+        Returns:
+            New auras in journal order.
+
+        Raises:
+            ValueError: If the tick is not in the journal.
+        """
+        return self._replay(tick, tick, caster, verify=False).auras
+
+    def replay(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        caster: Caster | None = None,
+        verify: bool = True,
+    ) -> ReplayResult:
+        """Replays the journal from a tick at full speed.
+
+        Args:
+            start: The tick to start from, restored from the nearest keyframe.
+            stop: The tick to stop at, or None to replay to the end.
+            caster: The caster given to replayed spells that cast other spells.
+            verify: Compare the replayed state to each keyframe passed and to the final
+                state hash when replaying to the end of a closed journal.
+
+        Returns:
+            The replayed auras and the replay speed, timed from the start tick.
+
+        Raises:
+            ValueError: If the ticks are not in the journal or, when verifying, the
+                replayed state differs from the recorded one.
+        """
+        return self._replay(start, stop, caster, verify)
+
+    def _replay(
+        self, start: int, stop: int | None, caster: Caster | None, verify: bool
+    ) -> ReplayResult:
+        if not self._chunks or start < 0:
+            raise ValueError(f"Tick {start} is not in the journal")
+        if self._tick_count is not None and start > self._tick_count:
+            raise ValueError(f"Tick {start} is not in the journal")
+        chunk = bisect.bisect_right(self._chunk_ticks, start) - 1
+        tick, payload = self._payload(chunk)
+        keyframe, offset = self._keyframe(payload)
+        auras = unpack_auras(keyframe, caster)
+        if tick < start:
+            tick, _, offset = _apply_entries(
+                auras, payload, offset, tick, start, caster
+            )
+            if tick < start:
+                raise ValueError(f"Tick {start} is not in the journal")
+
+        began = time.perf_counter_ns()
+        first_tick = tick
+        entries = 0
+        while True:
+            tick, applied, offset = _apply_entries(
+                auras, payload, offset, tick, stop, caster
+            )
+            entries += applied
+            if tick == stop or chunk + 1 >= len(self._chunks):
+                break
+            chunk += 1
+            tick, payload = self._payload(chunk)
+            keyframe, offset = self._keyframe(payload)
+            for aura in auras:
+                _anchor_durations(aura)
+            if verify and pack_auras(auras) != keyframe:
+                raise ValueError(f"Replay diverged from the journal before tick {tick}")
+        elapsed_ns = time.perf_counter_ns() - began
+
+        if stop is not None and tick < stop:
+            raise ValueError(f"Tick {stop} is not in the journal")
+        if verify and stop is None and self._final_hash is not None:
+            if state_hash(auras) != self._final_hash:
+                raise ValueError("Replay diverged from the journal's final state")
+        return ReplayResult(auras, tick - first_tick, entries, elapsed_ns)
+
+    @property
+    def keyframes(self) -> list[int]:
+        """The ticks of the keyframes, in order."""
+        return list(self._chunk_ticks)
+
+    @property
+    def tick_count(self) -> int | None:
+        """The number of recorded updates, or None for a journal that was not
+        closed."""
+        return self._tick_count
+
+    @property
+    def final_hash(self) -> bytes | None:
+        """The hash of the final state, or None for a journal that was not closed."""
+        return self._final_hash
+
+    def close(self) -> None:
+        """Unmaps and closes the journal file."""
+        if hasattr(self, "_map"):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _apply_entries(
+    auras: list[Aura],
+    payload: memoryview,
+    offset: int,
+    tick: int,
+    stop: int | None,
+    caster: Caster | None,
+) -> tuple[int, int, int]:
+    """Applies the entries of a chunk payload from an offset, until the end of the
+    payload or until the tick reaches stop.
+
+    Returns:
+        The tick reached, the number of entries applied and the offset of the next
+        entry.
+    """
+    end = len(payload)
+    applied = 0
+    while offset < end and tick != stop:
+        op = payload[offset]
+        if op == _UPDATE:
+            (elapsed_time,) = _FLOAT.unpack_from(payload, offset + 1)
+            offset += _OP_UPDATE.size
+            for aura in auras:
+                aura.update(elapsed_time)
+            tick += 1
+        else:
+            (index,) = _AURA_INDEX.unpack_from(payload, offset + 1)
+            aura = auras[index]
+            offset += _OP_AURA.size
+            if op == _DAMAGE or op == _HEAL:
+                (amount,) = _FLOAT.unpack_from(payload, offset)
+                offset += _FLOAT.size
+                if op == _DAMAGE:
+                    aura.process_event(DamageEvent(amount))
+                else:
+                    aura.process_event(HealEvent(amount))
+            elif op == _REMOVE_SPELL:
+                (position,) = _AURA_INDEX.unpack_from(payload, offset)
+                offset += _AURA_INDEX.size
+                aura.process_event(RemoveSpellEvent(list(aura.spells)[position]))
+            elif op == _ADD_SPELL or op == _CAST_SPELL:
+                code, level = _SPELL.unpack_from(payload, offset)
+                spell, offset = _unpack_spell(
+                    payload,
+                    offset + _SPELL.size,
+                    code,
+                    level,
+                    SnapshotContext(aura, caster),
+                )
+                if op == _ADD_SPELL:
+                    aura.process_event(AddSpellEvent(spell))
+                else:
+                    aura.process_event(CastEvent(spell))
+            else:
+                raise ValueError(f"Unknown aura journal operation {op}")
+        applied += 1
+    return tick, applied, offset
@@ -0,0 +1,189 @@
+"""Runtime counters and latency histograms of auras and worlds.
+
+Metrics are off by default. Assigning an AuraMetrics to Aura.metrics turns them on
+for that aura, and AuraWorld.enable_metrics turns them on for every aura of a world.
+While off, the instrumented paths only check that the metrics attribute is None.
+
+Counters are plain integers kept by event, spell and combination class. Durations
+are recorded in LogHistograms, whose buckets are powers of two nanoseconds, so
+recording is a bit length and an increment and percentiles are exact to a factor
+of two.
+"""
+
+
+class LogHistogram:
+    """A histogram of nanosecond durations in buckets bounded by powers of two."""
+
+    BUCKETS = 64
+    """Bucket b counts durations below 2**b nanoseconds and not below 2**(b-1)."""
+
+    __slots__ = ("_counts", "count", "sum")
+
+    def __init__(self) -> None:
+        self._counts: list[int] = [0] * LogHistogram.BUCKETS
+        self.count: int = 0
+        self.sum: int = 0
+        """The sum of the recorded durations in nanoseconds."""
+
+    def record(self, nanoseconds: int) -> None:
+        """Records a duration in nanoseconds."""
+        self._counts[min(nanoseconds.bit_length(), LogHistogram.BUCKETS - 1)] += 1
+        self.count += 1
+        self.sum += nanoseconds
+
+    def percentile(self, percentile: float) -> int:
+        """Returns the upper bound in nanoseconds of the bucket holding a percentile,
+        or 0 if nothing was recorded.
+
+        Args:
+            percentile: The percentile, between 0 and 100.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return 1 << bucket
+        return 1 << (LogHistogram.BUCKETS - 1)
+
+    def buckets(self) -> list[tuple[int, int]]:
+        """Returns the upper bound in nanoseconds and the cumulative count of each
+        bucket up to the last one holding a duration."""
+        last = max(
+            (bucket for bucket, count in enumerate(self._counts) if count), default=-1
+        )
+        result = []
+        seen = 0
+        for bucket in range(last + 1):
+            seen += self._counts[bucket]
+            result.append((1 << bucket, seen))
+        return result
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Adds the durations recorded by another histogram."""
+        for bucket, count in enumerate(other._counts):
+            self._counts[bucket] += count
+        self.count += other.count
+        self.sum += other.sum
+
+
+class AuraMetrics:
+    """Counters of the events, spells and combinations of auras, and the durations of
+    their updates."""
+
+    __slots__ = (
+        "events",
+        "canceled",
+        "canceled_by",
+        "spells_added",
+        "spells_removed",
+        "spells_absorbed",
+        "combinations",
+        "tick_ns",
+    )
+
+    PERCENTILES = (50, 90, 99)
+    """The tick duration percentiles reported by as_dict."""
+
+    def __init__(self) -> None:
+        self.events: dict[type, int] = {}
+        """Events processed by event class."""
+        self.canceled: dict[type, int] = {}
+        """Events canceled by event class."""
+        self.canceled_by: dict[type, int] = {}
+        """Events canceled by the class of the spell that canceled them."""
+        self.spells_added: int = 0
+        self.spells_removed: int = 0
+        self.spells_absorbed: int = 0
+        """Spells kept from being added by an active spell canceling their event."""
+        self.combinations: dict[type, int] = {}
+        """Combinations triggered by combination class."""
+        self.tick_ns = LogHistogram()
+        """Durations of Aura.update calls, or of world ticks for the metrics of a
+        world."""
+
+    def merge(self, other: "AuraMetrics", ticks: bool = True) -> None:
+        """Adds the counts of other metrics.
+
+        Args:
+            other: The metrics to add.
+            ticks: Whether to add the tick durations too.
+        """
+        for mine, theirs in (
+            (self.events, other.events),
+            (self.canceled, other.canceled),
+            (self.canceled_by, other.canceled_by),
+            (self.combinations, other.combinations),
+        ):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.spells_added += other.spells_added
+        self.spells_removed += other.spells_removed
+        self.spells_absorbed += other.spells_absorbed
+        if ticks:
+            self.tick_ns.merge(other.tick_ns)
+
+    def as_dict(self) -> dict:
+        """Returns the metrics as a dictionary of plain values, with classes replaced
+        by their names."""
+        return {
+            "events": _by_name(self.events),
+            "canceled": _by_name(self.canceled),
+            "canceled_by": _by_name(self.canceled_by),
+            "spells_added": self.spells_added,
+            "spells_removed": self.spells_removed,
+            "spells_absorbed": self.spells_absorbed,
+            "combinations": _by_name(self.combinations),
+            "ticks": self.tick_ns.count,
+            "tick_ns_sum": self.tick_ns.sum,
+            **{
+                f"tick_ns_p{percentile}": self.tick_ns.percentile(percentile)
+                for percentile in AuraMetrics.PERCENTILES
+            },
+        }
+
+    def prometheus(self, prefix: str = "aura") -> str:
+        """Returns the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: The prefix of the metric names.
+        """
+        lines: list[str] = []
+        _counter(lines, f"{prefix}_events_total", "type", self.events)
+        _counter(lines, f"{prefix}_events_canceled_total", "type", self.canceled)
+        _counter(lines, f"{prefix}_events_canceled_by_total", "spell", self.canceled_by)
+        for name, value in (
+            ("spells_added_total", self.spells_added),
+            ("spells_removed_total", self.spells_removed),
+            ("spells_absorbed_total", self.spells_absorbed),
+        ):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name} {value}")
+        _counter(
+            lines, f"{prefix}_combinations_total", "combination", self.combinations
+        )
+
+        name = f"{prefix}_tick_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for bound, count in self.tick_ns.buckets():
+            lines.append(f'{name}_bucket{{le="{bound / 1e9:.9g}"}} {count}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.tick_ns.count}')
+        lines.append(f"{name}_sum {self.tick_ns.sum / 1e9:.9g}")
+        lines.append(f"{name}_count {self.tick_ns.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _by_name(counts: dict[type, int]) -> dict[str, int]:
+    named: dict[str, int] = {}
+    for key, count in counts.items():
+        # Classes of different modules may share a name
+        named[key.__name__] = named.get(key.__name__, 0) + count
+    return named
+
+
+def _counter(lines: list[str], name: str, label: str, counts: dict[type, int]) -> None:
+    lines.append(f"# TYPE {name} counter")
+    for key, count in sorted(_by_name(counts).items()):
+        lines.append(f'{name}{{{label}="{key}"}} {count}')
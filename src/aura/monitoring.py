@@ -0,0 +1,239 @@
+"""Opt-in accounting of the time spent in spells, event listeners and combinations.
+
+A SpellMonitor instruments, through sys.monitoring, the update, modify_event, start
+and stop methods of every Spell subclass, the on_spell_event and on_spell_events
+methods of every EventListener and the check method of every SpellCombination.
+Calls are attributed to the class of the object they were made on, so a spell
+inheriting its update method is still reported under its own name.
+
+Only the code of those methods is instrumented, and only while the monitor runs.
+Stopping the monitor removes the instrumentation, so the methods run at full speed
+whenever no monitor is running.
+
+    monitor = SpellMonitor()
+    with monitor:
+        world.update(elapsed_time)
+    print(monitor.table())
+"""
+
+import sys
+import time
+
+try:
+    from typing import Iterable
+except ImportError:
+    pass
+
+from aura.aura import EventListener, Spell
+from aura.spell.combo.combo import SpellCombination
+
+MONITORED_METHODS: dict[type, tuple[str, ...]] = {
+    Spell: ("update", "modify_event", "start", "stop"),
+    EventListener: ("on_spell_event", "on_spell_events"),
+    SpellCombination: ("check",),
+}
+"""The methods instrumented for each base class and its subclasses."""
+
+_TOOL_IDS = (sys.monitoring.PROFILER_ID, 3, 4)
+"""The sys.monitoring tool ids tried in order. cProfile also uses PROFILER_ID."""
+
+
+class MethodCost:
+    """The calls and wall time of a method, for one class of receivers."""
+
+    __slots__ = ("owner", "method", "calls", "total_ns", "self_ns")
+
+    def __init__(self, owner: str, method: str) -> None:
+        self.owner: str = owner
+        self.method: str = method
+        self.calls: int = 0
+        self.total_ns: int = 0
+        """Time from entering to leaving the method, including nested calls."""
+        self.self_ns: int = 0
+        """Time spent in the method outside of nested monitored methods."""
+
+    @property
+    def name(self) -> str:
+        """Returns the qualified name of the method, such as "RegenSpell.update"."""
+        return f"{self.owner}.{self.method}"
+
+
+def _subclasses(base: type) -> list[type]:
+    """Returns a class and all of its subclasses."""
+    found = [base]
+    index = 0
+    while index < len(found):
+        for subclass in found[index].__subclasses__():
+            if subclass not in found:
+                found.append(subclass)
+        index += 1
+    return found
+
+
+class SpellMonitor:
+    """Attributes call counts and wall time to spell, listener and combination
+    methods while it runs."""
+
+    def __init__(self) -> None:
+        self._tool_id: int | None = None
+        # Maps monitored code to the name of its method
+        self._codes: dict[object, str] = {}
+        self._costs: dict[tuple[str, str], MethodCost] = {}
+        # The monitored calls in progress: code, cost, start time, time in nested calls
+        self._stack: list[list] = []
+        # Self time by stack of method names, for collapsed stacks
+        self._stacks: dict[tuple[str, ...], int] = {}
+
+    def start(self, classes: "Iterable[type] | None" = None) -> None:
+        """Instruments the monitored methods and starts collecting.
+
+        Args:
+            classes: The classes whose methods are monitored, along with their
+                subclasses. Defaults to the base classes of MONITORED_METHODS.
+                Subclasses defined after start are not monitored.
+
+        Raises:
+            ValueError: If the monitor is running or no sys.monitoring tool id is free.
+        """
+        if self._tool_id is not None:
+            raise ValueError("The monitor is already running")
+        monitoring = sys.monitoring
+        for tool_id in _TOOL_IDS:
+            if monitoring.get_tool(tool_id) is None:
+                break
+        else:
+            raise ValueError("No sys.monitoring tool id is free")
+
+        monitoring.use_tool_id(tool_id, "aura.SpellMonitor")
+        self._tool_id = tool_id
+        events = monitoring.events
+        monitoring.register_callback(tool_id, events.PY_START, self._enter)
+        monitoring.register_callback(tool_id, events.PY_RETURN, self._leave)
+        monitoring.register_callback(tool_id, events.PY_UNWIND, self._unwind)
+
+        self._codes = {}
+        roots = MONITORED_METHODS if classes is None else classes
+        for root in roots:
+            methods = self._methods(root)
+            for cls in _subclasses(root):
+                for method in methods:
+                    function = cls.__dict__.get(method)
+                    code = getattr(function, "__code__", None)
+                    if code is not None:
+                        self._codes[code] = method
+        for code in self._codes:
+            monitoring.set_local_events(
+                tool_id, code, events.PY_START | events.PY_RETURN
+            )
+        # Exceptions leaving a monitored method are only reported globally
+        monitoring.set_events(tool_id, events.PY_UNWIND)
+
+    @staticmethod
+    def _methods(cls: type) -> tuple[str, ...]:
+        for base, methods in MONITORED_METHODS.items():
+            if issubclass(cls, base):
+                return methods
+        raise ValueError(f"{cls.__qualname__} has no monitored methods")
+
+    def stop(self) -> None:
+        """Removes the instrumentation. The collected costs are kept."""
+        tool_id = self._tool_id
+        if tool_id is None:
+            return
+        monitoring = sys.monitoring
+        monitoring.set_events(tool_id, monitoring.events.NO_EVENTS)
+        for code in self._codes:
+            monitoring.set_local_events(tool_id, code, monitoring.events.NO_EVENTS)
+        for event in (
+            monitoring.events.PY_START,
+            monitoring.events.PY_RETURN,
+            monitoring.events.PY_UNWIND,
+        ):
+            monitoring.register_callback(tool_id, event, None)
+        monitoring.free_tool_id(tool_id)
+        self._tool_id = None
+        self._stack.clear()
+
+    def reset(self) -> None:
+        """Discards the collected costs."""
+        self._costs.clear()
+        self._stacks.clear()
+
+    @property
+    def running(self) -> bool:
+        """Whether the methods are instrumented."""
+        return self._tool_id is not None
+
+    def _enter(self, code, instruction_offset: int) -> None:
+        method = self._codes[code]
+        # The receiver is the first argument of the monitored frame
+        receiver = sys._getframe(1).f_locals[code.co_varnames[0]]
+        key = (type(receiver).__qualname__, method)
+        cost = self._costs.get(key)
+        if cost is None:
+            cost = self._costs[key] = MethodCost(*key)
+        self._stack.append([code, cost, time.perf_counter_ns(), 0])
+
+    def _leave(self, code, instruction_offset: int, retval: object) -> None:
+        now = time.perf_counter_ns()
+        stack = self._stack
+        if not stack or stack[-1][0] is not code:
+            # Entered before the monitor started
+            return
+        _, cost, start, nested = stack.pop()
+        elapsed = now - start
+        cost.calls += 1
+        cost.total_ns += elapsed
+        cost.self_ns += elapsed - nested
+        names = tuple(entry[1].name for entry in stack) + (cost.name,)
+        self._stacks[names] = self._stacks.get(names, 0) + elapsed - nested
+        if stack:
+            stack[-1][3] += elapsed
+
+    def _unwind(self, code, instruction_offset: int, exception: BaseException) -> None:
+        if code in self._codes:
+            self._leave(code, instruction_offset, None)
+
+    def __enter__(self) -> "SpellMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def costs(self) -> list[MethodCost]:
+        """Returns the costs of the called methods, the most total time first."""
+        return sorted(
+            self._costs.values(), key=lambda cost: (-cost.total_ns, cost.name)
+        )
+
+    def table(self, limit: int | None = None) -> str:
+        """Returns the costs as a text table sorted by total time.
+
+        Args:
+            limit: The number of methods listed, all of them when None.
+        """
+        costs = self.costs if limit is None else self.costs[:limit]
+        width = max([len("method")] + [len(cost.name) for cost in costs])
+        lines = [
+            f"{'method':<{width}} {'calls':>10} {'total ms':>10} {'self ms':>10} "
+            f"{'us/call':>10}"
+        ]
+        for cost in costs:
+            per_call = cost.total_ns / cost.calls / 1000 if cost.calls else 0.0
+            lines.append(
+                f"{cost.name:<{width}} {cost.calls:>10} {cost.total_ns / 1e6:>10.3f} "
+                f"{cost.self_ns / 1e6:>10.3f} {per_call:>10.2f}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def collapsed(self) -> str:
+        """Returns the self time of each stack of monitored methods in the collapsed
+        stack format of flame graph tools, in microseconds."""
+        lines = []
+        for stack, elapsed_ns in sorted(self._stacks.items()):
+            microseconds = elapsed_ns // 1000
+            if microseconds:
+                lines.append(f"{';'.join(stack)} {microseconds}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,317 @@
+"""Binary deltas of aura state for replicating auras to other processes.
+
+A DeltaEncoder on the sending side turns the auras that changed, such as the ones
+returned by AuraWorld.collect_changes, into deltas against the state the receiver
+last acknowledged. A DeltaDecoder on the receiving side applies the deltas to
+replica auras. Deltas may be lost or arrive out of order: every delta carries all
+changes the receiver has not acknowledged yet, so the newest delta received brings
+the replicas up to date and older ones are skipped.
+
+A delta is a sequence of little-endian struct records:
+
+    header    b"AURD", format version, sequence number, record count
+    record    aura key, AuraChange bits (zero when the aura was removed), followed
+              by the sections of the changed state in this order:
+    max       base max magic, modifier count, modifiers
+    delay     base cast delay, modifier count, modifiers
+    spells    spell count, spells
+    magic     magic value, min magic
+
+Modifiers and spells use the records of the snapshot format, so custom spells need
+a codec registered with register_spell_codec. Resent modifier lists are followed by
+the spells, which may refer to the modifiers by index.
+
+Durations that follow the aura's clock, such as the ones of TIMED spells and
+modifiers, are sent with their elapsed time when their section changes but not
+resent as time passes. Receivers update their replicas with the same elapsed time
+as the sender to move them on between deltas, and the deltas overwrite the state
+that changed. Spells changed between updates may have changed a replica's magic
+where the sender's stayed the same, so the magic is resent with the spells.
+"""
+
+import struct
+
+try:
+    from typing import Iterable
+except ImportError:
+    pass
+
+from aura.aura import Aura, AuraChange
+from aura.caster import Caster
+from aura.snapshot import (
+    _MODIFIER,
+    _pack_modifiers,
+    _pack_spells,
+    _restore_modifier,
+    _unpack_spells,
+)
+from aura.values import ValueModifiers, ValueWithModifiers
+
+DELTA_MAGIC = b"AURD"
+DELTA_VERSION = 1
+
+_HEADER = struct.Struct("<4sHII")
+_RECORD = struct.Struct("<IB")
+_VALUE = struct.Struct("<dH")
+_SPELLS = struct.Struct("<H")
+_MAGIC = struct.Struct("<dd")
+
+_SPELL_CHANGES = AuraChange.SPELL_SET | AuraChange.SPELL_FIELDS
+_MODIFIER_CHANGES = AuraChange.MAX_MAGIC | AuraChange.CAST_DELAY
+
+
+class DeltaEncoder:
+    """Encodes aura changes for one receiver against the state it acknowledged."""
+
+    __slots__ = (
+        "_keys",
+        "_next_key",
+        "_acked",
+        "_unacked",
+        "_removed",
+        "_sequence",
+        "_in_flight",
+    )
+
+    def __init__(self) -> None:
+        # Keys identifying the auras in deltas, assigned when an aura is first sent
+        self._keys: dict[Aura, int] = {}
+        self._next_key: int = 0
+        # The generation of each aura the receiver acknowledged
+        self._acked: dict[Aura, int] = {}
+        # Auras with changes the receiver has not acknowledged, sent by every delta
+        self._unacked: dict[Aura, None] = {}
+        # Keys of removed auras, sent by every delta until acknowledged
+        self._removed: dict[int, None] = {}
+        self._sequence: int = 0
+        # What each unacknowledged delta sent: keys with the sent generation, or None
+        # for removals
+        self._in_flight: dict[int, list[tuple[int, Aura | None, int]]] = {}
+
+    def key(self, aura: Aura) -> int:
+        """Returns the key identifying an aura in the deltas, assigning a new key to
+        auras that were not sent yet.
+
+        Args:
+            aura: The aura to identify.
+        """
+        key = self._keys.get(aura)
+        if key is None:
+            key = self._keys[aura] = self._next_key
+            self._next_key += 1
+        return key
+
+    def encode(self, changed: "Iterable[Aura]") -> bytes:
+        """Encodes the changes of the auras and of every aura the receiver has not
+        acknowledged yet. Auras encoded for the first time are sent in full.
+
+        Args:
+            changed: The auras that changed since the last delta. Only the changed
+                state is sent, so passing unchanged auras costs no bandwidth.
+
+        Returns:
+            The delta bytes.
+
+        Raises:
+            ValueError: If a changed aura carries a spell without a registered codec.
+        """
+        unacked = self._unacked
+        for aura in changed:
+            self.key(aura)
+            unacked[aura] = None
+
+        self._sequence += 1
+        out = bytearray(_HEADER.size)
+        sent: list[tuple[int, Aura | None, int]] = []
+        for key in self._removed:
+            out += _RECORD.pack(key, 0)
+            sent.append((key, None, 0))
+
+        acked = self._acked
+        for aura in unacked:
+            changes = aura.changes_since(acked.get(aura, -1))
+            if not changes:
+                continue
+            key = self._keys[aura]
+            _pack_record(out, key, changes, aura)
+            sent.append((key, aura, aura.generation))
+
+        _HEADER.pack_into(out, 0, DELTA_MAGIC, DELTA_VERSION, self._sequence, len(sent))
+        if sent:
+            self._in_flight[self._sequence] = sent
+        return bytes(out)
+
+    def acknowledge(self, sequence: int) -> None:
+        """Records that the receiver applied a delta. Earlier deltas that were not
+        acknowledged are superseded by it.
+
+        Args:
+            sequence: The sequence number returned by DeltaDecoder.decode.
+        """
+        while self._in_flight:
+            oldest = next(iter(self._in_flight))
+            if oldest > sequence:
+                break
+            for key, aura, generation in self._in_flight.pop(oldest):
+                if aura is None:
+                    self._removed.pop(key, None)
+                elif self._keys.get(aura) == key:
+                    if generation > self._acked.get(aura, -1):
+                        self._acked[aura] = generation
+                    if generation >= aura.generation:
+                        self._unacked.pop(aura, None)
+
+    def remove(self, aura: Aura) -> None:
+        """Removes an aura from the receiver. The aura gets a new key if it is encoded
+        again.
+
+        Args:
+            aura: The aura to remove.
+        """
+        key = self._keys.pop(aura, None)
+        if key is None:
+            return
+        self._acked.pop(aura, None)
+        self._unacked.pop(aura, None)
+        self._removed[key] = None
+
+    @property
+    def sequence(self) -> int:
+        """The sequence number of the last encoded delta."""
+        return self._sequence
+
+    @property
+    def unacknowledged(self) -> int:
+        """The number of auras with changes the receiver has not acknowledged."""
+        return len(self._unacked)
+
+
+class DeltaDecoder:
+    """Applies deltas to replica auras."""
+
+    __slots__ = ("_auras", "_sequence", "_caster")
+
+    def __init__(self, caster: Caster | None = None) -> None:
+        """Initializes the decoder without replicas.
+
+        Args:
+            caster: The caster given to replicated spells that cast other spells.
+        """
+        self._auras: dict[int, Aura] = {}
+        self._sequence: int = 0
+        self._caster: Caster | None = caster
+
+    def decode(self, data: bytes) -> int:
+        """Applies a delta to the replicas, creating and removing replicas as needed.
+        Deltas older than the last applied one are skipped.
+
+        Args:
+            data: The delta bytes.
+
+        Returns:
+            The sequence number of the delta, to acknowledge to the encoder.
+
+        Raises:
+            ValueError: If the data is not a delta of a supported version or uses an
+                unknown spell code.
+        """
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise ValueError("Data is too short for an aura delta")
+        magic, version, sequence, count = _HEADER.unpack_from(view, 0)
+        if magic != DELTA_MAGIC:
+            raise ValueError("Data is not an aura delta")
+        if version != DELTA_VERSION:
+            raise ValueError(f"Unsupported aura delta version {version}")
+        if sequence <= self._sequence:
+            return sequence
+
+        offset = _HEADER.size
+        try:
+            for _ in range(count):
+                key, changes = _RECORD.unpack_from(view, offset)
+                offset += _RECORD.size
+                if not changes:
+                    self._auras.pop(key, None)
+                    continue
+                aura = self._auras.get(key)
+                if aura is None:
+                    aura = self._auras[key] = Aura(0.0, 0.0, 0.0)
+                offset = _apply_record(view, offset, changes, aura, self._caster)
+        except struct.error as error:
+            raise ValueError(f"Truncated aura delta: {error}") from error
+        self._sequence = sequence
+        return sequence
+
+    @property
+    def auras(self) -> dict[int, Aura]:
+        """The replica auras by key."""
+        return self._auras
+
+    @property
+    def sequence(self) -> int:
+        """The sequence number of the last applied delta."""
+        return self._sequence
+
+
+def _pack_record(out: bytearray, key: int, changes: int, aura: Aura) -> None:
+    spell_count = len(aura._spells)
+    if changes & _MODIFIER_CHANGES and spell_count:
+        # Spells refer to modifiers by their index in the resent lists
+        changes |= AuraChange.SPELL_FIELDS
+    if changes & _SPELL_CHANGES:
+        # Replicas update the spells they had before the delta, which may have
+        # changed their magic where the sender's did not
+        changes |= AuraChange.MAGIC
+    out += _RECORD.pack(key, changes)
+    if changes & AuraChange.MAX_MAGIC:
+        _pack_value(out, aura.magic._max)
+    if changes & AuraChange.CAST_DELAY:
+        _pack_value(out, aura._cast_delay)
+    if changes & _SPELL_CHANGES:
+        out += _SPELLS.pack(spell_count)
+        if spell_count:
+            _pack_spells(out, aura)
+    if changes & AuraChange.MAGIC:
+        out += _MAGIC.pack(aura.magic._value, aura.magic._min)
+
+
+def _pack_value(out: bytearray, value: ValueWithModifiers) -> None:
+    modifiers = value._modifiers._modifiers
+    out += _VALUE.pack(value._base, len(modifiers))
+    if modifiers:
+        _pack_modifiers(out, modifiers)
+
+
+def _apply_record(
+    view: memoryview, offset: int, changes: int, aura: Aura, caster: Caster | None
+) -> int:
+    if changes & AuraChange.MAX_MAGIC:
+        offset = _apply_value(view, offset, aura.magic.max)
+    if changes & AuraChange.CAST_DELAY:
+        offset = _apply_value(view, offset, aura.cast_delay)
+    if changes & _SPELL_CHANGES:
+        (count,) = _SPELLS.unpack_from(view, offset)
+        offset += _SPELLS.size
+        for spell in list(aura.spells):
+            aura._detach_spell(spell)
+        offset = _unpack_spells(view, offset, count, aura, caster)
+    if changes & AuraChange.MAGIC:
+        value, min_magic = _MAGIC.unpack_from(view, offset)
+        offset += _MAGIC.size
+        aura.magic.min = min_magic
+        aura.magic.value = value
+    return offset
+
+
+def _apply_value(view: memoryview, offset: int, value: ValueWithModifiers) -> int:
+    base, count = _VALUE.unpack_from(view, offset)
+    offset += _VALUE.size
+    modifiers: ValueModifiers = value.modifiers
+    for modifier in list(modifiers):
+        modifiers.remove(modifier)
+    for _ in range(count):
+        modifiers.add(_restore_modifier(*_MODIFIER.unpack_from(view, offset)))
+        offset += _MODIFIER.size
+    value.base = base
+    return offset
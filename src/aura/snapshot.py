@@ -0,0 +1,753 @@
+"""Compact binary snapshots of Aura state.
+
+A snapshot is a sequence of little-endian struct records:
+
+    header    b"AURA", format version, aura count
+    aura      clock, magic value, min magic, max magic base, cast delay base,
+              max_events_per_drain, coalesce_damage, modifier and spell counts
+    modifier  multiplier, duration length, elapsed time
+              (the max magic modifiers, then the cast delay modifiers)
+    spell     codec code, level, then the codec's own record
+
+Spells are packed by the SpellCodec registered for their exact class. Built-in
+spells use codes below 256, custom spells register codecs with codes from 256 up
+through register_spell_codec. Modifiers owned by a spell that are also applied to
+the aura's values are packed as indexes into the aura's modifiers, so restored
+spells share them with the restored values.
+
+The clock of each aura's timing wheel is restored with it, so durations that follow
+the clock expire at the same clock times as before. Version 1 snapshots did not store
+the clock and are restored with it at zero.
+
+Restoring builds new auras without running spell start hooks or raising events.
+Event listeners and casters are not part of a snapshot; spells that cast, such as
+IceShield, get the caster passed to unpack_auras, and the SpellCombinations passed
+to it listen to the restored auras and pick up the modifiers their combinations
+left on them. Snapshots are taken between
+updates.
+"""
+
+import struct
+
+try:
+    from typing import Callable, Iterable
+except ImportError:
+    pass
+
+from aura.aura import Aura, Spell
+from aura.caster import Caster
+from aura.spell.combo.combo import SpellCombinations
+from aura.spell.ambient_magic_regen import AmbientMagicRegenSpell
+from aura.spell.elemental.absorb import AbsorbSpell
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.earth_shield import EarthShieldSpell
+from aura.spell.elemental.flash import FlashSpell
+from aura.spell.elemental.freeze import FreezeSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.heal import HealSpell
+from aura.spell.elemental.ice_shield import IceShieldSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.pause import PauseSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.rock import RockSpell
+from aura.spell.elemental.shadow import ShadowSpell
+from aura.spell.elemental.shock import ShockSpell
+from aura.spell.elemental.slice import SliceSpell
+from aura.spell.elemental.unpause import UnpauseSpell
+from aura.spell.elemental.vulnerable import VulnerableSpell
+from aura.spell.elemental.warmth import WarmthSpell
+from aura.spell.elemental.weaken import WeakenSpell
+from aura.spell.elemental.weight import WeightSpell
+from aura.values import Duration, ValueModifier
+
+MAGIC = b"AURA"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<4sHI")
+_AURA = struct.Struct("<dddddi?HHH")
+_AURA_V1 = struct.Struct("<ddddi?HHH")
+_AURA_RECORDS = {1: _AURA_V1, FORMAT_VERSION: _AURA}
+_MODIFIER = struct.Struct("<ddd")
+_SPELL = struct.Struct("<Hi")
+_PACK_AURA = _AURA.pack
+
+_COPY = 0
+"""Spell code of a spell added more than once. The level field holds the position of
+the spell's first copy."""
+
+CUSTOM_CODES = 256
+"""The first spell code available to custom spells."""
+
+
+class SnapshotContext:
+    """The aura being packed or unpacked, passed to spell codecs."""
+
+    __slots__ = ("aura", "caster", "_modifiers")
+
+    def __init__(self, aura: Aura, caster: Caster | None = None) -> None:
+        """Initializes the context.
+
+        Args:
+            aura: The aura being packed, or the aura being restored.
+            caster: The caster given to restored spells that cast other spells.
+        """
+        self.aura: Aura = aura
+        self.caster: Caster | None = caster
+        self._modifiers: list[ValueModifier] | None = None
+
+    @property
+    def modifiers(self) -> list[ValueModifier]:
+        """The aura's max magic modifiers followed by its cast delay modifiers."""
+        if self._modifiers is None:
+            self._modifiers = list(self.aura.magic.max.modifiers) + list(
+                self.aura.cast_delay.modifiers
+            )
+        return self._modifiers
+
+    def pack_modifier(self, modifier: ValueModifier) -> tuple[int, float, float, float]:
+        """Returns the fields of a spell's modifier: its index in modifiers or -1,
+        followed by the multiplier, duration length and elapsed time. Use the
+        format MODIFIER_FORMAT in the codec's record."""
+        duration = modifier.duration
+        index = -1
+        for position, applied in enumerate(self.modifiers):
+            if applied is modifier:
+                index = position
+                break
+        return index, modifier.multiplier, duration.length, duration.elapsed
+
+    def unpack_modifier(
+        self, index: int, multiplier: float, length: float, elapsed: float
+    ) -> ValueModifier:
+        """Returns the modifier packed by pack_modifier, shared with the restored
+        values when it was applied to them."""
+        if index >= 0:
+            return self.modifiers[index]
+        return _restore_modifier(multiplier, length, elapsed)
+
+
+MODIFIER_FORMAT = "iddd"
+"""The record format of the fields returned by SnapshotContext.pack_modifier."""
+
+
+class SpellCodec:
+    """Packs and unpacks the state of one spell class."""
+
+    __slots__ = ("spell_type", "code", "record", "packer", "encode", "decode")
+
+    def __init__(
+        self,
+        spell_type: "type[Spell]",
+        code: int,
+        record_format: str,
+        encode: "Callable[[Spell, SnapshotContext], tuple]",
+        decode: "Callable[[tuple, SnapshotContext], Spell]",
+    ) -> None:
+        """Initializes the codec.
+
+        Args:
+            spell_type: The exact spell class handled by the codec.
+            code: The code identifying the spell class in snapshots.
+            record_format: The struct format of the spell's fields, without byte order.
+            encode: Returns the fields of a spell in record order.
+            decode: Creates a spell from its fields. The level is restored afterwards
+                without calling _update_level, so decode restores level scaled fields.
+        """
+        self.spell_type = spell_type
+        self.code: int = code
+        self.record = struct.Struct("<" + record_format)
+        # Packs the spell header and the record in one call
+        self.packer = struct.Struct("<Hi" + record_format).pack
+        self.encode = encode
+        self.decode = decode
+
+
+_CODECS_BY_TYPE: dict[type, SpellCodec] = {}
+_CODECS_BY_CODE: dict[int, SpellCodec] = {}
+
+
+def register_spell_codec(codec: SpellCodec) -> None:
+    """Registers the codec used for spells of exactly codec.spell_type, replacing an
+    earlier codec for the same class.
+
+    Args:
+        codec: The codec to register.
+
+    Raises:
+        ValueError: If the code is reserved or used by another spell class.
+    """
+    if codec.code == _COPY or not 0 < codec.code <= 0xFFFF:
+        raise ValueError(f"Invalid spell codec code {codec.code}")
+    existing = _CODECS_BY_CODE.get(codec.code)
+    if existing is not None and existing.spell_type is not codec.spell_type:
+        raise ValueError(
+            f"Spell codec code {codec.code} is used by {existing.spell_type.__name__}"
+        )
+
+    replaced = _CODECS_BY_TYPE.get(codec.spell_type)
+    if replaced is not None:
+        del _CODECS_BY_CODE[replaced.code]
+    _CODECS_BY_TYPE[codec.spell_type] = codec
+    _CODECS_BY_CODE[codec.code] = codec
+
+
+def spell_codec(spell_type: type) -> SpellCodec | None:
+    """Returns the codec registered for a spell class, if any."""
+    return _CODECS_BY_TYPE.get(spell_type)
+
+
+def pack_aura(aura: Aura) -> bytes:
+    """Packs a single aura into a snapshot."""
+    return pack_auras((aura,))
+
+
+def unpack_aura(
+    data: bytes,
+    caster: Caster | None = None,
+    combinations: SpellCombinations | None = None,
+) -> Aura:
+    """Restores the single aura of a snapshot created by pack_aura."""
+    auras = unpack_auras(data, caster, combinations)
+    if len(auras) != 1:
+        raise ValueError(f"Expected a snapshot of one aura, found {len(auras)}")
+    return auras[0]
+
+
+def pack_auras(auras: "Iterable[Aura]") -> bytes:
+    """Packs auras into a snapshot.
+
+    Args:
+        auras: The auras to pack, in the order they are restored.
+
+    Returns:
+        The snapshot bytes.
+
+    Raises:
+        ValueError: If an aura carries a spell without a registered codec.
+    """
+    out = bytearray(_HEADER.size)
+    count = 0
+    for aura in auras:
+        _pack_aura(out, aura)
+        count += 1
+    _HEADER.pack_into(out, 0, MAGIC, FORMAT_VERSION, count)
+    return bytes(out)
+
+
+def unpack_auras(
+    data: bytes,
+    caster: Caster | None = None,
+    combinations: SpellCombinations | None = None,
+) -> list[Aura]:
+    """Restores the auras of a snapshot.
+
+    Args:
+        data: The snapshot bytes.
+        caster: The caster given to restored spells that cast other spells.
+        combinations: Added as a listener of each restored aura, after restoring the
+            state its combinations keep for the aura.
+
+    Returns:
+        New auras in the order they were packed.
+
+    Raises:
+        ValueError: If the data is not a snapshot of a supported version or uses an
+            unknown spell code.
+    """
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("Data is too short for an aura snapshot")
+    magic, version, count = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Data is not an aura snapshot")
+    record = _AURA_RECORDS.get(version)
+    if record is None:
+        raise ValueError(f"Unsupported aura snapshot version {version}")
+
+    offset = _HEADER.size
+    auras: list[Aura] = []
+    try:
+        for _ in range(count):
+            aura, offset = _unpack_aura(view, offset, caster, record)
+            auras.append(aura)
+    except struct.error as error:
+        raise ValueError(f"Truncated aura snapshot: {error}") from error
+    if combinations is not None:
+        for aura in auras:
+            combinations.restore(aura)
+            aura.event_listeners.append(combinations)
+    return auras
+
+
+def _pack_aura(out: bytearray, aura: Aura) -> None:
+    # Reads the underlying fields, packing is on the per-frame path for many auras
+    magic = aura.magic
+    max_magic = magic._max
+    cast_delay = aura._cast_delay
+    max_modifiers = max_magic._modifiers._modifiers
+    cast_delay_modifiers = cast_delay._modifiers._modifiers
+    spells = aura._spells
+    spell_count = len(spells._entries) - spells._tombstones
+    out += _PACK_AURA(
+        aura._wheel._now,
+        magic._value,
+        magic._min,
+        max_magic._base,
+        cast_delay._base,
+        aura.max_events_per_drain,
+        aura.coalesce_damage,
+        len(max_modifiers),
+        len(cast_delay_modifiers),
+        spell_count,
+    )
+    if max_modifiers:
+        _pack_modifiers(out, max_modifiers)
+    if cast_delay_modifiers:
+        _pack_modifiers(out, cast_delay_modifiers)
+    if spell_count:
+        _pack_spells(out, aura)
+
+
+def _pack_spells(out: bytearray, aura: Aura) -> None:
+    """Packs the active spells of an aura in order."""
+    spells = aura._spells
+    context = SnapshotContext(aura)
+    # Only auras holding a spell more than once need to find earlier copies
+    positions: dict[int, int] | None = {} if spells._duplicates else None
+    position = 0
+    for spell in spells._entries:
+        if spell is None:
+            continue
+        if positions is not None:
+            first = positions.get(id(spell))
+            if first is not None:
+                out += _SPELL.pack(_COPY, first)
+                position += 1
+                continue
+            positions[id(spell)] = position
+        position += 1
+        _pack_spell(out, spell, context)
+
+
+def _pack_spell(out: bytearray, spell: Spell, context: SnapshotContext) -> None:
+    codec = _CODECS_BY_TYPE.get(type(spell))
+    if codec is None:
+        raise ValueError(f"No snapshot codec registered for {type(spell).__name__}")
+    out += codec.packer(codec.code, spell._level, *codec.encode(spell, context))
+
+
+def _pack_modifiers(out: bytearray, modifiers: list[ValueModifier]) -> None:
+    for modifier in modifiers:
+        duration = modifier.duration
+        out += _MODIFIER.pack(modifier.multiplier, duration.length, duration.elapsed)
+
+
+def _unpack_aura(
+    view: memoryview,
+    offset: int,
+    caster: Caster | None,
+    record: struct.Struct = _AURA,
+) -> tuple[Aura, int]:
+    fields = record.unpack_from(view, offset)
+    offset += record.size
+    if record is _AURA_V1:
+        fields = (0.0, *fields)
+    (
+        now,
+        value,
+        min_magic,
+        max_magic,
+        cast_delay,
+        max_events_per_drain,
+        coalesce_damage,
+        max_count,
+        cast_delay_count,
+        spell_count,
+    ) = fields
+
+    aura = Aura(min_magic=min_magic, max_magic=max_magic, cast_delay=cast_delay)
+    aura.wheel.reset(now)
+    aura.max_events_per_drain = max_events_per_drain
+    aura.coalesce_damage = coalesce_damage
+    for modifiers, count in (
+        (aura.magic.max.modifiers, max_count),
+        (aura.cast_delay.modifiers, cast_delay_count),
+    ):
+        for _ in range(count):
+            modifiers.add(_restore_modifier(*_MODIFIER.unpack_from(view, offset)))
+            offset += _MODIFIER.size
+    aura.magic.value = value
+
+    offset = _unpack_spells(view, offset, spell_count, aura, caster)
+    return aura, offset
+
+
+def _unpack_spells(
+    view: memoryview, offset: int, count: int, aura: Aura, caster: Caster | None
+) -> int:
+    """Attaches the packed spells to an aura, returning the offset past them."""
+    context = SnapshotContext(aura, caster)
+    spells: list[Spell] = []
+    for _ in range(count):
+        code, level = _SPELL.unpack_from(view, offset)
+        offset += _SPELL.size
+        if code == _COPY:
+            spell = spells[level]
+        else:
+            spell, offset = _unpack_spell(view, offset, code, level, context)
+        spells.append(spell)
+        aura._attach_spell(spell)
+
+    return offset
+
+
+def _unpack_spell(
+    view: memoryview, offset: int, code: int, level: int, context: SnapshotContext
+) -> tuple[Spell, int]:
+    codec = _CODECS_BY_CODE.get(code)
+    if codec is None:
+        raise ValueError(f"Unknown spell code {code} in aura snapshot")
+    spell = codec.decode(codec.record.unpack_from(view, offset), context)
+    spell._level = level
+    return spell, offset + codec.record.size
+
+
+def _restore_modifier(
+    multiplier: float, length: float, elapsed: float
+) -> ValueModifier:
+    modifier = ValueModifier(multiplier, length)
+    modifier.duration.elapsed = elapsed
+    return modifier
+
+
+def _duration(duration: Duration) -> tuple[float, float]:
+    return duration.length, duration.elapsed
+
+
+def _restore_duration(duration: Duration, length: float, elapsed: float) -> None:
+    duration.length = length
+    duration.elapsed = elapsed
+
+
+def _restored(spell: Spell, **fields) -> Spell:
+    for name, value in fields.items():
+        setattr(spell, name, value)
+    return spell
+
+
+# Codecs of the built-in spells. The spells are created from their base values and
+# the level scaled fields and state are restored on top.
+
+
+def _encode_absorb(spell: AbsorbSpell, context: SnapshotContext) -> tuple:
+    return (*_duration(spell.duration), spell._absorb_count)
+
+
+def _decode_absorb(values: tuple, context: SnapshotContext) -> AbsorbSpell:
+    length, elapsed, absorb_count = values
+    spell = AbsorbSpell(length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(spell, _absorb_count=absorb_count)
+
+
+def _encode_ambient_regen(
+    spell: AmbientMagicRegenSpell, context: SnapshotContext
+) -> tuple:
+    return spell._base_amount_per_second, spell.amount_per_second
+
+
+def _decode_ambient_regen(
+    values: tuple, context: SnapshotContext
+) -> AmbientMagicRegenSpell:
+    base, amount_per_second = values
+    return _restored(AmbientMagicRegenSpell(base), amount_per_second=amount_per_second)
+
+
+def _encode_charge(spell: ChargeSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_healing_multiplier,
+        spell.healing_multiplier,
+    )
+
+
+def _decode_charge(values: tuple, context: SnapshotContext) -> ChargeSpell:
+    length, elapsed, base, healing_multiplier = values
+    spell = ChargeSpell(base, length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(spell, healing_multiplier=healing_multiplier)
+
+
+def _encode_earth_shield(spell: EarthShieldSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_reduction,
+        spell.reduction,
+        spell.hits.max,
+        spell.hits.count,
+    )
+
+
+def _decode_earth_shield(values: tuple, context: SnapshotContext) -> EarthShieldSpell:
+    length, elapsed, base, reduction, max_hits, hits = values
+    spell = EarthShieldSpell(base, max_hits, length)
+    _restore_duration(spell.duration, length, elapsed)
+    spell.hits.count = hits
+    return _restored(spell, reduction=reduction)
+
+
+def _encode_flash(spell: FlashSpell | ShadowSpell, context: SnapshotContext) -> tuple:
+    return spell._base_duration, *_duration(spell.duration)
+
+
+def _decoder_flash(spell_type: "type[FlashSpell | ShadowSpell]"):
+    def decode(values: tuple, context: SnapshotContext) -> Spell:
+        base, length, elapsed = values
+        spell = spell_type(base)
+        _restore_duration(spell.duration, length, elapsed)
+        return spell
+
+    return decode
+
+
+def _encode_freeze(spell: FreezeSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_cast_delay_modifier,
+        spell.cast_delay_modifier,
+        *context.pack_modifier(spell._modifier),
+    )
+
+
+def _decode_freeze(values: tuple, context: SnapshotContext) -> FreezeSpell:
+    length, elapsed, base, cast_delay_modifier = values[:4]
+    spell = FreezeSpell(length, base)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(
+        spell,
+        cast_delay_modifier=cast_delay_modifier,
+        _modifier=context.unpack_modifier(*values[4:]),
+    )
+
+
+def _encode_haste(spell: HasteSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_cast_delay_percentage,
+        spell.cast_delay_percentage,
+        *context.pack_modifier(spell._modifier),
+    )
+
+
+def _decode_haste(values: tuple, context: SnapshotContext) -> HasteSpell:
+    length, elapsed, base, cast_delay_percentage = values[:4]
+    spell = HasteSpell(length, base)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(
+        spell,
+        cast_delay_percentage=cast_delay_percentage,
+        _modifier=context.unpack_modifier(*values[4:]),
+    )
+
+
+def _encode_heal(spell: HealSpell, context: SnapshotContext) -> tuple:
+    return spell._base_healing, spell.healing
+
+
+def _decode_heal(values: tuple, context: SnapshotContext) -> HealSpell:
+    base, healing = values
+    return _restored(HealSpell(base), healing=healing)
+
+
+def _encode_ice_shield(spell: IceShieldSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_reduction,
+        spell.reduction,
+        spell.hits.max,
+        spell.hits.count,
+        spell._freeze_cast,
+        spell._freeze_spell.level,
+        *_encode_freeze(spell._freeze_spell, context),
+    )
+
+
+def _decode_ice_shield(values: tuple, context: SnapshotContext) -> IceShieldSpell:
+    length, elapsed, base, reduction, max_hits, hits, freeze_cast = values[:7]
+    freeze_level = values[7]
+    freeze_spell = _decode_freeze(values[8:], context)
+    freeze_spell._level = freeze_level
+    spell = IceShieldSpell(base, max_hits, length, freeze_spell, context.caster)
+    _restore_duration(spell.duration, length, elapsed)
+    spell.hits.count = hits
+    return _restored(spell, reduction=reduction, _freeze_cast=freeze_cast)
+
+
+def _encode_ignite(spell: IgniteSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_damage_per_second,
+        spell.damage_per_second,
+    )
+
+
+def _decode_ignite(values: tuple, context: SnapshotContext) -> IgniteSpell:
+    length, elapsed, base, damage_per_second = values
+    spell = IgniteSpell(base, length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(spell, damage_per_second=damage_per_second)
+
+
+def _encode_pause(spell: PauseSpell, context: SnapshotContext) -> tuple:
+    return (
+        spell._base_duration,
+        *_duration(spell.duration),
+        *context.pack_modifier(spell._modifier),
+    )
+
+
+def _decode_pause(values: tuple, context: SnapshotContext) -> PauseSpell:
+    base, length, elapsed = values[:3]
+    spell = PauseSpell(base)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(spell, _modifier=context.unpack_modifier(*values[3:]))
+
+
+def _encode_regen(spell: RegenSpell, context: SnapshotContext) -> tuple:
+    return (*_duration(spell.duration), spell._base_regen_rate, spell.regen_rate)
+
+
+def _decode_regen(values: tuple, context: SnapshotContext) -> RegenSpell:
+    length, elapsed, base, regen_rate = values
+    spell = RegenSpell(base, length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(spell, regen_rate=regen_rate)
+
+
+def _encode_damage(spell: RockSpell | SliceSpell, context: SnapshotContext) -> tuple:
+    return spell._base_damage, spell.damage
+
+
+def _decoder_damage(spell_type: "type[RockSpell | SliceSpell]"):
+    def decode(values: tuple, context: SnapshotContext) -> Spell:
+        base, damage = values
+        return _restored(spell_type(base), damage=damage)
+
+    return decode
+
+
+def _encode_shock(spell: ShockSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_heal_reduction_percentage,
+        spell.heal_reduction_percentage,
+    )
+
+
+def _decode_shock(values: tuple, context: SnapshotContext) -> ShockSpell:
+    length, elapsed, base, heal_reduction_percentage = values
+    spell = ShockSpell(base, length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(spell, heal_reduction_percentage=heal_reduction_percentage)
+
+
+def _encode_nothing(spell: Spell, context: SnapshotContext) -> tuple:
+    return ()
+
+
+def _decoder_nothing(spell_type: "type[Spell]"):
+    def decode(values: tuple, context: SnapshotContext) -> Spell:
+        return spell_type()
+
+    return decode
+
+
+def _encode_vulnerable(spell: VulnerableSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell._base_damage_multiplier,
+        spell.damage_multiplier,
+        spell.shield_spells_removed,
+    )
+
+
+def _decode_vulnerable(values: tuple, context: SnapshotContext) -> VulnerableSpell:
+    length, elapsed, base, damage_multiplier, shield_spells_removed = values
+    spell = VulnerableSpell(base, length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(
+        spell,
+        damage_multiplier=damage_multiplier,
+        shield_spells_removed=shield_spells_removed,
+    )
+
+
+def _encode_weaken(spell: WeakenSpell, context: SnapshotContext) -> tuple:
+    return (*_duration(spell.duration), spell._base_reduction, spell.reduction)
+
+
+def _decode_weaken(values: tuple, context: SnapshotContext) -> WeakenSpell:
+    length, elapsed, base, reduction = values
+    spell = WeakenSpell(base, length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(spell, reduction=reduction)
+
+
+def _encode_weight(spell: WeightSpell, context: SnapshotContext) -> tuple:
+    return (
+        *_duration(spell.duration),
+        spell.acceleration_threshold,
+        spell._base_damage_per_second,
+        spell.damage_per_second,
+        spell.movement_detected,
+    )
+
+
+def _decode_weight(values: tuple, context: SnapshotContext) -> WeightSpell:
+    length, elapsed, threshold, base, damage_per_second, movement_detected = values
+    spell = WeightSpell(threshold, base, length)
+    _restore_duration(spell.duration, length, elapsed)
+    return _restored(
+        spell,
+        damage_per_second=damage_per_second,
+        movement_detected=movement_detected,
+    )
+
+
+_FREEZE_FORMAT = "dddd" + MODIFIER_FORMAT
+
+for _codec in (
+    SpellCodec(AbsorbSpell, 1, "ddi", _encode_absorb, _decode_absorb),
+    SpellCodec(
+        AmbientMagicRegenSpell, 2, "dd", _encode_ambient_regen, _decode_ambient_regen
+    ),
+    SpellCodec(ChargeSpell, 3, "dddd", _encode_charge, _decode_charge),
+    SpellCodec(
+        EarthShieldSpell, 4, "ddddii", _encode_earth_shield, _decode_earth_shield
+    ),
+    SpellCodec(FlashSpell, 5, "ddd", _encode_flash, _decoder_flash(FlashSpell)),
+    SpellCodec(FreezeSpell, 6, _FREEZE_FORMAT, _encode_freeze, _decode_freeze),
+    SpellCodec(HasteSpell, 7, "dddd" + MODIFIER_FORMAT, _encode_haste, _decode_haste),
+    SpellCodec(HealSpell, 8, "dd", _encode_heal, _decode_heal),
+    SpellCodec(
+        IceShieldSpell,
+        9,
+        "ddddii?i" + _FREEZE_FORMAT,
+        _encode_ice_shield,
+        _decode_ice_shield,
+    ),
+    SpellCodec(IgniteSpell, 10, "dddd", _encode_ignite, _decode_ignite),
+    SpellCodec(PauseSpell, 11, "ddd" + MODIFIER_FORMAT, _encode_pause, _decode_pause),
+    SpellCodec(RegenSpell, 12, "dddd", _encode_regen, _decode_regen),
+    SpellCodec(RockSpell, 13, "dd", _encode_damage, _decoder_damage(RockSpell)),
+    SpellCodec(ShadowSpell, 14, "ddd", _encode_flash, _decoder_flash(ShadowSpell)),
+    SpellCodec(ShockSpell, 15, "dddd", _encode_shock, _decode_shock),
+    SpellCodec(SliceSpell, 16, "dd", _encode_damage, _decoder_damage(SliceSpell)),
+    SpellCodec(UnpauseSpell, 17, "", _encode_nothing, _decoder_nothing(UnpauseSpell)),
+    SpellCodec(VulnerableSpell, 18, "dddd?", _encode_vulnerable, _decode_vulnerable),
+    SpellCodec(WarmthSpell, 19, "", _encode_nothing, _decoder_nothing(WarmthSpell)),
+    SpellCodec(WeakenSpell, 20, "dddd", _encode_weaken, _decode_weaken),
+    SpellCodec(WeightSpell, 21, "ddddd?", _encode_weight, _decode_weight),
+):
+    register_spell_codec(_codec)
+del _codec
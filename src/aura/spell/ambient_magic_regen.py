@@ -1,3 +1,4 @@
+import math
 from aura.aura import Aura, HealEvent, Spell, SpellTags
 
 
@@ -6,6 +7,8 @@ class AmbientMagicRegenSpell(Spell):
     
     Level scaling: Increases the regeneration amount per second.
     """
+
+    __slots__ = ("_base_amount_per_second", "amount_per_second")
     
     def __init__(self, amount_per_second: float) -> None:
         super().__init__([SpellTags.BUFF])
@@ -14,10 +17,16 @@ class AmbientMagicRegenSpell(Spell):
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
         heal_amount = self.amount_per_second * elapsed_time
-        aura.process_event(HealEvent(heal_amount))
+        aura.process_event(aura.acquire_event(HealEvent, heal_amount))
 
         return False  # Don't remove this spell
 
+    def linear_effect(self, aura: Aura) -> tuple[type, float, float]:
+        return HealEvent, self.amount_per_second, math.inf
+
+    def fast_forward(self, aura: Aura, elapsed_time: float) -> bool:
+        return False
+
     def _update_level(self, level: int) -> None:
         self.amount_per_second = Spell.LEVEL_SCALER.scale_value(
             self._base_amount_per_second, level
@@ -2,9 +2,31 @@
 
 This module provides the framework for creating spell combinations that can detect
 specific sets of spells on an Aura and replace them with combined spells.
+
+Combinations declare the spell classes and tags they depend on in INGREDIENTS. The
+manager only checks a combination when a spell matching one of its ingredients is
+added, and keeps a count of the active spells matching each ingredient per aura, so
+checks can test counts without querying the aura's spells.
 """
 
-from aura.aura import AddSpellEvent, Aura, AuraEvent, EventListener
+import weakref
+
+from aura.aura import (
+    AddSpellEvent,
+    Aura,
+    AuraEvent,
+    EventListener,
+    RemoveSpellEvent,
+    Spell,
+    Spells,
+)
+
+try:
+    from typing import Union
+
+    Ingredient = Union[type[Spell], str]
+except ImportError:
+    pass
 
 
 class SpellCombination:
@@ -15,17 +37,38 @@ class SpellCombination:
     their specific combination logic.
     """
 
-    def check(self, aura: Aura) -> bool:
+    __slots__ = ()
+
+    INGREDIENTS: "tuple[Ingredient, ...] | None" = None
+    """The spell classes (including subclasses) and tags the combination depends on.
+    When not set, the combination is checked whenever any spell is added."""
+
+    CHECK_ON_REMOVE: bool = False
+    """Also check the combination when a spell matching an ingredient is removed."""
+
+    def check(self, aura: Aura, counts: "dict[Ingredient, int] | None" = None) -> bool:
         """Check if the spell combination exists on the aura and apply it if found.
 
         Args:
             aura: The Aura instance to check for spell combinations.
+            counts: The number of active spells of the aura matching each ingredient,
+                passed by SpellCombinations to combinations with INGREDIENTS. None
+                when the combination is checked directly.
 
         Returns:
             True if the combination was found and applied, False otherwise.
         """
         raise NotImplementedError("This method should be implemented by subclasses.")
 
+    def restore(self, aura: Aura) -> None:
+        """Picks up the state the combination left on an aura restored from a
+        snapshot, such as a modifier it refreshes when triggered again.
+
+        Args:
+            aura: The restored Aura instance.
+        """
+        pass
+
 
 class SpellCombinations(EventListener):
     """Manager for spell combinations that listens to spell events.
@@ -34,20 +77,226 @@ class SpellCombinations(EventListener):
     checks them whenever a spell is added to the Aura.
     """
 
+    __slots__ = (
+        "_combinations",
+        "_ingredients",
+        "_by_tag",
+        "_affected",
+        "_counts",
+    )
+
     def __init__(self):
         """Initialize a new SpellCombinations manager with an empty combination list."""
         self._combinations: list[SpellCombination] = []
+        # The ingredients of all combinations, in the order they were first declared
+        self._ingredients: "list[Ingredient]" = []
+        # Whether any ingredient is a tag, which makes the tags of spells matter
+        self._by_tag: bool = False
+        # The ingredients matched by, and the combinations checked for, each spell
+        # class and set of tags. Cleared when the combinations change.
+        self._affected: "dict[object, tuple]" = {}
+        # The ingredient counts of each aura the manager received an event from, by
+        # id with a weak reference to the aura, dropped once the aura is collected
+        self._counts: "dict[int, tuple[weakref.ref, dict[Ingredient, int]]]" = {}
 
     def on_spell_event(self, aura: "Aura", event: AuraEvent) -> None:
         """Check for combinations when spells are added.
 
+        Only the combinations with an ingredient matching the added spell, or without
+        INGREDIENTS, are checked. Removing a spell updates the ingredient counts and
+        checks the matching combinations that set CHECK_ON_REMOVE.
+
         Args:
             aura: The Aura instance where the event occurred.
             event: The event that was triggered.
         """
-        if isinstance(event, AddSpellEvent):
-            for combo in self._combinations:
-                combo.check(aura)
+        added = isinstance(event, AddSpellEvent)
+        if not added and not isinstance(event, RemoveSpellEvent):
+            return
+
+        spell = event.spell
+        ingredients, on_add, on_remove = self._affected_by(spell)
+        entry = self._counts.get(id(aura))
+        if entry is None or entry[0]() is not aura:
+            # Counted from the spells, which the event was already applied to
+            counts = self.reset(aura)
+        else:
+            counts = entry[1]
+            if ingredients:
+                # Copies of a spell already active are not counted again
+                copies = aura.spells._copies(spell)
+                if added and copies == 1:
+                    for ingredient in ingredients:
+                        counts[ingredient] += 1
+                elif not added and copies == 0:
+                    for ingredient in ingredients:
+                        counts[ingredient] -= 1
+
+        self._check(aura, on_add if added else on_remove, counts)
+
+    def on_spell_events(self, aura: "Aura", events: list[AuraEvent]) -> None:
+        """Check for combinations once after a batch of spells was added or removed.
+
+        The counts of the ingredients matched by the spells are taken again from the
+        aura, and each affected combination is checked once.
+
+        Args:
+            aura: The Aura instance where the events occurred.
+            events: The events of the batch that were not canceled.
+        """
+        ingredients: "set[Ingredient]" = set()
+        selected: set[int] = set()
+        for event in events:
+            added = isinstance(event, AddSpellEvent)
+            if not added and not isinstance(event, RemoveSpellEvent):
+                continue
+            matched, on_add, on_remove = self._affected_by(event.spell)
+            ingredients.update(matched)
+            for combo in on_add if added else on_remove:
+                selected.add(id(combo))
+        if not selected and not ingredients:
+            return
+
+        entry = self._counts.get(id(aura))
+        if entry is None or entry[0]() is not aura:
+            counts = self.reset(aura)
+        else:
+            counts = entry[1]
+            for ingredient in ingredients:
+                counts[ingredient] = SpellCombinations._count_of(
+                    aura.spells, ingredient
+                )
+
+        self._check(
+            aura,
+            [combo for combo in self._combinations if id(combo) in selected],
+            counts,
+        )
+
+    def _check(
+        self,
+        aura: "Aura",
+        combinations: list[SpellCombination],
+        counts: "dict[Ingredient, int]",
+    ) -> None:
+        metrics = aura.metrics
+        for combo in combinations:
+            if combo.INGREDIENTS is None:
+                triggered = combo.check(aura)
+            else:
+                triggered = combo.check(aura, counts)
+            if triggered and metrics is not None:
+                combo_type = type(combo)
+                metrics.combinations[combo_type] = (
+                    metrics.combinations.get(combo_type, 0) + 1
+                )
+
+    def _affected_by(
+        self, spell: Spell
+    ) -> tuple[list["Ingredient"], list[SpellCombination], list[SpellCombination]]:
+        """Returns the ingredients a spell matches and the combinations to check when
+        it is added and when it is removed, in the order they were registered."""
+        key = (type(spell), tuple(spell._tags)) if self._by_tag else type(spell)
+        affected = self._affected.get(key)
+        if affected is not None:
+            return affected
+
+        ingredients = [
+            ingredient
+            for ingredient in self._ingredients
+            if SpellCombinations._matches(spell, ingredient)
+        ]
+        on_add = []
+        on_remove = []
+        for combo in self._combinations:
+            if combo.INGREDIENTS is None:
+                on_add.append(combo)
+            elif any(ingredient in ingredients for ingredient in combo.INGREDIENTS):
+                on_add.append(combo)
+                if combo.CHECK_ON_REMOVE:
+                    on_remove.append(combo)
+        affected = self._affected[key] = (ingredients, on_add, on_remove)
+        return affected
+
+    @staticmethod
+    def _matches(spell: Spell, ingredient: "Ingredient") -> bool:
+        if isinstance(ingredient, str):
+            return ingredient in spell._tags
+        return isinstance(spell, ingredient)
+
+    @staticmethod
+    def _count_of(spells: Spells, ingredient: "Ingredient") -> int:
+        if isinstance(ingredient, str):
+            return spells.count_by_tag(ingredient)
+        return spells.count_by_class(ingredient)
+
+    def count(self, aura: Aura, ingredient: "Ingredient") -> int:
+        """Returns the number of active spells of an aura matching an ingredient.
+
+        Args:
+            aura: The aura whose spells are counted.
+            ingredient: A spell class or tag declared by a registered combination.
+
+        Raises:
+            ValueError: If no registered combination declares the ingredient.
+        """
+        if ingredient not in self._ingredients:
+            raise ValueError(f"{ingredient!r} is not an ingredient of a combination")
+        entry = self._counts.get(id(aura))
+        if entry is None or entry[0]() is not aura:
+            return self.reset(aura)[ingredient]
+        return entry[1][ingredient]
+
+    def reset(self, aura: Aura) -> "dict[Ingredient, int]":
+        """Recounts the ingredients of an aura from its active spells.
+
+        Counts follow the spell events the manager receives. Reset them after the
+        spells of an aura changed while the manager was not one of its listeners.
+
+        Args:
+            aura: The aura to recount.
+
+        Returns:
+            The number of active spells matching each ingredient.
+        """
+        spells = aura.spells
+        counts = {
+            ingredient: SpellCombinations._count_of(spells, ingredient)
+            for ingredient in self._ingredients
+        }
+        key = id(aura)
+        counts_by_aura = self._counts
+        self._counts[key] = (
+            weakref.ref(aura, lambda ref: counts_by_aura.pop(key, None)),
+            counts,
+        )
+        return counts
+
+    def _index(self) -> None:
+        """Collects the ingredients of the combinations and drops the cached
+        dispatch and counts."""
+        self._ingredients = []
+        for combo in self._combinations:
+            for ingredient in combo.INGREDIENTS or ():
+                if ingredient not in self._ingredients:
+                    self._ingredients.append(ingredient)
+        self._by_tag = any(
+            isinstance(ingredient, str) for ingredient in self._ingredients
+        )
+        self._affected.clear()
+        self._counts.clear()
+
+    def restore(self, aura: Aura) -> None:
+        """Picks up the state the combinations left on an aura restored from a
+        snapshot and counts its ingredients. Called by unpack_auras for the auras
+        it restores with the manager.
+
+        Args:
+            aura: The restored Aura instance.
+        """
+        for combo in self._combinations:
+            combo.restore(aura)
+        self.reset(aura)
 
     def add(self, combination: SpellCombination) -> None:
         """Add a spell combination to the manager.
@@ -56,6 +305,7 @@ class SpellCombinations(EventListener):
             combination: The SpellCombination instance to register.
         """
         self._combinations.append(combination)
+        self._index()
 
     def remove(self, combination: SpellCombination) -> None:
         """Remove a spell combination from the manager.
@@ -65,6 +315,7 @@ class SpellCombinations(EventListener):
         """
         if combination in self._combinations:
             self._combinations.remove(combination)
+            self._index()
 
     def __len__(self) -> int:
         """Return the number of registered spell combinations.
@@ -12,7 +12,13 @@ class CombustCombination(SpellCombination):
     - Duration: Maximum duration among all Ignite spells
     """
 
-    def check(self, aura: Aura) -> bool:
+    __slots__ = ()
+
+    INGREDIENTS = (IgniteSpell,)
+
+    def check(self, aura: Aura, counts: "dict | None" = None) -> bool:
+        if counts is not None and counts[IgniteSpell] < 2:
+            return False
         ignite_spells = aura.spells.get_by_class(IgniteSpell)
         if len(ignite_spells) >= 2:
             total_damage_per_second: float = 0.0
@@ -20,7 +26,7 @@ class CombustCombination(SpellCombination):
             for ignite in ignite_spells:
                 total_damage_per_second += ignite.damage_per_second
                 max_duration = max(max_duration, ignite.duration.length)
-                aura.remove_spell(ignite)
+            aura.remove_spells(ignite_spells)
 
             combined_ignite = IgniteSpell(
                 damage_per_second=total_damage_per_second, duration=max_duration
@@ -1,3 +1,5 @@
+import weakref
+
 from aura.aura import Aura
 from aura.spell.combo.combo import SpellCombination
 from aura.spell.elemental.regen import RegenSpell
@@ -10,16 +12,40 @@ class InvigorateCombination(SpellCombination):
     duration after the Regen spell count drops below three.
     """
 
+    __slots__ = ("_max_magic_multiplier", "_duration", "_max_magic_modifiers")
+
+    INGREDIENTS = (RegenSpell,)
+
     def __init__(self, max_magic_multiplier: float, duration: float) -> None:
         super().__init__()
         self._max_magic_multiplier = max_magic_multiplier
-        self._max_magic_modifier = ValueModifier(max_magic_multiplier, duration)
+        self._duration = duration
+        # One modifier per aura, as each binds to the timing wheel of its aura
+        self._max_magic_modifiers = weakref.WeakKeyDictionary()
 
-    def check(self, aura: Aura) -> bool:
-        regen_spells = aura.spells.get_by_class(RegenSpell)
-        if len(regen_spells) >= 3:
-            self._max_magic_modifier.duration.reset()
-            if aura.magic.max.modifiers.add(self._max_magic_modifier):
+    def check(self, aura: Aura, counts: "dict | None" = None) -> bool:
+        if counts is None:
+            regen_count = aura.spells.count_by_class(RegenSpell)
+        else:
+            regen_count = counts[RegenSpell]
+        if regen_count >= 3:
+            modifier = self._max_magic_modifiers.get(aura)
+            if modifier is None:
+                modifier = ValueModifier(self._max_magic_multiplier, self._duration)
+                self._max_magic_modifiers[aura] = modifier
+            modifier.duration.reset()
+            if aura.magic.max.modifiers.add(modifier):
                 return True
 
         return False
+
+    def restore(self, aura: Aura) -> None:
+        # The restored modifier matching this combination's, refreshed on the next
+        # trigger instead of stacking another one
+        for modifier in aura.magic.max.modifiers:
+            if (
+                modifier.multiplier == self._max_magic_multiplier
+                and modifier.duration.length == self._duration
+            ):
+                self._max_magic_modifiers[aura] = modifier
+                return
@@ -0,0 +1,391 @@
+"""Declarative spell combination recipes matched incrementally.
+
+A Recipe lists the conditions an aura's active spells must meet, each a Count of
+the spells matching a spell class or tag (elements are tags), optionally only the
+spells of a minimum level or the ones added within the last seconds, and the action
+applied when all of them hold.
+
+A PatternNetwork compiles recipes into a matcher network in the style of Rete.
+Conditions that test the same spells share a memory of the matching spells per
+aura, and each recipe keeps how many of its conditions hold. Adding or removing a
+spell only visits the memories of the conditions the spell matches and the recipes
+using them, so detecting a completed recipe costs in proportion to the change, not
+to the number of recipes and spells.
+
+    combust = Recipe(
+        "Combust",
+        [Count(IgniteSpell, at_least=2)],
+        lambda aura, matched: merge_ignites(aura, matched[0]),
+    )
+    network = PatternNetwork([combust])
+    aura.event_listeners.append(network)
+"""
+
+import weakref
+
+from aura.aura import (
+    AddSpellEvent,
+    Aura,
+    AuraEvent,
+    EventListener,
+    RemoveSpellEvent,
+    Spell,
+)
+from aura.spell.combo.combo import SpellCombinations
+
+try:
+    from typing import Callable, Iterable
+
+    from aura.spell.combo.combo import Ingredient
+except ImportError:
+    pass
+
+
+class Count:
+    """A condition on the number of active spells matching an ingredient."""
+
+    __slots__ = ("ingredient", "at_least", "at_most", "min_level", "within")
+
+    def __init__(
+        self,
+        ingredient: "Ingredient",
+        at_least: int = 1,
+        at_most: int | None = None,
+        min_level: int = 1,
+        within: float | None = None,
+    ) -> None:
+        """Initializes the condition.
+
+        Args:
+            ingredient: A spell class, matching its subclasses too, or a tag.
+            at_least: The fewest matching spells.
+            at_most: The most matching spells, or None for no limit.
+            min_level: Only counts the spells of at least this level. Levels are read
+                when the spells are added.
+            within: Only counts the spells added within this many seconds of the
+                aura's clock, or None to count spells however long ago they were
+                added.
+
+        Raises:
+            ValueError: If the bounds can never hold or within is not positive.
+        """
+        if at_least < 0 or (at_most is not None and at_most < at_least):
+            raise ValueError("The count bounds can never hold")
+        if within is not None and within <= 0:
+            raise ValueError("within must be positive")
+        self.ingredient: "Ingredient" = ingredient
+        self.at_least: int = at_least
+        self.at_most: int | None = at_most
+        self.min_level: int = min_level
+        self.within: float | None = within
+
+    def holds(self, count: int) -> bool:
+        """Returns True if a number of matching spells meets the condition."""
+        return count >= self.at_least and (
+            self.at_most is None or count <= self.at_most
+        )
+
+
+class Recipe:
+    """A named set of conditions and the action applied when they all hold."""
+
+    __slots__ = ("name", "conditions", "action", "check_on_remove")
+
+    def __init__(
+        self,
+        name: str,
+        conditions: "Iterable[Count]",
+        action: "Callable[[Aura, list[list[Spell]]], bool]",
+        check_on_remove: bool = False,
+    ) -> None:
+        """Initializes the recipe.
+
+        Args:
+            name: The name of the recipe.
+            conditions: The conditions that must all hold.
+            action: Applies the recipe to an aura, given the spells counted by each
+                condition in the order they were added. Returns True if it applied.
+            check_on_remove: Also apply the recipe when removing a spell completes
+                it, such as for conditions with at_most.
+
+        Raises:
+            ValueError: If there are no conditions.
+        """
+        self.name: str = name
+        self.conditions: tuple[Count, ...] = tuple(conditions)
+        if not self.conditions:
+            raise ValueError("A recipe needs at least one condition")
+        self.action = action
+        self.check_on_remove: bool = check_on_remove
+
+
+class _Memory:
+    """The spells matching a set of equivalent conditions, shared by recipes."""
+
+    __slots__ = ("ingredient", "min_level", "within", "users")
+
+    def __init__(self, condition: Count) -> None:
+        self.ingredient: "Ingredient" = condition.ingredient
+        self.min_level: int = condition.min_level
+        self.within: float | None = condition.within
+        # The recipe index and condition of each condition using the memory
+        self.users: list[tuple[int, Count]] = []
+
+
+class _AuraState:
+    """The matching spells of each memory and the conditions holding for each recipe
+    on one aura."""
+
+    __slots__ = ("spells", "holding")
+
+    def __init__(self, memory_count: int, holding: list[int]) -> None:
+        # Maps id(spell) to the spell and the time it was added, oldest first
+        self.spells: list[dict[int, tuple[Spell, float]]] = [
+            {} for _ in range(memory_count)
+        ]
+        self.holding: list[int] = holding
+
+
+class PatternNetwork(EventListener):
+    """Matches recipes incrementally against the spells added to and removed from
+    the auras it listens to."""
+
+    def __init__(self, recipes: "Iterable[Recipe]" = ()) -> None:
+        self._recipes: list[Recipe] = []
+        self._memories: list[_Memory] = []
+        # Index of the memory of each distinct ingredient, level and window
+        self._memory_keys: dict[tuple, int] = {}
+        # The memory of each condition of each recipe
+        self._recipe_memories: list[tuple[int, ...]] = []
+        # The memories whose ingredient a spell class and set of tags matches, and
+        # the recipes using them in the order they were added
+        self._affected: dict[
+            tuple[type, tuple[str, ...]], tuple[list[int], list[int]]
+        ] = {}
+        # The state of each aura the network received an event from, by id with a
+        # weak reference to the aura, dropped once the aura is collected
+        self._states: "dict[int, tuple[weakref.ref, _AuraState]]" = {}
+        for recipe in recipes:
+            self.add(recipe)
+
+    def add(self, recipe: Recipe) -> None:
+        """Compiles a recipe into the network. States of auras are rebuilt from their
+        spells on their next event, with the spells they had treated as added at the
+        aura's clock time of the rebuild.
+
+        Args:
+            recipe: The recipe to add.
+        """
+        index = len(self._recipes)
+        self._recipes.append(recipe)
+        memory_indices = []
+        for condition in recipe.conditions:
+            key = (condition.ingredient, condition.min_level, condition.within)
+            memory_index = self._memory_keys.get(key)
+            if memory_index is None:
+                memory_index = self._memory_keys[key] = len(self._memories)
+                self._memories.append(_Memory(condition))
+            self._memories[memory_index].users.append((index, condition))
+            memory_indices.append(memory_index)
+        self._recipe_memories.append(tuple(memory_indices))
+        self._affected.clear()
+        self._states.clear()
+
+    @property
+    def recipes(self) -> list[Recipe]:
+        """Returns the recipes of the network, in the order they were added."""
+        return list(self._recipes)
+
+    def on_spell_event(self, aura: Aura, event: AuraEvent) -> None:
+        """Updates the matches of the recipes using the added or removed spell and
+        applies the ones it completes.
+
+        Args:
+            aura: The aura where the event occurred.
+            event: The event that was triggered.
+        """
+        added = isinstance(event, AddSpellEvent)
+        if not added and not isinstance(event, RemoveSpellEvent):
+            return
+
+        state = self._state(aura)
+        if state is None:
+            # Built from the spells, which the event was already applied to
+            state = self._build(aura)
+            touched = self._affected_by(event.spell)[1]
+        else:
+            touched = self._update(aura, state, event)
+        if not added:
+            touched = [
+                index for index in touched if self._recipes[index].check_on_remove
+            ]
+        for index in touched:
+            self._fire(aura, state, index)
+
+    def on_spell_events(self, aura: Aura, events: list[AuraEvent]) -> None:
+        """Updates the matches of the recipes using the spells added or removed by a
+        batch, then applies each recipe the batch completes once.
+
+        Args:
+            aura: The aura where the events occurred.
+            events: The events of the batch that were not canceled.
+        """
+        state = self._state(aura)
+        if state is None:
+            # Built from the spells, updating it with the batch changes nothing
+            state = self._build(aura)
+        touched: set[int] = set()
+        for event in events:
+            added = isinstance(event, AddSpellEvent)
+            if not added and not isinstance(event, RemoveSpellEvent):
+                continue
+            users = self._update(aura, state, event)
+            for index in users:
+                if added or self._recipes[index].check_on_remove:
+                    touched.add(index)
+        for index in sorted(touched):
+            self._fire(aura, state, index)
+
+    def _update(
+        self, aura: Aura, state: _AuraState, event: "AddSpellEvent | RemoveSpellEvent"
+    ) -> list[int]:
+        """Applies an applied spell event to the memories and returns the recipes
+        using the memories the spell matches."""
+        spell = event.spell
+        if isinstance(event, AddSpellEvent):
+            return self._insert(state, spell, aura.wheel.now)
+        if aura.spells._copies(spell):
+            # Other copies of the spell remain
+            return self._affected_by(spell)[1]
+        return self._delete(state, spell)
+
+    def _state(self, aura: Aura) -> "_AuraState | None":
+        entry = self._states.get(id(aura))
+        if entry is None or entry[0]() is not aura:
+            return None
+        return entry[1]
+
+    def _build(self, aura: Aura) -> _AuraState:
+        """Builds the state of an aura from its active spells."""
+        holding = [
+            sum(1 for condition in recipe.conditions if condition.holds(0))
+            for recipe in self._recipes
+        ]
+        state = _AuraState(len(self._memories), holding)
+        key = id(aura)
+        states = self._states
+        states[key] = (weakref.ref(aura, lambda ref: states.pop(key, None)), state)
+        now = aura.wheel.now
+        seen: set[int] = set()
+        for spell in aura.spells:
+            if id(spell) not in seen:
+                seen.add(id(spell))
+                self._insert(state, spell, now)
+        return state
+
+    def _affected_by(self, spell: Spell) -> tuple[list[int], list[int]]:
+        """Returns the memories whose ingredient the spell matches and the recipes
+        using them, in the order they were added."""
+        key = (type(spell), tuple(spell._tags))
+        affected = self._affected.get(key)
+        if affected is None:
+            matching = [
+                index
+                for index, memory in enumerate(self._memories)
+                if SpellCombinations._matches(spell, memory.ingredient)
+            ]
+            users = {
+                recipe_index
+                for index in matching
+                for recipe_index, _ in self._memories[index].users
+            }
+            affected = self._affected[key] = (matching, sorted(users))
+        return affected
+
+    def _insert(self, state: _AuraState, spell: Spell, now: float) -> list[int]:
+        """Adds a spell to the memories it matches and returns the recipes using
+        them."""
+        matching, users = self._affected_by(spell)
+        level = spell.level
+        for memory_index in matching:
+            memory = self._memories[memory_index]
+            if level < memory.min_level:
+                continue
+            spells = state.spells[memory_index]
+            if id(spell) in spells:
+                # Another copy of the spell, which keeps the time of the first
+                continue
+            if memory.within is not None:
+                # Recounts the spells leaving the window on its own
+                self._expire(state, memory_index, now)
+            before = len(spells)
+            spells[id(spell)] = (spell, now)
+            self._recount(state, memory, before, before + 1)
+        return users
+
+    def _delete(self, state: _AuraState, spell: Spell) -> list[int]:
+        """Removes a spell from the memories it is in and returns the recipes using
+        the memories it matches."""
+        matching, users = self._affected_by(spell)
+        for memory_index in matching:
+            spells = state.spells[memory_index]
+            if spells.pop(id(spell), None) is not None:
+                count = len(spells)
+                self._recount(state, self._memories[memory_index], count + 1, count)
+        return users
+
+    def _expire(self, state: _AuraState, memory_index: int, now: float) -> None:
+        """Drops the spells added before the window of a memory."""
+        memory = self._memories[memory_index]
+        spells = state.spells[memory_index]
+        before = len(spells)
+        oldest = now - memory.within
+        while spells:
+            key = next(iter(spells))
+            if spells[key][1] >= oldest:
+                break
+            del spells[key]
+        self._recount(state, memory, before, len(spells))
+
+    def _recount(
+        self, state: _AuraState, memory: _Memory, before: int, after: int
+    ) -> None:
+        if before == after:
+            return
+        for recipe_index, condition in memory.users:
+            state.holding[recipe_index] += condition.holds(after) - condition.holds(
+                before
+            )
+
+    def _fire(self, aura: Aura, state: _AuraState, index: int) -> None:
+        recipe = self._recipes[index]
+        if state.holding[index] != len(recipe.conditions):
+            return
+        memory_indices = self._recipe_memories[index]
+        now = aura.wheel.now
+        for memory_index in memory_indices:
+            if self._memories[memory_index].within is not None:
+                # Windows only move on when spells are added, catch up before firing
+                self._expire(state, memory_index, now)
+        if state.holding[index] != len(recipe.conditions):
+            return
+
+        matched = [
+            [spell for spell, _ in state.spells[memory_index].values()]
+            for memory_index in memory_indices
+        ]
+        recipe.action(aura, matched)
+
+    def progress(self, aura: Aura, recipe: Recipe) -> tuple[int, int]:
+        """Returns the number of conditions of a recipe holding on an aura, as of
+        the last spell added to or removed from it, and the number of conditions.
+
+        Raises:
+            ValueError: If the recipe is not part of the network.
+        """
+        if recipe not in self._recipes:
+            raise ValueError(f"Recipe {recipe.name!r} is not part of the network")
+        state = self._state(aura)
+        if state is None:
+            state = self._build(aura)
+        return state.holding[self._recipes.index(recipe)], len(recipe.conditions)
@@ -10,6 +10,10 @@ class AbsorbSpell(Spell):
     Level scaling: Increases the number of debuff spells that can be absorbed.
     """
 
+    __slots__ = ("duration", "_absorb_count")
+
+    HANDLED_EVENTS = (AddSpellEvent,)
+
     def __init__(self, duration: float) -> None:
         super().__init__([SpellTags.BUFF, ElementTags.GRAVITY])
         self.duration = Duration(duration)
@@ -21,6 +25,14 @@ class AbsorbSpell(Spell):
 
         return self.duration.update(elapsed_time)
 
+    def linear_effect(self, aura: Aura) -> tuple[None, float, float] | None:
+        if self._absorb_count <= 0:
+            return None
+        return None, 0.0, self.duration.remaining
+
+    def fast_forward(self, aura: Aura, elapsed_time: float) -> bool:
+        return self.duration.update(elapsed_time)
+
     def _update_level(self, level: int) -> None:
         self._absorb_count = round(Spell.LEVEL_SCALER.scale_value(1, level))
 
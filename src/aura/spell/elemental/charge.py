@@ -9,11 +9,28 @@ class ChargeSpell(Spell):
     Level scaling: Increases the healing multiplier.
     """
 
+    __slots__ = ("duration", "_base_healing_multiplier", "_healing_multiplier")
+
+    PURE_MULTIPLIER = True
+
+    HANDLED_EVENTS = (HealEvent,)
+
+    TIMED = True
+
     def __init__(self, healing_multiplier: float, duration: float) -> None:
         super().__init__([SpellTags.BUFF, ElementTags.LIGHTNING])
         self.duration = Duration(duration)
         self._base_healing_multiplier = healing_multiplier
-        self.healing_multiplier = healing_multiplier
+        self._healing_multiplier = healing_multiplier
+
+    @property
+    def healing_multiplier(self) -> float:
+        return self._healing_multiplier
+
+    @healing_multiplier.setter
+    def healing_multiplier(self, value: float) -> None:
+        self._healing_multiplier = value
+        self.multiplier_changed()
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
         return self.duration.update(elapsed_time)
@@ -22,6 +39,9 @@ class ChargeSpell(Spell):
         if isinstance(event, HealEvent):
             event.amount *= self.healing_multiplier
 
+    def event_multiplier(self, event_type: type) -> float:
+        return self.healing_multiplier
+
     def _update_level(self, level: int) -> None:
         self.healing_multiplier = Spell.LEVEL_SCALER.scale_value(
             self._base_healing_multiplier, level
@@ -9,6 +9,10 @@ class EarthShieldSpell(Spell):
     Level scaling: Increases the damage reduction percentage up to 100%.
     """
 
+    __slots__ = ("duration", "_base_reduction", "reduction", "hits")
+
+    HANDLED_EVENTS = (DamageEvent,)
+
     def __init__(self, reduction: float, max_hits: int, duration: float) -> None:
         super().__init__([SpellTags.BUFF, SpellTags.SHIELD, ElementTags.EARTH])
         self.duration = Duration(duration)
@@ -22,6 +26,14 @@ class EarthShieldSpell(Spell):
 
         return self.hits.is_max
 
+    def linear_effect(self, aura: Aura) -> tuple[None, float, float] | None:
+        if self.hits.is_max:
+            return None
+        return None, 0.0, self.duration.remaining
+
+    def fast_forward(self, aura: Aura, elapsed_time: float) -> bool:
+        return self.duration.update(elapsed_time)
+
     def modify_event(self, aura: Aura, event: AuraEvent) -> None:
         if self.duration.is_expired or self.hits.is_max:
             return
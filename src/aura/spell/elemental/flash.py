@@ -10,6 +10,10 @@ class FlashSpell(Spell):
     Level scaling: Increases the duration.
     """
 
+    __slots__ = ("_base_duration", "duration")
+
+    TIMED = True
+
     def __init__(self, duration: float) -> None:
         super().__init__([SpellTags.DEBUFF, ElementTags.LIGHT])
         self._base_duration = duration
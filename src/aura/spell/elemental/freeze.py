@@ -9,6 +9,15 @@ class FreezeSpell(Spell):
     Level scaling: Increases the cast delay multiplier.
     """
 
+    __slots__ = (
+        "duration",
+        "_base_cast_delay_modifier",
+        "cast_delay_modifier",
+        "_modifier",
+    )
+
+    TIMED = True
+
     def __init__(self, duration: float, cast_delay_modifier: float) -> None:
         super().__init__([SpellTags.DEBUFF, ElementTags.ICE])
         self.duration = Duration(duration)
@@ -9,6 +9,15 @@ class HasteSpell(Spell):
     Level scaling: Decreases the cast delay.
     """
 
+    __slots__ = (
+        "duration",
+        "_base_cast_delay_percentage",
+        "cast_delay_percentage",
+        "_modifier",
+    )
+
+    TIMED = True
+
     def __init__(self, duration: float, cast_delay_percentage: float) -> None:
         super().__init__([SpellTags.BUFF, ElementTags.AIR])
         self.duration = Duration(duration)
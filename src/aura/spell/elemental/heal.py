@@ -8,13 +8,15 @@ class HealSpell(Spell):
     Level scaling: Increases the healing amount.
     """
 
+    __slots__ = ("_base_healing", "healing")
+
     def __init__(self, healing: float) -> None:
         super().__init__([SpellTags.BUFF, ElementTags.LIGHT])
         self._base_healing = healing
         self.healing = healing
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
-        aura.process_event(HealEvent(self.healing))
+        aura.process_event(aura.acquire_event(HealEvent, self.healing))
 
         return True  # Remove after one application
 
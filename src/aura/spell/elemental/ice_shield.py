@@ -12,6 +12,18 @@ class IceShieldSpell(Spell):
     Level scaling: Increases the damage reduction percentage up to 100%.
     """
 
+    __slots__ = (
+        "duration",
+        "_base_reduction",
+        "reduction",
+        "hits",
+        "_freeze_spell",
+        "_caster",
+        "_freeze_cast",
+    )
+
+    HANDLED_EVENTS = (DamageEvent,)
+
     def __init__(
         self,
         reduction: float,
@@ -42,6 +54,14 @@ class IceShieldSpell(Spell):
 
         return False
 
+    def linear_effect(self, aura: Aura) -> tuple[None, float, float] | None:
+        if self.hits.is_max:
+            return None
+        return None, 0.0, self.duration.remaining
+
+    def fast_forward(self, aura: Aura, elapsed_time: float) -> bool:
+        return self.duration.update(elapsed_time)
+
     def modify_event(self, aura: Aura, event: AuraEvent) -> None:
         if self.duration.is_expired or self.hits.is_max:
             return
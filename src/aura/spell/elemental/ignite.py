@@ -9,6 +9,10 @@ class IgniteSpell(Spell):
     Level scaling: Increases the damage per second.
     """
 
+    __slots__ = ("duration", "_base_damage_per_second", "damage_per_second")
+
+    DAMAGE_OVER_TIME = True
+
     def __init__(self, damage_per_second: float, duration: float) -> None:
         super().__init__([SpellTags.DEBUFF, ElementTags.FIRE])
         self.duration = Duration(duration)
@@ -17,8 +21,14 @@ class IgniteSpell(Spell):
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
         damage = self.damage_per_second * min(elapsed_time, self.duration.remaining)
-        aura.process_event(DamageEvent(damage))
+        aura.process_event(aura.acquire_event(DamageEvent, damage))
+
+        return self.duration.update(elapsed_time)
+
+    def linear_effect(self, aura: Aura) -> tuple[type, float, float]:
+        return DamageEvent, self.damage_per_second, self.duration.remaining
 
+    def fast_forward(self, aura: Aura, elapsed_time: float) -> bool:
         return self.duration.update(elapsed_time)
 
     def _update_level(self, level: int) -> None:
@@ -16,6 +16,12 @@ class PauseSpell(Spell):
     Level scaling: Increases the pause duration.
     """
 
+    __slots__ = ("_base_duration", "duration", "_modifier")
+
+    HANDLED_EVENTS = (CastEvent,)
+
+    TIMED = True
+
     def __init__(self, duration: float) -> None:
         """Initialize a PauseSpell.
 
@@ -69,7 +75,7 @@ class PauseSpell(Spell):
         event_spell = event.spell
         if isinstance(event_spell, PauseSpell):
             # Check if a pause is already active
-            already_paused = aura.spells.get_by_class(PauseSpell) != []
+            already_paused = aura.spells.count_by_class(PauseSpell) > 0
             if not already_paused:
                 # No pause active, add a new one with the same duration as this spell
                 aura.add_spell(PauseSpell(self.duration.length))
@@ -9,6 +9,8 @@ class RegenSpell(Spell):
     Level scaling: Increases the regeneration rate per second.
     """
 
+    __slots__ = ("_base_regen_rate", "regen_rate", "duration")
+
     def __init__(self, regen_rate: float, duration: float):
         """Initialize a RegenSpell.
 
@@ -27,5 +29,11 @@ class RegenSpell(Spell):
 
         return self.duration.update(elapsed_time)
 
+    def linear_effect(self, aura: Aura) -> tuple[None, float, float]:
+        return None, self.regen_rate, self.duration.remaining
+
+    def fast_forward(self, aura: Aura, elapsed_time: float) -> bool:
+        return self.duration.update(elapsed_time)
+
     def _update_level(self, level: int) -> None:
         self.regen_rate = Spell.LEVEL_SCALER.scale_value(self._base_regen_rate, level)
@@ -8,13 +8,15 @@ class RockSpell(Spell):
     Level scaling: Increases the damage amount.
     """
 
+    __slots__ = ("_base_damage", "damage")
+
     def __init__(self, damage: float) -> None:
         super().__init__([SpellTags.DEBUFF, ElementTags.EARTH])
         self._base_damage = damage
         self.damage = damage
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
-        aura.process_event(DamageEvent(self.damage))
+        aura.process_event(aura.acquire_event(DamageEvent, self.damage))
 
         return True  # Remove after one application
 
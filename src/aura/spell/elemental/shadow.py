@@ -10,6 +10,10 @@ class ShadowSpell(Spell):
     Level scaling: Increases the duration.
     """
 
+    __slots__ = ("_base_duration", "duration")
+
+    TIMED = True
+
     def __init__(self, duration: float) -> None:
         super().__init__([SpellTags.DEBUFF, ElementTags.DARK])
         self._base_duration = duration
@@ -9,13 +9,34 @@ class ShockSpell(Spell):
     Level scaling: Increases the heal reduction percentage.
     """
 
+    __slots__ = (
+        "duration",
+        "_base_heal_reduction_percentage",
+        "_heal_reduction_percentage",
+    )
+
+    PURE_MULTIPLIER = True
+
+    HANDLED_EVENTS = (HealEvent,)
+
+    TIMED = True
+
     def __init__(self, heal_reduction_percentage: float, duration: float) -> None:
         super().__init__([SpellTags.DEBUFF, ElementTags.LIGHTNING])
         self.duration = Duration(duration)
         self._base_heal_reduction_percentage = max(
             min(heal_reduction_percentage, 1.0), 0.0
         )
-        self.heal_reduction_percentage = self._base_heal_reduction_percentage
+        self._heal_reduction_percentage = self._base_heal_reduction_percentage
+
+    @property
+    def heal_reduction_percentage(self) -> float:
+        return self._heal_reduction_percentage
+
+    @heal_reduction_percentage.setter
+    def heal_reduction_percentage(self, value: float) -> None:
+        self._heal_reduction_percentage = value
+        self.multiplier_changed()
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
         return self.duration.update(elapsed_time)
@@ -24,6 +45,9 @@ class ShockSpell(Spell):
         if isinstance(event, HealEvent):
             event.amount *= 1 - self.heal_reduction_percentage
 
+    def event_multiplier(self, event_type: type) -> float:
+        return 1 - self.heal_reduction_percentage
+
     def _update_level(self, level: int) -> None:
         self.heal_reduction_percentage = Spell.LEVEL_SCALER.scale_value(
             self._base_heal_reduction_percentage, level
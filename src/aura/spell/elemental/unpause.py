@@ -9,13 +9,13 @@ class UnpauseSpell(Spell):
     Level scaling: No scaling (instant removal effect).
     """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__([SpellTags.BUFF, ElementTags.TIME])
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
-        pause_spells = aura.spells.get_by_class(PauseSpell)
-        for spell in pause_spells:
-            aura.remove_spell(spell)
+        aura.remove_spells(aura.spells.get_by_class(PauseSpell))
 
         return True  # Remove immediately after application
 
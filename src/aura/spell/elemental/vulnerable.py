@@ -10,29 +10,66 @@ class VulnerableSpell(Spell):
     Level scaling: Increases the damage multiplier.
     """
 
+    __slots__ = (
+        "duration",
+        "_base_damage_multiplier",
+        "_damage_multiplier",
+        "_shield_spells_removed",
+    )
+
+    PURE_MULTIPLIER = True
+
+    HANDLED_EVENTS = (DamageEvent,)
+
     def __init__(self, damage_multiplier: float, duration: float) -> None:
         super().__init__([SpellTags.DEBUFF, ElementTags.DARK])
         self.duration = Duration(duration)
         self._base_damage_multiplier: float = max(1.0, damage_multiplier)
-        self.damage_multiplier: float = self._base_damage_multiplier
-        self.shield_spells_removed: bool = False
+        self._damage_multiplier: float = self._base_damage_multiplier
+        self._shield_spells_removed: bool = False
+
+    @property
+    def damage_multiplier(self) -> float:
+        return self._damage_multiplier
+
+    @damage_multiplier.setter
+    def damage_multiplier(self, value: float) -> None:
+        self._damage_multiplier = value
+        self.multiplier_changed()
+
+    @property
+    def shield_spells_removed(self) -> bool:
+        return self._shield_spells_removed
+
+    @shield_spells_removed.setter
+    def shield_spells_removed(self, value: bool) -> None:
+        self._shield_spells_removed = value
+        self.multiplier_changed()
 
     def update(self, aura: Aura, elapsed_time: float) -> bool:
-        shield_spells = aura.spells.get_by_tag(SpellTags.SHIELD)
-        for spell in shield_spells:
-            aura.remove_spell(spell)
+        if aura.spells.count_by_tag(SpellTags.SHIELD):
+            aura.remove_spells(aura.spells.get_by_tag(SpellTags.SHIELD))
+            if not self.shield_spells_removed:
+                self.shield_spells_removed = True
 
-        if len(shield_spells) > 0:
-            self.shield_spells_removed = True
+        return self.duration.update(elapsed_time)
 
+    def linear_effect(self, aura: Aura) -> tuple[None, float, float] | None:
+        if next(aura.spells.iter_by_tag(SpellTags.SHIELD), None) is not None:
+            return None  # Removing shields is left to update
+        return None, 0.0, self.duration.remaining
+
+    def fast_forward(self, aura: Aura, elapsed_time: float) -> bool:
         return self.duration.update(elapsed_time)
 
+    def event_multiplier(self, event_type: type) -> float:
+        return 1.0 if self.shield_spells_removed else self.damage_multiplier
+
     def modify_event(self, aura: Aura, event: AuraEvent) -> None:
         if not self.shield_spells_removed and isinstance(event, DamageEvent):
             event.amount *= self.damage_multiplier
 
     def _update_level(self, level: int) -> None:
-        self.damage_multiplier = Spell.LEVEL_SCALER.scale_value(
-            self._base_damage_multiplier, level
+        self.damage_multiplier = max(
+            1.0, Spell.LEVEL_SCALER.scale_value(self._base_damage_multiplier, level)
         )
-        self.damage_multiplier = max(1.0, self.damage_multiplier)
@@ -8,6 +8,8 @@ class WarmthSpell(Spell):
     Level scaling: No scaling (instant removal effect).
     """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__([SpellTags.BUFF, ElementTags.FIRE])
 
@@ -15,8 +17,7 @@ class WarmthSpell(Spell):
         water_debuffs = aura.spells.get_by_tag(ElementTags.WATER, SpellTags.DEBUFF)
         ice_debuffs = aura.spells.get_by_tag(ElementTags.ICE, SpellTags.DEBUFF)
 
-        for spell in water_debuffs + ice_debuffs:
-            aura.remove_spell(spell)
+        aura.remove_spells(water_debuffs + ice_debuffs)
 
         return True  # Remove immediately after application
 
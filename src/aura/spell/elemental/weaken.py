@@ -9,6 +9,12 @@ class WeakenSpell(Spell):
     Level scaling: Increases the level reduction.
     """
 
+    __slots__ = ("_base_reduction", "reduction", "duration")
+
+    HANDLED_EVENTS = (CastEvent,)
+
+    TIMED = True
+
     def __init__(self, reduction: float, duration: float) -> None:
         super().__init__(tags=[SpellTags.DEBUFF, ElementTags.WATER])
         self._base_reduction = max(0, min(reduction, 1))
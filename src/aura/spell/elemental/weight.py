@@ -10,6 +10,8 @@ GRAVITY: float = 9.81  # m/s²
 class AccelerationEvent(AuraEvent):
     """Event representing acceleration."""
 
+    __slots__ = ("x_accel", "y_accel", "z_accel", "_accel_magnitude")
+
     def __init__(
         self,
         x_accel: float,
@@ -38,6 +40,18 @@ class WeightSpell(Spell):
     Level scaling: Increases the damage per second.
     """
 
+    __slots__ = (
+        "duration",
+        "acceleration_threshold",
+        "_base_damage_per_second",
+        "damage_per_second",
+        "movement_detected",
+    )
+
+    HANDLED_EVENTS = (AccelerationEvent,)
+
+    DAMAGE_OVER_TIME = True
+
     def __init__(
         self, acceleration_threshold: float, damage_per_second: float, duration: float
     ) -> None:
@@ -52,8 +66,15 @@ class WeightSpell(Spell):
         # if movement was detected above threshold, apply damage
         if self.movement_detected:
             damage = self.damage_per_second * min(elapsed_time, self.duration.remaining)
-            aura.process_event(DamageEvent(damage))
+            aura.process_event(aura.acquire_event(DamageEvent, damage))
+
+        return self.duration.update(elapsed_time)
+
+    def linear_effect(self, aura: "Aura") -> tuple[type, float, float]:
+        damage_per_second = self.damage_per_second if self.movement_detected else 0.0
+        return DamageEvent, damage_per_second, self.duration.remaining
 
+    def fast_forward(self, aura: "Aura", elapsed_time: float) -> bool:
         return self.duration.update(elapsed_time)
 
     def modify_event(self, aura: "Aura", event: AuraEvent) -> None:
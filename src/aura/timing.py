@@ -0,0 +1,340 @@
+"""A hierarchical timing wheel that fires callbacks at absolute simulation times.
+
+The wheel owns a clock that moves forward by the time passed to advance. Timers are
+kept in slots by the tick of their deadline, with each level of the wheel covering
+64 times the span of the level below it. Timers far in the future wait in the
+higher levels and cascade down as the clock approaches them, so advancing the
+clock only visits the timers that are due and skips empty stretches of time.
+"""
+
+import math
+
+try:
+    from typing import Callable
+except ImportError:
+    pass
+
+
+class Timer:
+    """A callback scheduled on a TimingWheel."""
+
+    __slots__ = ("deadline", "callback", "argument", "_key")
+
+    def __init__(
+        self, deadline: float, callback: "Callable[..., None]", argument: tuple = ()
+    ) -> None:
+        """Initializes the timer.
+
+        Args:
+            deadline: The clock time at which the callback fires.
+            callback: The callable invoked when the timer fires.
+            argument: The positional arguments passed to the callback.
+        """
+        self.deadline: float = deadline
+        self.callback: "Callable[..., None] | None" = callback
+        self.argument: tuple = argument
+        # The key of the wheel slot holding the timer, None once fired or canceled
+        self._key: int | None = None
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the timer is waiting to fire."""
+        return self._key is not None
+
+
+class TimingWheel:
+    """Schedules callbacks at absolute clock times and fires them as the clock
+    advances, in deadline order."""
+
+    SLOT_BITS = 6
+    SLOTS = 1 << SLOT_BITS
+    LEVELS = 6
+
+    EPSILON = 1e-9
+    """Timers fire once the clock is within this distance of their deadline, so
+    deadlines reached by summing frame times are not missed by rounding."""
+
+    __slots__ = (
+        "_resolution",
+        "_now",
+        "_tick",
+        "_slots",
+        "_counts",
+        "_pending",
+        "_horizon",
+        "on_schedule",
+    )
+
+    def __init__(self, resolution: float = 0.01) -> None:
+        """Initializes the wheel with its clock at zero.
+
+        Args:
+            resolution: The span of time in seconds covered by one slot of the lowest
+                level. Deadlines are exact, the resolution only affects how timers are
+                bucketed.
+        """
+        self._resolution: float = resolution
+        self._now: float = 0.0
+        self._tick: int = 0
+        # Slot lists keyed by level * SLOTS + slot, created when first needed
+        self._slots: dict[int, list[Timer]] = {}
+        self._counts: list[int] = [0] * TimingWheel.LEVELS
+        self._pending: int = 0
+        # The clock time before which no timer can fire or cascade. Advances that stay
+        # before it only move the clock and leave the tick behind, which spares them
+        # allocating tick integers on every frame.
+        self._horizon: float = math.inf
+        self.on_schedule: "Callable[[], None] | None" = None
+        """Called whenever a timer is scheduled, for owners that stop advancing the
+        wheel while it is empty."""
+
+    def schedule(
+        self, deadline: float, callback: "Callable[..., None]", argument: tuple = ()
+    ) -> Timer:
+        """Schedules a callback. Deadlines that already passed fire on the next advance.
+
+        Args:
+            deadline: The clock time at which the callback fires.
+            callback: The callable to invoke.
+            argument: The positional arguments passed to the callback.
+
+        Returns:
+            The timer, which can be passed to cancel.
+        """
+        if self._horizon != -math.inf:
+            self._catch_up()
+        timer = Timer(deadline, callback, argument)
+        self._place(timer)
+        self._pending += 1
+        if self.on_schedule is not None:
+            self.on_schedule()
+        return timer
+
+    def cancel(self, timer: Timer) -> None:
+        """Cancels a timer. Canceling a fired or canceled timer has no effect.
+
+        Args:
+            timer: The timer to cancel.
+        """
+        timer.callback = None
+        if timer._key is not None:
+            self._unlink(timer)
+            self._pending -= 1
+
+    def advance(self, elapsed_time: float) -> int:
+        """Moves the clock forward and fires the timers that became due.
+
+        Callbacks may schedule and cancel timers. Timers scheduled by a callback that
+        are already due fire during the same advance.
+
+        Args:
+            elapsed_time: The time passed since the last advance.
+
+        Returns:
+            The number of timers fired.
+        """
+        self._now += elapsed_time
+        now = self._now
+        if now < self._horizon:
+            return 0
+
+        # Timers scheduled by callbacks are placed from the tick being fired
+        self._horizon = -math.inf
+        target = int(now // self._resolution)
+        if not self._pending:
+            if target > self._tick:
+                self._tick = target
+            self._horizon = math.inf
+            return 0
+
+        # Timers left in the current slot by the previous advance
+        fired = self._fire_slot(self._tick & (TimingWheel.SLOTS - 1), now)
+        while self._tick < target:
+            if not self._pending:
+                self._tick = target
+                break
+
+            level = 0
+            while not self._counts[level]:
+                level += 1
+            if level:
+                # Nothing can fire before the next cascade into the empty levels
+                boundary = self._tick | ((1 << (TimingWheel.SLOT_BITS * level)) - 1)
+                if boundary >= target:
+                    self._tick = target
+                    break
+                self._tick = boundary
+
+            self._tick += 1
+            if not self._tick & (TimingWheel.SLOTS - 1):
+                self._cascade()
+            fired += self._fire_slot(self._tick & (TimingWheel.SLOTS - 1), now)
+
+        self._update_horizon()
+        return fired
+
+    def reset(self, now: float = 0.0) -> None:
+        """Moves the clock of an empty wheel to a time, such as when restoring saved
+        state.
+
+        Args:
+            now: The new clock time.
+
+        Raises:
+            ValueError: If timers are waiting to fire.
+        """
+        if self._pending:
+            raise ValueError("Cannot reset a timing wheel with waiting timers")
+        self._now = now
+        self._tick = int(now // self._resolution)
+        self._horizon = math.inf
+
+    def _jump(self, now: float) -> None:
+        """Moves the clock forward to a time before the earliest deadline without
+        firing or cascading timers, such as after the clock was kept elsewhere.
+
+        Args:
+            now: The new clock time, which no waiting timer may have reached.
+        """
+        self._now = now
+        if now >= self._horizon:
+            # The tick is left behind past a cascade, so the next advance must walk it
+            # up to the clock before timers are placed from it
+            self._horizon = -math.inf
+
+    def next_deadline(self) -> float | None:
+        """Returns the earliest deadline of the waiting timers, or None if there are
+        none. Visits every waiting timer."""
+        earliest = None
+        for timers in self._slots.values():
+            for timer in timers:
+                if earliest is None or timer.deadline < earliest:
+                    earliest = timer.deadline
+        return earliest
+
+    def _update_horizon(self) -> None:
+        """Finds the time of the next tick at which timers fire or cascade."""
+        if not self._pending:
+            self._horizon = math.inf
+        elif self._counts[0]:
+            # Timers left in the current slot fire at their deadlines
+            self._horizon = -math.inf
+        else:
+            bits = TimingWheel.SLOT_BITS
+            level = 1
+            while not self._counts[level]:
+                level += 1
+            # The timers of the level cascade down once the tick reaches their slot
+            shift = bits * level
+            base = level * TimingWheel.SLOTS
+            slot = ((self._tick >> shift) & (TimingWheel.SLOTS - 1)) + 1
+            while slot < TimingWheel.SLOTS and base + slot not in self._slots:
+                slot += 1
+            if slot < TimingWheel.SLOTS:
+                block = self._tick >> (shift + bits) << (shift + bits)
+                cascade = block | (slot << shift)
+            else:
+                # Timers of the highest level that wrapped around its slots
+                cascade = ((self._tick >> shift) + 1) << shift
+            # Short of the cascade, so rounding cannot carry the clock past it
+            self._horizon = (cascade - 0.000001) * self._resolution
+
+    def _catch_up(self) -> None:
+        """Moves the tick left behind by advances before the horizon to the clock."""
+        tick = int(self._now // self._resolution)
+        if tick > self._tick:
+            self._tick = tick
+        self._horizon = -math.inf
+
+    def _place(self, timer: Timer) -> None:
+        """Puts a timer in the slot of the lowest level that reaches its deadline."""
+        bits = TimingWheel.SLOT_BITS
+        tick = int((timer.deadline - TimingWheel.EPSILON) // self._resolution)
+        current = self._tick
+        if tick <= current:
+            level = 0
+            slot = current & (TimingWheel.SLOTS - 1)
+        else:
+            # The lowest level above which the deadline and the clock share a slot
+            level = 0
+            while level < TimingWheel.LEVELS - 1:
+                shift = bits * (level + 1)
+                if tick >> shift == current >> shift:
+                    break
+                level += 1
+            slot = (tick >> (bits * level)) & (TimingWheel.SLOTS - 1)
+
+        key = level * TimingWheel.SLOTS + slot
+        timers = self._slots.get(key)
+        if timers is None:
+            timers = self._slots[key] = []
+        timers.append(timer)
+        timer._key = key
+        self._counts[level] += 1
+
+    def _unlink(self, timer: Timer) -> None:
+        """Removes a timer from its slot."""
+        key = timer._key
+        timers = self._slots[key]
+        timers.remove(timer)
+        if not timers:
+            del self._slots[key]
+        self._counts[key // TimingWheel.SLOTS] -= 1
+        timer._key = None
+
+    def _cascade(self) -> None:
+        """Moves the timers of the higher level slots reached by the clock down the
+        wheel, starting from the highest level."""
+        bits = TimingWheel.SLOT_BITS
+        mask = TimingWheel.SLOTS - 1
+        tick = self._tick
+        level = 1
+        while level < TimingWheel.LEVELS - 1 and not (tick >> (bits * level)) & mask:
+            level += 1
+
+        while level > 0:
+            key = level * TimingWheel.SLOTS + ((tick >> (bits * level)) & mask)
+            timers = self._slots.pop(key, None)
+            if timers:
+                self._counts[level] -= len(timers)
+                for timer in timers:
+                    self._place(timer)
+            level -= 1
+
+    def _fire_slot(self, slot: int, now: float) -> int:
+        """Fires the due timers of a lowest level slot in deadline order."""
+        limit = now + TimingWheel.EPSILON
+        fired = 0
+        while True:
+            timers = self._slots.get(slot)
+            if not timers:
+                return fired
+            due = [timer for timer in timers if timer.deadline <= limit]
+            if not due:
+                return fired
+
+            for timer in due:
+                self._unlink(timer)
+            self._pending -= len(due)
+            due.sort(key=lambda timer: timer.deadline)
+            for timer in due:
+                # An earlier callback may have canceled the timer
+                callback = timer.callback
+                if callback is not None:
+                    timer.callback = None
+                    fired += 1
+                    callback(*timer.argument)
+
+    @property
+    def now(self) -> float:
+        """The current clock time."""
+        return self._now
+
+    @property
+    def resolution(self) -> float:
+        """The span of time covered by one slot of the lowest level."""
+        return self._resolution
+
+    def __len__(self) -> int:
+        """Returns the number of timers waiting to fire."""
+        return self._pending
@@ -3,9 +3,26 @@ try:
 except ImportError:
     pass
 
+from aura.timing import Timer, TimingWheel
+
 
 class Duration:
-    """A utility class for tracking a duration."""
+    """A utility class for tracking a duration.
+
+    By default the elapsed time accumulates through update. A duration bound to a
+    TimingWheel instead reads the elapsed time from the wheel's clock and can have
+    the wheel call back when it expires, so it does not need to be updated.
+    """
+
+    __slots__ = (
+        "_length",
+        "_elapsed",
+        "_wheel",
+        "_start",
+        "_timer",
+        "_on_expire",
+        "_argument",
+    )
 
     def __init__(self, length: float) -> None:
         """Initialize a Duration tracker.
@@ -15,9 +32,15 @@ class Duration:
         """
         self._length: float = length
         self._elapsed: float = 0.0
+        self._wheel: TimingWheel | None = None
+        self._start: float = 0.0
+        self._timer: Timer | None = None
+        self._on_expire: "Callable[..., None] | None" = None
+        self._argument: tuple = ()
 
     def update(self, elapsed_time: float) -> bool:
         """Update the elapsed time and check if the duration has expired.
+        Bound durations follow their wheel's clock and ignore the elapsed time.
 
         Args:
             elapsed_time: The amount of time passed since the last update.
@@ -25,13 +48,65 @@ class Duration:
         Returns:
             True if the duration has expired, False otherwise.
         """
-        self._elapsed += elapsed_time
+        if self._wheel is None:
+            self._elapsed += elapsed_time
 
         return self.is_expired
 
+    def bind(
+        self,
+        wheel: TimingWheel,
+        on_expire: "Callable[..., None] | None" = None,
+        argument: tuple = (),
+    ) -> None:
+        """Follows a wheel's clock from now on, keeping the time already elapsed.
+
+        Args:
+            wheel: The timing wheel whose clock drives the duration.
+            on_expire: Called by the wheel once the duration expires. Rescheduled when
+                the duration is reset or its length changes.
+            argument: The positional arguments passed to on_expire.
+        """
+        elapsed = self.elapsed
+        self.unbind()
+        self._wheel = wheel
+        self._start = wheel.now - elapsed
+        self._on_expire = on_expire
+        self._argument = argument
+        self._schedule()
+
+    def unbind(self) -> None:
+        """Stops following the clock and cancels the expiry callback. The elapsed time
+        is kept and accumulates through update again."""
+        wheel = self._wheel
+        if wheel is None:
+            return
+
+        self._elapsed = wheel.now - self._start
+        if self._timer is not None:
+            wheel.cancel(self._timer)
+        self._wheel = None
+        self._timer = None
+        self._on_expire = None
+        self._argument = ()
+
+    def _schedule(self) -> None:
+        """Schedules the expiry callback of a bound duration for its current end."""
+        wheel = self._wheel
+        if self._timer is not None:
+            wheel.cancel(self._timer)
+            self._timer = None
+        if self._on_expire is not None:
+            self._timer = wheel.schedule(
+                self._start + self._length, self._on_expire, self._argument
+            )
+
     def reset(self) -> None:
         """Resets the elapsed time to zero."""
         self._elapsed = 0.0
+        if self._wheel is not None:
+            self._start = self._wheel.now
+            self._schedule()
 
     @property
     def length(self) -> float:
@@ -46,26 +121,51 @@ class Duration:
             value: The new length of the duration.
         """
         self._length = value
+        if self._wheel is not None:
+            self._schedule()
 
     @property
     def elapsed(self) -> float:
         """The time elapsed since the start of the duration."""
+        if self._wheel is not None:
+            return self._wheel.now - self._start
         return self._elapsed
 
+    @elapsed.setter
+    def elapsed(self, value: float) -> None:
+        """Sets the time elapsed since the start of the duration.
+
+        Args:
+            value: The new elapsed time.
+        """
+        self._elapsed = value
+        if self._wheel is not None:
+            self._start = self._wheel.now - value
+            self._schedule()
+
     @property
     def remaining(self) -> float:
         """The remaining time until the duration expires."""
-        return max(0.0, self._length - self._elapsed)
+        return max(0.0, self._length - self.elapsed)
 
     @property
     def is_expired(self) -> bool:
         """Whether the duration has expired."""
+        if self._wheel is not None:
+            return self._wheel.now - self._start + TimingWheel.EPSILON >= self._length
         return self._elapsed >= self._length
 
+    @property
+    def is_bound(self) -> bool:
+        """Whether the duration follows a timing wheel's clock."""
+        return self._wheel is not None
+
 
 class ValueModifier:
     """Applies a temporary multiplier to a value."""
 
+    __slots__ = ("_multiplier", "_duration")
+
     def __init__(self, multiplier: float, duration: float) -> None:
         """Initializes the modifier with a multiplier and duration.
 
@@ -108,7 +208,13 @@ class ValueModifier:
 
 
 class ValueModifiers:
-    """Manages a collection of ValueModifiers and notifies an optional callback when the list changes."""
+    """Manages a collection of ValueModifiers and notifies an optional callback when the list changes.
+
+    Once bound to a TimingWheel, the durations of the modifiers follow the wheel's
+    clock and expired modifiers are removed by the wheel instead of by update.
+    """
+
+    __slots__ = ("_modifiers", "_modifiers_changed", "_wheel")
 
     def __init__(self, modifiers_changed: Callable | None = None) -> None:
         """Initializes the manager with a callback for list changes.
@@ -118,11 +224,25 @@ class ValueModifiers:
         """
         self._modifiers: list[ValueModifier] = []
         self._modifiers_changed = modifiers_changed
+        self._wheel: TimingWheel | None = None
 
     def _notify_modifiers_changed(self) -> None:
         if self._modifiers_changed:
             self._modifiers_changed()
 
+    def bind(self, wheel: TimingWheel) -> None:
+        """Binds the durations of the current and future modifiers to a wheel.
+
+        Args:
+            wheel: The timing wheel that expires the modifiers.
+        """
+        self._wheel = wheel
+        for modifier in self._modifiers:
+            self._bind_modifier(modifier)
+
+    def _bind_modifier(self, modifier: ValueModifier) -> None:
+        modifier.duration.bind(self._wheel, self.remove, (modifier,))
+
     def add(self, modifier: ValueModifier) -> bool:
         """Adds a modifier to the list if it is not already present and triggers the callback.
 
@@ -133,6 +253,8 @@ class ValueModifiers:
         """
         if modifier not in self._modifiers:
             self._modifiers.append(modifier)
+            if self._wheel is not None:
+                self._bind_modifier(modifier)
             self._notify_modifiers_changed()
             return True
 
@@ -146,6 +268,8 @@ class ValueModifiers:
         """
         if modifier in self._modifiers:
             self._modifiers.remove(modifier)
+            if self._wheel is not None and modifier.duration._wheel is self._wheel:
+                modifier.duration.unbind()
             self._notify_modifiers_changed()
 
     def update(self, elapsed_time: float) -> None:
@@ -154,6 +278,9 @@ class ValueModifiers:
         Args:
             elapsed_time: The time passed since the last update.
         """
+        if not self._modifiers or self._wheel is not None:
+            return
+
         modifiers_to_remove = []
         for modifier in self._modifiers:
             # If update returns True, the modifier has expired
@@ -193,6 +320,8 @@ class ValueModifiers:
 class ValueWithModifiers:
     """A value that can be modified by a set of multipliers."""
 
+    __slots__ = ("_base", "_value", "_value_changed", "_modifiers")
+
     def __init__(
         self, base_value: float = 0.0, value_changed: Callable | None = None
     ) -> None:
@@ -245,21 +374,48 @@ class ValueWithModifiers:
 class MinMaxValue:
     """A value clamped between a minimum and a dynamic maximum."""
 
-    def __init__(self, value: float, min: float, max: float) -> None:
+    __slots__ = ("_value", "_min", "_max", "_value_changed", "_max_changed")
+
+    def __init__(
+        self,
+        value: float,
+        min: float,
+        max: float,
+        value_changed: Callable | None = None,
+        max_changed: Callable | None = None,
+    ) -> None:
         """Initializes the value with a clamped starting value.
 
         Args:
             value: The starting value.
             min: The minimum allowed value.
             max: The base maximum allowed value.
+            value_changed: A callable to invoke when the value or the minimum changes.
+            max_changed: A callable to invoke when the maximum or its modifiers change.
         """
         self._value = value
         self._min = min
-        self._max = ValueWithModifiers(base_value=max, value_changed=self._clamp_value)
+        self._value_changed = value_changed
+        self._max_changed = max_changed
+        self._max = ValueWithModifiers(base_value=max, value_changed=self._update_max)
+
+    def _update_max(self) -> None:
+        """Clamps the current value to the new maximum and invokes the callback."""
+        self._clamp_value()
+        if self._max_changed:
+            self._max_changed()
 
     def _clamp_value(self) -> None:
         """Clamps the current value between min and max."""
-        self._value = max(self.min, min(self._value, self.max.value))
+        self._set_value(self._value)
+
+    def _set_value(self, value: float) -> None:
+        """Stores the clamped value, invoking the callback if it changed."""
+        clamped = max(self._min, min(value, self._max._value))
+        if clamped != self._value:
+            self._value = clamped
+            if self._value_changed:
+                self._value_changed()
 
     def update(self, elapsed_time: float) -> None:
         """Updates the maximum modifiers.
@@ -281,8 +437,7 @@ class MinMaxValue:
         Args:
             value: The value to set.
         """
-        self._value = value
-        self._clamp_value()
+        self._set_value(value)
 
     @property
     def min(self) -> float:
@@ -296,8 +451,13 @@ class MinMaxValue:
         Args:
             value: The new minimum value.
         """
+        min_changed = value != self._min
+        previous = self._value
         self._min = value
         self._clamp_value()
+        # Clamping the value already invoked the callback
+        if min_changed and self._value == previous and self._value_changed:
+            self._value_changed()
 
     @property
     def max(self) -> ValueWithModifiers:
@@ -308,6 +468,8 @@ class MinMaxValue:
 class Counter:
     """A counter for tracking attributes like spell hits."""
 
+    __slots__ = ("_max", "_count")
+
     def __init__(self, max: int) -> None:
         """Initializes the counter."""
         self._max: int = max
@@ -328,6 +490,11 @@ class Counter:
         """Returns the current count."""
         return self._count
 
+    @count.setter
+    def count(self, value: int) -> None:
+        """Sets the current count, clamped between zero and the maximum."""
+        self._count = max(0, min(value, self._max))
+
     @property
     def max(self) -> int:
         """Returns the maximum count allowed."""
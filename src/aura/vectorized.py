@@ -0,0 +1,436 @@
+"""An AuraWorld that updates its damage and healing over time auras with NumPy.
+
+Auras whose only updated spells are IgniteSpell, RegenSpell and
+AmbientMagicRegenSpell are moved into columnar arrays: the magic value and bounds,
+the damage and heal multipliers of the other active spells, the earliest timer
+deadline, the clock, and the rate, length and elapsed time of each spell. A tick
+then updates all of them with a few array operations instead of walking every
+aura, spell and event in Python.
+
+Auras are grouped by the order of their spell kinds, so each group replays the
+exact sequence of operations of the object engine: regeneration is added as each
+spell updates, and the damage and heal events are applied after all spells
+updated, with damage coalesced. The results match the object engine bit for bit.
+
+An aura goes back to the object engine for the tick in which a timer such as a
+ValueModifier or a TIMED spell fires or a spell expires, and whenever it processes
+an event or the factor of one of its multiplier spells changes. Auras with event
+listeners, metrics or any other updated spell always use the object engine, and are
+moved into the arrays once they qualify.
+
+The state of a vectorized aura is only written back to its objects when it leaves
+the arrays. Call sync before reading the magic, spells or clock of vectorized
+auras, or changing them without processing an event, such as setting a spell's
+level or adding a modifier directly:
+
+    world = VectorizedWorld()
+    for aura in auras:
+        world.add(aura)
+    for _ in range(600):
+        world.update(0.0166)
+    world.sync()
+
+NumPy is optional. Install it with the numpy extra: pip install aura[numpy]
+"""
+
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from aura.aura import Aura, AuraChange, DamageEvent, HealEvent, Spell
+from aura.spell.ambient_magic_regen import AmbientMagicRegenSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.timing import TimingWheel
+from aura.world import AuraWorld
+
+# How each vectorized spell changes magic
+_DAMAGE = 0
+_MAGIC = 1
+_HEAL = 2
+
+_KINDS: dict[type, int] = {
+    IgniteSpell: _DAMAGE,
+    RegenSpell: _MAGIC,
+    AmbientMagicRegenSpell: _HEAL,
+}
+
+
+def _spell_columns(spell: Spell) -> tuple[float, float, float]:
+    """Returns the rate, the duration length and the elapsed time of a spell."""
+    if type(spell) is IgniteSpell:
+        rate = spell.damage_per_second
+    elif type(spell) is RegenSpell:
+        rate = spell.regen_rate
+    else:
+        return spell.amount_per_second, math.inf, 0.0
+    return rate, spell.duration._length, spell.duration._elapsed
+
+
+class _Layout:
+    """The vectorized auras whose spells have the same kinds in the same order.
+
+    Rows are removed by swapping the last row into their place.
+    """
+
+    __slots__ = (
+        "kinds",
+        "immediate",
+        "queued",
+        "auras",
+        "spells",
+        "rows",
+        "size",
+        "now",
+        "deadline",
+        "magic",
+        "low",
+        "high",
+        "damage_factor",
+        "heal_factor",
+        "rate",
+        "length",
+        "elapsed",
+        "stepped",
+    )
+
+    COLUMNS = (
+        "now",
+        "deadline",
+        "magic",
+        "low",
+        "high",
+        "damage_factor",
+        "heal_factor",
+        "rate",
+        "length",
+        "elapsed",
+        "stepped",
+    )
+    SPELL_COLUMNS = ("rate", "length", "elapsed")
+    """The columns holding a value per spell."""
+
+    def __init__(self, kinds: tuple[int, ...], coalesce: bool) -> None:
+        """Initializes an empty layout.
+
+        Args:
+            kinds: The kind of each spell, in update order.
+            coalesce: Whether the damage events of an update are coalesced.
+        """
+        self.kinds: tuple[int, ...] = kinds
+        # Columns of the spells adding magic as they update
+        self.immediate: tuple[int, ...] = tuple(
+            column for column, kind in enumerate(kinds) if kind == _MAGIC
+        )
+        # The queued events in order, each a kind and the columns adding to it
+        queued: list[tuple[int, list[int]]] = []
+        damage: list[int] | None = None
+        for column, kind in enumerate(kinds):
+            if kind == _HEAL:
+                queued.append((kind, [column]))
+            elif kind == _DAMAGE:
+                if damage is None or not coalesce:
+                    damage = [column]
+                    queued.append((kind, damage))
+                else:
+                    damage.append(column)
+        self.queued: tuple[tuple[int, tuple[int, ...]], ...] = tuple(
+            (kind, tuple(columns)) for kind, columns in queued
+        )
+        self.auras: list[Aura] = []
+        self.spells: list[tuple[Spell, ...]] = []
+        self.rows: dict[Aura, int] = {}
+        self.size: int = 0
+        self._allocate(16)
+
+    def _allocate(self, capacity: int) -> None:
+        """Moves the columns into arrays of a new capacity."""
+        size = self.size
+        for name in _Layout.COLUMNS:
+            if name in _Layout.SPELL_COLUMNS:
+                column = np.empty((capacity, len(self.kinds)))
+            elif name == "stepped":
+                column = np.zeros(capacity, dtype=bool)
+            else:
+                column = np.empty(capacity)
+            if size:
+                column[:size] = getattr(self, name)[:size]
+            setattr(self, name, column)
+
+    def append(
+        self, aura: Aura, spells: tuple[Spell, ...], damage: float, heal: float
+    ) -> None:
+        """Adds a row holding the state of an aura.
+
+        Args:
+            aura: The aura.
+            spells: The updated spells of the aura, in update order.
+            damage: The factor applied to the aura's damage events.
+            heal: The factor applied to the aura's heal events.
+        """
+        row = self.size
+        if row == len(self.now):
+            self._allocate(row * 2)
+        deadline = aura._wheel.next_deadline()
+        self.now[row] = aura._wheel._now
+        self.deadline[row] = math.inf if deadline is None else deadline
+        self.magic[row] = aura.magic._value
+        self.low[row] = aura.magic._min
+        self.high[row] = aura.magic._max._value
+        self.damage_factor[row] = damage
+        self.heal_factor[row] = heal
+        for column, spell in enumerate(spells):
+            columns = _spell_columns(spell)
+            self.rate[row, column] = columns[0]
+            self.length[row, column] = columns[1]
+            self.elapsed[row, column] = columns[2]
+        self.stepped[row] = False
+        self.auras.append(aura)
+        self.spells.append(spells)
+        self.rows[aura] = row
+        self.size = row + 1
+
+    def store(self, row: int) -> None:
+        """Writes the state of a row back to its aura and spells."""
+        aura = self.auras[row]
+        if not self.stepped[row]:
+            return
+        aura._wheel._jump(float(self.now[row]))
+        for column, spell in enumerate(self.spells[row]):
+            if self.kinds[column] != _HEAL:
+                spell.duration._elapsed = float(self.elapsed[row, column])
+        aura._mark_changed(AuraChange.SPELL_FIELDS)
+        aura.magic._set_value(float(self.magic[row]))
+
+    def remove(self, aura: Aura) -> None:
+        """Removes the row of an aura without writing it back."""
+        row = self.rows.pop(aura)
+        last = self.size - 1
+        if row != last:
+            moved = self.auras[last]
+            self.auras[row] = moved
+            self.spells[row] = self.spells[last]
+            self.rows[moved] = row
+            for name in _Layout.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+        self.auras.pop()
+        self.spells.pop()
+        self.size = last
+
+    def leaving(self, elapsed_time: float) -> "np.ndarray":
+        """Returns the rows in which a timer fires or a spell expires during an
+        update, in increasing order."""
+        size = self.size
+        now = self.now[:size] + elapsed_time
+        elapsed = self.elapsed[:size] + elapsed_time
+        due = self.deadline[:size] <= now + TimingWheel.EPSILON
+        due |= (elapsed >= self.length[:size]).any(axis=1)
+        return np.flatnonzero(due)
+
+    def update(self, elapsed_time: float) -> None:
+        """Updates every row, none of which has a timer firing or a spell expiring."""
+        size = self.size
+        if not size:
+            return
+        elapsed = self.elapsed[:size]
+        # The amounts of Spell.update, min(elapsed_time, duration.remaining) * rate
+        remaining = np.maximum(0.0, self.length[:size] - elapsed)
+        amounts = self.rate[:size] * np.minimum(elapsed_time, remaining)
+        low = self.low[:size]
+        high = self.high[:size]
+        magic = self.magic[:size]
+        # Clamped as MinMaxValue does, the minimum winning over the maximum
+        for column in self.immediate:
+            magic = np.maximum(low, np.minimum(magic + amounts[:, column], high))
+        for kind, columns in self.queued:
+            amount = amounts[:, columns[0]]
+            for column in columns[1:]:
+                amount = amount + amounts[:, column]
+            if kind == _DAMAGE:
+                magic = magic - amount * self.damage_factor[:size]
+            else:
+                magic = magic + amount * self.heal_factor[:size]
+            magic = np.maximum(low, np.minimum(magic, high))
+        self.magic[:size] = magic
+        self.now[:size] += elapsed_time
+        elapsed += elapsed_time
+        self.stepped[:size] = True
+
+
+class VectorizedWorld(AuraWorld):
+    """An AuraWorld that keeps its damage and healing over time auras in NumPy
+    arrays and updates them together."""
+
+    def __init__(self) -> None:
+        """Initializes an empty world.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("VectorizedWorld requires NumPy")
+        super().__init__()
+        self._layouts: dict[tuple, _Layout] = {}
+        # The layout holding each vectorized aura
+        self._vectorized: dict[Aura, _Layout] = {}
+        self._multiplier_generation: int = Spell._multiplier_generation
+
+    def update(self, elapsed_time: float) -> None:
+        """Updates every awake aura in the world, the vectorized ones with array
+        operations, with the same results as AuraWorld.update.
+
+        With a watchdog, every aura is updated through it by the object engine.
+
+        Args:
+            elapsed_time: The time passed since the last update.
+        """
+        if self.watchdog is not None or self._owed or self._deferred:
+            self.sync()
+        elif self._multiplier_generation != Spell._multiplier_generation:
+            self._refresh_multipliers()
+        self._multiplier_generation = Spell._multiplier_generation
+
+        start = time.perf_counter_ns()
+        vectorized = 0
+        for layout in self._layouts.values():
+            if not layout.size:
+                continue
+            leaving = layout.leaving(elapsed_time).tolist()
+            # Descending, so the rows swapped into place have already been checked
+            for row in reversed(leaving):
+                self._release(layout.auras[row], layout)
+            layout.update(elapsed_time)
+            vectorized += layout.size
+        vectorized_ns = time.perf_counter_ns() - start
+
+        super().update(elapsed_time)
+
+        admit_start = time.perf_counter_ns()
+        if self.watchdog is None:
+            self._admit()
+        timings = self._last_tick
+        timings.awake_count += vectorized
+        timings.spells_ns += vectorized_ns
+        timings.total_ns += vectorized_ns + time.perf_counter_ns() - admit_start
+
+    def _refresh_multipliers(self) -> None:
+        """Releases the vectorized auras whose event multipliers changed under the
+        arrays."""
+        for aura, layout in list(self._vectorized.items()):
+            for event_type in (DamageEvent, HealEvent):
+                chain = aura._handlers.get(event_type)
+                if chain is not None and chain.refresh():
+                    self._release(aura, layout)
+                    break
+
+    def _admit(self) -> None:
+        """Moves the awake auras that qualify into the arrays."""
+        for aura in list(self._awake):
+            if aura in self._deferred or aura in self._owed:
+                continue
+            plan = self._plan(aura)
+            if plan is None:
+                continue
+            key, spells, damage, heal = plan
+            layout = self._layouts.get(key)
+            if layout is None:
+                layout = self._layouts[key] = _Layout(*key)
+            layout.append(aura, spells, damage, heal)
+            self._vectorized[aura] = layout
+            del self._awake[aura]
+            # Asleep to the aura, so the next event or timer releases it
+            aura._awake = False
+
+    @staticmethod
+    def _plan(aura: Aura) -> "tuple[tuple, tuple[Spell, ...], float, float] | None":
+        """Returns the layout key, the updated spells and the damage and heal factors
+        of an aura, or None if it cannot be vectorized."""
+        if (
+            aura._event_listeners
+            or aura.metrics is not None
+            or aura._hook_timer is not None
+            or aura._queue
+            or aura._expired
+            or aura._draining
+        ):
+            return None
+        ticking = aura._ticking
+        if (
+            not len(ticking)
+            or ticking._duplicates
+            or len(ticking) >= aura.max_events_per_drain
+        ):
+            return None
+        kinds = []
+        for spell in ticking:
+            kind = _KINDS.get(type(spell))
+            if kind is None or (kind != _HEAL and spell.duration.is_bound):
+                return None
+            kinds.append(kind)
+
+        factors = []
+        for event_type in (DamageEvent, HealEvent):
+            chain = aura._handlers.get(event_type)
+            if chain is None:
+                chain = aura._build_handlers(event_type)
+            if chain.handlers:
+                # A spell does more than scale the amounts
+                return None
+            if chain.generation != Spell._multiplier_generation:
+                chain.refresh()
+            factors.append(chain.factor)
+        key = (tuple(kinds), aura.coalesce_damage)
+        return key, tuple(ticking), factors[0], factors[1]
+
+    def _release(self, aura: Aura, layout: _Layout) -> None:
+        """Writes a vectorized aura back and returns it to the object engine."""
+        layout.store(layout.rows[aura])
+        layout.remove(aura)
+        del self._vectorized[aura]
+        aura._awake = True
+        self._awake[aura] = None
+
+    def _wake(self, aura: Aura) -> None:
+        layout = self._vectorized.get(aura)
+        if layout is not None:
+            self._release(aura, layout)
+        super()._wake(aura)
+
+    def sync(self) -> None:
+        """Writes the state of the vectorized auras back to their objects and returns
+        them to the object engine until the next update."""
+        for aura, layout in list(self._vectorized.items()):
+            self._release(aura, layout)
+
+    def remove(self, aura: Aura) -> None:
+        layout = self._vectorized.get(aura)
+        if layout is not None:
+            self._release(aura, layout)
+        super().remove(aura)
+
+    def enable_metrics(self, enabled: bool = True) -> None:
+        # Auras with metrics are updated by the object engine
+        self.sync()
+        super().enable_metrics(enabled)
+
+    def collect_changes(self) -> list[tuple[Aura, int]]:
+        # The changes of vectorized auras are marked when they are written back
+        self.sync()
+        return super().collect_changes()
+
+    def is_awake(self, aura: Aura) -> bool:
+        return aura in self._vectorized or super().is_awake(aura)
+
+    @property
+    def awake_count(self) -> int:
+        return len(self._awake) + len(self._vectorized)
+
+    @property
+    def vectorized_count(self) -> int:
+        """Returns the number of auras updated with array operations."""
+        return len(self._vectorized)
@@ -0,0 +1,185 @@
+"""A watchdog for aura updates that overrun their share of a tick.
+
+A TickWatchdog times each update of an aura with perf_counter_ns. While it does,
+the aura reports every spell update and modify_event call to it, so when an update
+takes longer than the budget the watchdog knows which single spell hook was the
+slowest. Overruns are kept in a ring buffer of the most recent ones, with the spell
+composition of the aura at the end of the update.
+
+An AuraWorld with a watchdog updates its auras through it. The overrun callback
+sheds load by returning True, which defers the aura: the world skips it on the next
+tick and passes it the skipped time on the tick after, so no simulated time is lost.
+
+    def shed(overrun: TickOverrun) -> bool:
+        log.warning("%s took %d us", overrun.slowest.name, overrun.elapsed_ns // 1000)
+        return True
+
+    world.watchdog = TickWatchdog(budget_ns=2_000_000, on_overrun=shed)
+"""
+
+import time
+from collections import deque
+
+try:
+    from typing import Callable
+except ImportError:
+    pass
+
+from aura.aura import Aura, AuraEvent, Spell
+
+
+class SlowHook:
+    """The slowest spell hook call of an update."""
+
+    __slots__ = ("spell", "hook", "elapsed_ns")
+
+    def __init__(self, spell: str, hook: str, elapsed_ns: int) -> None:
+        self.spell: str = spell
+        """The class name of the spell."""
+        self.hook: str = hook
+        """The name of the spell method, update or modify_event."""
+        self.elapsed_ns: int = elapsed_ns
+
+    @property
+    def name(self) -> str:
+        """Returns the qualified name of the hook, such as "IgniteSpell.update"."""
+        return f"{self.spell}.{self.hook}"
+
+
+class TickOverrun:
+    """An aura update that took longer than the watchdog's budget."""
+
+    __slots__ = ("aura", "elapsed_ns", "budget_ns", "spells", "slowest", "deferred")
+
+    def __init__(
+        self,
+        aura: Aura,
+        elapsed_ns: int,
+        budget_ns: int,
+        spells: dict[str, int],
+        slowest: SlowHook | None,
+    ) -> None:
+        self.aura: Aura = aura
+        self.elapsed_ns: int = elapsed_ns
+        self.budget_ns: int = budget_ns
+        self.spells: dict[str, int] = spells
+        """The number of active spells of the aura by class name, after the update."""
+        self.slowest: SlowHook | None = slowest
+        """The slowest spell hook call of the update, or None if no spell hook ran."""
+        self.deferred: bool = False
+        """Whether the overrun callback deferred the aura."""
+
+
+class _HookTimer:
+    """Times the spell hooks called by an aura and keeps the slowest call."""
+
+    __slots__ = ("spell", "hook", "elapsed_ns")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.spell: Spell | None = None
+        self.hook: str = ""
+        self.elapsed_ns: int = -1
+
+    def update(self, aura: Aura, spell: Spell, elapsed_time: float) -> bool:
+        start = time.perf_counter_ns()
+        expired = spell.update(aura, elapsed_time)
+        elapsed = time.perf_counter_ns() - start
+        if elapsed > self.elapsed_ns:
+            self.spell = spell
+            self.hook = "update"
+            self.elapsed_ns = elapsed
+        return expired
+
+    def modify_event(self, aura: Aura, spell: Spell, event: AuraEvent) -> None:
+        start = time.perf_counter_ns()
+        spell.modify_event(aura, event)
+        elapsed = time.perf_counter_ns() - start
+        if elapsed > self.elapsed_ns:
+            self.spell = spell
+            self.hook = "modify_event"
+            self.elapsed_ns = elapsed
+
+
+class TickWatchdog:
+    """Times aura updates against a budget and records the ones that overrun it."""
+
+    def __init__(
+        self,
+        budget_ns: int,
+        capacity: int = 64,
+        on_overrun: "Callable[[TickOverrun], bool] | None" = None,
+    ) -> None:
+        """Initializes the watchdog.
+
+        Args:
+            budget_ns: The longest an aura update may take, in nanoseconds.
+            capacity: The number of most recent overruns kept.
+            on_overrun: Called with each overrun. Returning True defers the aura when
+                it is updated by a world.
+
+        Raises:
+            ValueError: If the budget or the capacity is not positive.
+        """
+        if budget_ns <= 0:
+            raise ValueError("The budget must be positive")
+        if capacity < 1:
+            raise ValueError("The capacity must be positive")
+        self.budget_ns: int = budget_ns
+        self.on_overrun: "Callable[[TickOverrun], bool] | None" = on_overrun
+        self.overrun_count: int = 0
+        """The number of overruns since the watchdog was created or cleared,
+        including the ones dropped from the ring buffer."""
+        self._overruns: deque[TickOverrun] = deque(maxlen=capacity)
+        self._timer = _HookTimer()
+
+    def update(self, aura: Aura, elapsed_time: float) -> bool:
+        """Updates an aura, recording an overrun if the update exceeds the budget.
+
+        Args:
+            aura: The aura to update.
+            elapsed_time: The time passed since the last update of the aura.
+
+        Returns:
+            True if the overrun callback asked to defer the aura.
+        """
+        timer = self._timer
+        timer.reset()
+        aura._hook_timer = timer
+        start = time.perf_counter_ns()
+        try:
+            aura.update(elapsed_time)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            aura._hook_timer = None
+        if elapsed <= self.budget_ns:
+            return False
+
+        spells: dict[str, int] = {}
+        for spell in aura.spells:
+            name = type(spell).__qualname__
+            spells[name] = spells.get(name, 0) + 1
+        slowest = None
+        if timer.spell is not None:
+            slowest = SlowHook(
+                type(timer.spell).__qualname__, timer.hook, timer.elapsed_ns
+            )
+        timer.spell = None
+        overrun = TickOverrun(aura, elapsed, self.budget_ns, spells, slowest)
+        self._overruns.append(overrun)
+        self.overrun_count += 1
+        if self.on_overrun is not None and self.on_overrun(overrun):
+            overrun.deferred = True
+        return overrun.deferred
+
+    @property
+    def overruns(self) -> list[TickOverrun]:
+        """Returns the most recent overruns, oldest first."""
+        return list(self._overruns)
+
+    def clear(self) -> None:
+        """Discards the recorded overruns."""
+        self._overruns.clear()
+        self.overrun_count = 0
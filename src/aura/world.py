@@ -0,0 +1,288 @@
+"""A container that owns many Auras and updates them together.
+
+Instead of walking every Aura object each tick, the world only keeps the auras that
+need updates in its tick set. Auras with no ticking spells and no timers fall asleep
+after a tick and are woken by the next event they process or timer scheduled on
+them, so a tick costs in proportion to the active auras.
+
+The world also keeps the auras that changed since changes were last collected, so
+consumers such as renderers and replication only visit the changed auras.
+"""
+
+import time
+
+try:
+    from typing import Callable, Iterable
+except ImportError:
+    pass
+
+from aura.aura import Aura, AuraEvent
+from aura.metrics import AuraMetrics
+from aura.watchdog import TickWatchdog
+
+
+class TickTimings:
+    """Wall clock timings of a single world tick, in nanoseconds."""
+
+    def __init__(self, aura_count: int, awake_count: int = 0) -> None:
+        """Initializes empty timings.
+
+        Args:
+            aura_count: The number of auras in the world during the tick.
+            awake_count: The number of auras updated during the tick.
+        """
+        self.aura_count: int = aura_count
+        self.awake_count: int = awake_count
+        self.values_ns: int = 0
+        """Time spent advancing the timing wheels, which expire modifiers and TIMED
+        spells."""
+        self.spells_ns: int = 0
+        """Time spent updating the spells. When the world has a watchdog, auras are
+        updated one at a time and this holds the whole of their updates."""
+        self.total_ns: int = 0
+
+    @property
+    def ns_per_aura(self) -> float:
+        """Returns the average tick cost per aura."""
+        if self.aura_count == 0:
+            return 0.0
+        return self.total_ns / self.aura_count
+
+
+class AuraWorld:
+    """Owns a set of Auras and updates the ones that are awake."""
+
+    def __init__(self) -> None:
+        self._auras: list[Aura] = []
+        self._indices: dict[Aura, int] = {}
+        # The auras updated by the next tick, in the order they woke up
+        self._awake: dict[Aura, None] = {}
+        # The auras with changes not collected yet, in the order they changed
+        self._changed: dict[Aura, None] = {}
+
+        self._last_tick = TickTimings(0)
+        self.metrics: AuraMetrics | None = None
+        """The durations of the world's ticks and the counts of the auras that left
+        the world, or None while metrics are off. See enable_metrics."""
+        self.watchdog: TickWatchdog | None = None
+        """Times the update of each aura against a budget when set, and defers the
+        auras its overrun callback asks for."""
+        # Deferred auras skipping the next tick, and the time skipped by each
+        self._deferred: dict[Aura, None] = {}
+        self._owed: dict[Aura, float] = {}
+
+    def add(self, aura: Aura) -> None:
+        """Adds an aura to the world. Adding an aura twice has no effect.
+
+        Args:
+            aura: The aura to add.
+        """
+        if aura in self._indices:
+            return
+
+        self._indices[aura] = len(self._auras)
+        self._auras.append(aura)
+        aura._on_wake = self._wake
+        if aura.needs_update:
+            aura._awake = True
+            self._awake[aura] = None
+        else:
+            aura._awake = False
+        aura._on_change = self._change
+        if aura._changes:
+            self._changed[aura] = None
+        if self.metrics is not None and aura.metrics is None:
+            aura.metrics = AuraMetrics()
+
+    def remove(self, aura: Aura) -> None:
+        """Removes an aura from the world by swapping the last aura into its place.
+
+        Args:
+            aura: The aura to remove.
+        """
+        index = self._indices.pop(aura, None)
+        if index is None:
+            return
+
+        last = len(self._auras) - 1
+        self._auras[index] = self._auras[last]
+        self._auras.pop()
+        if index != last:
+            self._indices[self._auras[index]] = index
+
+        self._awake.pop(aura, None)
+        aura._on_wake = None
+        aura._awake = True
+        self._changed.pop(aura, None)
+        aura._on_change = None
+        self._deferred.pop(aura, None)
+        self._owed.pop(aura, None)
+        if self.metrics is not None and aura.metrics is not None:
+            # Kept by the world, so its counters never go down
+            self.metrics.merge(aura.metrics, ticks=False)
+            aura.metrics = None
+
+    def _wake(self, aura: Aura) -> None:
+        self._awake[aura] = None
+
+    def _change(self, aura: Aura) -> None:
+        self._changed[aura] = None
+
+    def update(self, elapsed_time: float) -> None:
+        """Updates every awake aura in the world, equivalent to calling Aura.update on
+        each, and puts the auras left with nothing to update to sleep.
+
+        With a watchdog, each aura is updated through it, and an aura it defers skips
+        the next update and gets the skipped time on the one after.
+
+        Args:
+            elapsed_time: The time passed since the last update.
+        """
+        awake = list(self._awake)
+        timings = TickTimings(len(self._auras), len(awake))
+        start = time.perf_counter_ns()
+
+        if self.watchdog is None and not self._owed and not self._deferred:
+            # Wheels only visit the timers that expire
+            for aura in awake:
+                if aura.metrics is None:
+                    aura._wheel.advance(elapsed_time)
+            values_done = time.perf_counter_ns()
+
+            for aura in awake:
+                if aura.metrics is not None:
+                    # Records the duration of its own update
+                    aura.update(elapsed_time)
+                elif aura._ticking or aura._expired or aura._queue:
+                    # Also drains the events left past max_events_per_drain
+                    aura._update_spells(elapsed_time)
+        else:
+            # Each aura is updated on its own, so the watchdog can time it
+            self._update_watched(awake, elapsed_time)
+            values_done = start
+        spells_done = time.perf_counter_ns()
+
+        for aura in awake:
+            # Skips auras removed from the world during the tick, and keeps the
+            # deferred ones awake until they catch up
+            if aura in self._awake and not aura.needs_update and aura not in self._owed:
+                aura._awake = False
+                del self._awake[aura]
+                if self._deferred:
+                    # Nothing is left to skip, so the next tick after it wakes runs
+                    self._deferred.pop(aura, None)
+
+        timings.values_ns = values_done - start
+        timings.spells_ns = spells_done - values_done
+        timings.total_ns = time.perf_counter_ns() - start
+        self._last_tick = timings
+        if self.metrics is not None:
+            self.metrics.tick_ns.record(timings.total_ns)
+
+    def _update_watched(self, awake: list[Aura], elapsed_time: float) -> None:
+        watchdog = self.watchdog
+        deferred = self._deferred
+        owed = self._owed
+        for aura in awake:
+            if aura in deferred:
+                del deferred[aura]
+                owed[aura] = owed.get(aura, 0.0) + elapsed_time
+                continue
+            aura_time = elapsed_time + owed.pop(aura, 0.0) if owed else elapsed_time
+            if watchdog is None:
+                aura.update(aura_time)
+            elif watchdog.update(aura, aura_time):
+                deferred[aura] = None
+
+    def process_event_many(
+        self, targets: "Iterable[Aura]", event_factory: "Callable[[], AuraEvent]"
+    ) -> int:
+        """Processes a freshly created event on each target aura.
+
+        Args:
+            targets: The auras that receive an event.
+            event_factory: Creates the event for a single target. Each aura gets its own
+                event because active spells modify events in place.
+
+        Returns:
+            The number of events that were not canceled.
+        """
+        applied = 0
+        for aura in targets:
+            event = event_factory()
+            aura.process_event(event)
+            if not event.is_canceled:
+                applied += 1
+
+        return applied
+
+    def enable_metrics(self, enabled: bool = True) -> None:
+        """Turns metrics on or off for the world and all of its auras, including the
+        auras added later. Turning metrics off discards the counts.
+
+        Args:
+            enabled: Whether metrics are on.
+        """
+        if not enabled:
+            self.metrics = None
+            for aura in self._auras:
+                aura.metrics = None
+            return
+
+        if self.metrics is None:
+            self.metrics = AuraMetrics()
+        for aura in self._auras:
+            if aura.metrics is None:
+                aura.metrics = AuraMetrics()
+
+    def collect_metrics(self) -> AuraMetrics:
+        """Returns the counts of all auras of the world added up, with the durations
+        of the world's ticks. Empty while metrics are off."""
+        total = AuraMetrics()
+        if self.metrics is None:
+            return total
+        total.merge(self.metrics)
+        for aura in self._auras:
+            if aura.metrics is not None:
+                total.merge(aura.metrics, ticks=False)
+        return total
+
+    def collect_changes(self) -> list[tuple[Aura, int]]:
+        """Returns the auras that changed since the last collection and clears their
+        changes. Visits only the changed auras.
+
+        Returns:
+            The changed auras with their AuraChange bits, in the order they first
+            changed.
+        """
+        changes = []
+        for aura in self._changed:
+            # Changes collected from the aura directly are not returned again
+            aura_changes = aura.collect_changes()
+            if aura_changes:
+                changes.append((aura, aura_changes))
+        self._changed.clear()
+        return changes
+
+    def is_awake(self, aura: Aura) -> bool:
+        """Returns True if the aura is in the world's tick set."""
+        return aura in self._awake
+
+    @property
+    def awake_count(self) -> int:
+        """Returns the number of auras the next update will visit."""
+        return len(self._awake)
+
+    @property
+    def last_tick(self) -> TickTimings:
+        """Returns the timings of the most recent update."""
+        return self._last_tick
+
+    def __contains__(self, aura: Aura) -> bool:
+        return aura in self._indices
+
+    def __len__(self) -> int:
+        return len(self._auras)
+
+    def __iter__(self):
+        return iter(self._auras)
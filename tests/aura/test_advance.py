@@ -0,0 +1,145 @@
+import pytest
+from aura.aura import Aura, Spell
+from aura.spell.ambient_magic_regen import AmbientMagicRegenSpell
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.earth_shield import EarthShieldSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.shock import ShockSpell
+from aura.spell.elemental.vulnerable import VulnerableSpell
+from aura.values import ValueModifier
+from conftest import NoopSpell
+
+LOADOUTS = {
+    "damage_over_time": lambda: [
+        IgniteSpell(damage_per_second=4.0, duration=3.0),
+        IgniteSpell(damage_per_second=2.5, duration=7.5),
+    ],
+    "healing_through_multipliers": lambda: [
+        AmbientMagicRegenSpell(amount_per_second=3.0),
+        ChargeSpell(healing_multiplier=2.0, duration=4.0),
+        ShockSpell(heal_reduction_percentage=0.5, duration=6.0),
+        RegenSpell(regen_rate=1.5, duration=5.0),
+    ],
+    "mixed_with_expiring_buffs": lambda: [
+        IgniteSpell(damage_per_second=10.0, duration=8.0),
+        VulnerableSpell(damage_multiplier=1.5, duration=2.5),
+        AmbientMagicRegenSpell(amount_per_second=2.0),
+        HasteSpell(duration=3.0, cast_delay_percentage=0.5),
+    ],
+}
+
+
+class AdvanceFixture:
+    def __init__(self) -> None:
+        self.advanced = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+        self.stepped = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+        for aura in (self.advanced, self.stepped):
+            aura.magic.value = 50.0
+
+    def add_spells(self, factory) -> None:
+        for aura in (self.advanced, self.stepped):
+            for spell in factory():
+                aura.add_spell(spell)
+
+    def step(self, seconds: float, step: float) -> None:
+        for _ in range(round(seconds / step)):
+            self.stepped.update(step)
+
+
+@pytest.fixture
+def fixture() -> AdvanceFixture:
+    return AdvanceFixture()
+
+
+@pytest.mark.parametrize("loadout", LOADOUTS)
+def test_advance_matches_stepping(fixture: AdvanceFixture, loadout: str) -> None:
+    fixture.add_spells(LOADOUTS[loadout])
+
+    fixture.advanced.advance(10.0)
+    fixture.step(10.0, 0.001)
+
+    advanced, stepped = fixture.advanced, fixture.stepped
+    assert advanced.magic.value == pytest.approx(stepped.magic.value, abs=0.05)
+    assert advanced.cast_delay.value == stepped.cast_delay.value
+    assert [spell.name for spell in advanced.spells] == [
+        spell.name for spell in stepped.spells
+    ]
+
+
+def test_advance_clamps_at_bounds(fixture: AdvanceFixture) -> None:
+    fixture.add_spells(lambda: [IgniteSpell(damage_per_second=20.0, duration=5.0)])
+
+    fixture.advanced.advance(5.0)
+
+    assert fixture.advanced.magic.value == 0.0
+    assert len(fixture.advanced.spells) == 0
+
+
+def test_advance_follows_max_magic_modifier(fixture: AdvanceFixture) -> None:
+    aura = fixture.advanced
+    aura.magic.max.modifiers.add(ValueModifier(2.0, duration=3.0))
+    aura.add_spell(AmbientMagicRegenSpell(amount_per_second=50.0))
+
+    aura.advance(2.0)
+    assert aura.magic.value == 150.0
+
+    aura.advance(2.0)
+    assert aura.magic.max.value == 100.0
+    assert aura.magic.value == 100.0
+
+
+def test_advance_integrates_instead_of_stepping(
+    fixture: AdvanceFixture, mocker
+) -> None:
+    aura = fixture.advanced
+    spell = IgniteSpell(damage_per_second=1.0, duration=5.0)
+    aura.add_spell(spell)
+    update = mocker.spy(IgniteSpell, "update")
+
+    aura.advance(10.0)
+
+    assert update.call_count == 0
+    assert spell not in aura.spells
+    assert aura.magic.value == pytest.approx(45.0)
+
+
+def test_advance_steps_spells_without_linear_effect(fixture: AdvanceFixture) -> None:
+    class CountingSpell(NoopSpell):
+        def __init__(self) -> None:
+            super().__init__(tags=[])
+            self.updates = 0
+
+        def update(self, aura: Aura, elapsed_time: float) -> bool:
+            self.updates += 1
+            return False
+
+    spell = CountingSpell()
+    fixture.advanced.add_spell(spell)
+
+    fixture.advanced.advance(1.0, step=0.25)
+
+    assert spell.updates == 4
+
+
+def test_advance_steps_impure_event_handlers(fixture: AdvanceFixture) -> None:
+    fixture.add_spells(
+        lambda: [
+            EarthShieldSpell(reduction=0.5, max_hits=3, duration=10.0),
+            IgniteSpell(damage_per_second=4.0, duration=2.0),
+        ]
+    )
+
+    fixture.advanced.advance(2.0, step=0.5)
+    fixture.step(2.0, 0.5)
+
+    assert fixture.advanced.magic.value == fixture.stepped.magic.value
+    assert len(fixture.advanced.spells) == len(fixture.stepped.spells)
+
+
+def test_spell_has_no_linear_effect_by_default() -> None:
+    spell = NoopSpell(tags=[])
+
+    assert spell.linear_effect(Aura(0.0, 1.0, 1.0)) is None
+    assert spell.event_multiplier(Spell) is None
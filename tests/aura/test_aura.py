@@ -1,6 +1,14 @@
 import pytest
-from aura.aura import Aura, AuraEvent, DamageEvent, HealEvent, Spell, SpellTags
-from aura.values import ValueModifier
+from aura.aura import (
+    Aura,
+    AuraEvent,
+    DamageEvent,
+    HealEvent,
+    Spell,
+    SpellTags,
+    TagMatch,
+)
+from aura.values import Duration, ValueModifier
 from conftest import AuraFixture
 
 
@@ -202,6 +210,103 @@ def test_get_spells_by_tag_empty(fixture: AuraFixture) -> None:
     assert spells == []
 
 
+def test_get_spells_by_tag_match_modes(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+
+    class TaggedSpell(Spell):
+        pass
+
+    shield = TaggedSpell(tags=[SpellTags.SHIELD])
+    shield_buff = TaggedSpell(tags=[SpellTags.SHIELD, SpellTags.BUFF])
+    buff = TaggedSpell(tags=[SpellTags.BUFF])
+    untagged = TaggedSpell(tags=[])
+    for spell in (shield, shield_buff, buff, untagged):
+        aura.add_spell(spell)
+
+    tags = (SpellTags.BUFF, SpellTags.SHIELD)
+    assert aura.spells.get_by_tag(*tags, match=TagMatch.ALL) == [shield_buff]
+    assert aura.spells.get_by_tag(*tags, match=TagMatch.ANY) == [
+        shield,
+        shield_buff,
+        buff,
+    ]
+    assert aura.spells.get_by_tag(*tags, match=TagMatch.NONE) == [untagged]
+    assert aura.spells.get_by_tag(SpellTags.DEBUFF, match=TagMatch.NONE) == [
+        shield,
+        shield_buff,
+        buff,
+        untagged,
+    ]
+
+
+def test_iter_spells_by_tag(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+
+    class TaggedSpell(Spell):
+        pass
+
+    shield_buff = TaggedSpell(tags=[SpellTags.SHIELD, SpellTags.BUFF])
+    buff = TaggedSpell(tags=[SpellTags.BUFF])
+    aura.add_spell(shield_buff)
+    aura.add_spell(buff)
+
+    assert list(aura.spells.iter_by_tag(SpellTags.BUFF)) == [shield_buff, buff]
+    assert list(
+        aura.spells.iter_by_tag(SpellTags.SHIELD, SpellTags.BUFF, match=TagMatch.ANY)
+    ) == [shield_buff, buff]
+    assert list(aura.spells.iter_by_tag()) == []
+
+
+def test_remove_spells_while_iterating_by_tag(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+
+    class TaggedSpell(Spell):
+        pass
+
+    shield_buff = TaggedSpell(tags=[SpellTags.SHIELD, SpellTags.BUFF])
+    buff = TaggedSpell(tags=[SpellTags.BUFF])
+    shield = TaggedSpell(tags=[SpellTags.SHIELD])
+    for spell in (shield_buff, buff, shield):
+        aura.add_spell(spell)
+
+    visited = []
+    for spell in aura.spells.iter_by_tag(SpellTags.BUFF):
+        visited.append(spell)
+        aura.remove_spell(buff)
+    assert visited == [shield_buff]
+
+    visited = []
+    for spell in aura.spells.iter_by_tag(
+        SpellTags.SHIELD, SpellTags.BUFF, match=TagMatch.ANY
+    ):
+        visited.append(spell)
+        aura.remove_spell(spell)
+    assert visited == [shield_buff, shield]
+    assert len(aura.spells) == 0
+
+
+def test_get_spells_by_tag_after_remove(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+
+    class BuffSpell(Spell):
+        def __init__(self) -> None:
+            super().__init__(tags=[SpellTags.BUFF])
+
+    buff_spell = BuffSpell()
+    other_buff_spell = BuffSpell()
+    aura.add_spell(buff_spell)
+    aura.add_spell(other_buff_spell)
+
+    aura.remove_spell(buff_spell)
+
+    assert aura.spells.get_by_tag(SpellTags.BUFF) == [other_buff_spell]
+
+    aura.remove_spell(other_buff_spell)
+
+    assert aura.spells.get_by_tag(SpellTags.BUFF) == []
+    assert aura.spells.get_by_tag(SpellTags.BUFF, match=TagMatch.ANY) == []
+
+
 def test_get_spells_by_class(fixture: AuraFixture) -> None:
     aura = fixture.aura
 
@@ -226,3 +331,249 @@ def test_get_spells_by_class(fixture: AuraFixture) -> None:
 
     assert spells_a == [spell_a1, spell_a2]
     assert spells_b == [spell_b]
+
+
+def test_get_spells_by_class_includes_subclasses(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+
+    class BaseSpell(Spell):
+        def __init__(self) -> None:
+            super().__init__(tags=[])
+
+    class DerivedSpell(BaseSpell):
+        pass
+
+    base = BaseSpell()
+    derived = DerivedSpell()
+    other_base = BaseSpell()
+    aura.add_spell(base)
+    aura.add_spell(derived)
+    aura.add_spell(other_base)
+
+    assert aura.spells.get_by_class(BaseSpell) == [base, derived, other_base]
+    assert aura.spells.get_by_class(DerivedSpell) == [derived]
+    assert aura.spells.get_by_class(Spell) == [base, derived, other_base]
+
+    aura.remove_spell(derived)
+
+    assert aura.spells.get_by_class(BaseSpell) == [base, other_base]
+    assert aura.spells.get_by_class(DerivedSpell) == []
+
+
+def test_count_spells_by_tag(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    assert aura.spells.count_by_tag("fire") == 0
+
+    aura.add_spell(Spell(tags=["fire", "debuff"]))
+    aura.add_spell(Spell(tags=["fire"]))
+
+    assert aura.spells.count_by_tag("fire") == 2
+    assert aura.spells.count_by_tag("debuff") == 1
+
+
+def test_count_spells_by_class(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+
+    class BaseSpell(Spell):
+        def __init__(self) -> None:
+            super().__init__(tags=[])
+
+    class DerivedSpell(BaseSpell):
+        pass
+
+    assert aura.spells.count_by_class(BaseSpell) == 0
+
+    aura.add_spell(BaseSpell())
+    aura.add_spell(DerivedSpell())
+
+    assert aura.spells.count_by_class(BaseSpell) == 2
+    assert aura.spells.count_by_class(DerivedSpell) == 1
+
+    derived = DerivedSpell()
+    aura.add_spell(derived)
+    assert aura.spells.count_by_class(BaseSpell) == 3
+
+    aura.remove_spell(derived)
+    assert aura.spells.count_by_class(DerivedSpell) == 1
+
+
+def test_get_spells_by_name_after_remove(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+
+    class NamedSpell(Spell):
+        def __init__(self) -> None:
+            super().__init__(tags=[])
+
+    first = NamedSpell()
+    second = NamedSpell()
+    aura.add_spell(first)
+    aura.add_spell(second)
+
+    aura.remove_spell(first)
+
+    assert aura.spells.get_by_name("Named") == [second]
+    assert aura.spells.get_by_name("Missing") == []
+
+
+class OrderSpell(Spell):
+    def __init__(self) -> None:
+        super().__init__(tags=[])
+
+    def update(self, aura: Aura, elapsed_time: float) -> bool:
+        return False
+
+    def _update_level(self, level: int) -> None:
+        pass
+
+
+def test_remove_spells_while_iterating(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    spells = [OrderSpell() for _ in range(10)]
+    for spell in spells:
+        aura.add_spell(spell)
+
+    visited = []
+    for spell in aura.spells:
+        visited.append(spell)
+        aura.remove_spell(spell)
+
+    assert visited == spells
+    assert len(aura.spells) == 0
+
+
+def test_add_spells_while_iterating(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    first = OrderSpell()
+    aura.add_spell(first)
+
+    added = OrderSpell()
+    visited = []
+    for spell in aura.spells:
+        visited.append(spell)
+        aura.add_spell(added)
+
+    assert visited == [first]
+    assert list(aura.spells) == [first, added]
+
+
+def test_spell_order_kept_after_many_removals(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    spells = [OrderSpell() for _ in range(20)]
+    for spell in spells:
+        aura.add_spell(spell)
+
+    for spell in spells[::2]:
+        aura.remove_spell(spell)
+    added = OrderSpell()
+    aura.add_spell(added)
+
+    assert list(aura.spells) == spells[1::2] + [added]
+    assert len(aura.spells) == 11
+    assert spells[0] not in aura.spells
+    assert spells[1] in aura.spells
+
+
+def test_same_spell_added_twice(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    spell = OrderSpell()
+    other = OrderSpell()
+    aura.add_spell(spell)
+    aura.add_spell(other)
+    aura.add_spell(spell)
+
+    assert list(aura.spells) == [spell, other, spell]
+
+    aura.remove_spell(spell)
+
+    assert list(aura.spells) == [other, spell]
+    assert set(aura.spells.get_by_class(OrderSpell)) == {other, spell}
+
+    aura.remove_spell(spell)
+
+    assert list(aura.spells) == [other]
+    assert spell not in aura.spells
+
+
+class TimedSpell(Spell):
+    TIMED = True
+
+    def __init__(self, duration: float) -> None:
+        super().__init__(tags=[])
+        self.duration = Duration(duration)
+
+    def update(self, aura: Aura, elapsed_time: float) -> bool:
+        raise AssertionError("Timed spells are not updated by the aura")
+
+    def _update_level(self, level: int) -> None:
+        pass
+
+
+def test_timed_spell_expires_on_wheel(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    spell = TimedSpell(2.0)
+    aura.add_spell(spell)
+
+    aura.update(1.5)
+    assert spell in aura.spells
+    assert spell.duration.remaining == 0.5
+
+    aura.update(0.5)
+    assert spell not in aura.spells
+    assert len(aura.wheel) == 0
+
+
+def test_timed_spell_removed_early_cancels_timer(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    spell = TimedSpell(2.0)
+    aura.add_spell(spell)
+    aura.update(0.5)
+
+    aura.remove_spell(spell)
+
+    assert len(aura.wheel) == 0
+    assert spell.duration.is_bound is False
+    assert spell.duration.elapsed == 0.5
+
+
+def test_timed_spell_added_twice_expires_both_copies(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    spell = TimedSpell(1.0)
+    aura.add_spell(spell)
+    aura.add_spell(spell)
+
+    aura.update(1.0)
+
+    assert spell not in aura.spells
+    assert len(aura.spells) == 0
+
+
+def test_modifiers_expire_on_wheel(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    original_delay = aura.cast_delay.value
+    aura.cast_delay.modifiers.add(ValueModifier(2.0, duration=1.0))
+
+    assert len(aura.wheel) == 1
+
+    aura.update(1.0)
+
+    assert aura.cast_delay.value == original_delay
+    assert len(aura.wheel) == 0
+
+
+def test_needs_update(fixture: AuraFixture) -> None:
+    aura = fixture.aura
+    assert aura.needs_update is False
+
+    ticking = OrderSpell()
+    aura.add_spell(ticking)
+    assert aura.needs_update is True
+    aura.remove_spell(ticking)
+    assert aura.needs_update is False
+
+    aura.add_spell(TimedSpell(1.0))
+    assert aura.needs_update is True
+    aura.update(1.0)
+    assert aura.needs_update is False
+
+    aura.cast_delay.modifiers.add(ValueModifier(2.0, duration=1.0))
+    assert aura.needs_update is True
@@ -0,0 +1,122 @@
+import pytest
+from aura.aura import AuraChange, DamageEvent, HealEvent
+from aura.spell.elemental.absorb import AbsorbSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.values import ValueModifier
+from conftest import AuraFixture
+
+
+class ChangesFixture(AuraFixture):
+    def __init__(self) -> None:
+        super().__init__()
+        self.aura.magic.value = self.max_magic / 2
+        self.aura.collect_changes()
+
+
+@pytest.fixture
+def fixture() -> ChangesFixture:
+    return ChangesFixture()
+
+
+def test_new_aura_has_no_changes() -> None:
+    aura = AuraFixture().aura
+
+    assert aura.changes == 0
+    assert aura.generation == 0
+    assert aura.changes_since(-1) == AuraChange.ALL
+
+
+def test_magic_changes(fixture: ChangesFixture) -> None:
+    fixture.aura.process_event(DamageEvent(1.0))
+
+    assert fixture.aura.changes == AuraChange.MAGIC
+
+
+def test_unchanged_magic_is_not_marked(fixture: ChangesFixture) -> None:
+    aura = fixture.aura
+    aura.magic.value = aura.magic.max.value
+    aura.collect_changes()
+
+    aura.process_event(HealEvent(1.0))
+
+    assert aura.changes == 0
+
+
+def test_max_magic_modifier_changes(fixture: ChangesFixture) -> None:
+    aura = fixture.aura
+
+    aura.magic.max.modifiers.add(ValueModifier(2.0, duration=1.0))
+    assert aura.changes == AuraChange.MAX_MAGIC
+
+    aura.collect_changes()
+    aura.update(1.0)
+    assert aura.changes == AuraChange.MAX_MAGIC
+
+
+def test_spell_changes(fixture: ChangesFixture) -> None:
+    aura = fixture.aura
+
+    aura.add_spell(HasteSpell(duration=1.0, cast_delay_percentage=0.5))
+    assert aura.changes == AuraChange.SPELL_SET | AuraChange.CAST_DELAY
+
+    aura.collect_changes()
+    aura.update(1.0)
+    assert aura.changes == AuraChange.SPELL_SET | AuraChange.CAST_DELAY
+
+
+def test_ticking_spell_changes_fields(fixture: ChangesFixture) -> None:
+    aura = fixture.aura
+    aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=5.0))
+    aura.collect_changes()
+
+    aura.update(0.5)
+
+    assert aura.changes == AuraChange.SPELL_FIELDS | AuraChange.MAGIC
+
+
+def test_handled_event_changes_fields(fixture: ChangesFixture) -> None:
+    aura = fixture.aura
+    aura.add_spell(AbsorbSpell(duration=5.0))
+    aura.collect_changes()
+
+    aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=5.0))
+
+    assert aura.changes == AuraChange.SPELL_FIELDS
+
+
+def test_idle_update_has_no_changes(fixture: ChangesFixture) -> None:
+    fixture.aura.update(1.0)
+
+    assert fixture.aura.changes == 0
+
+
+def test_changes_since_generation(fixture: ChangesFixture) -> None:
+    aura = fixture.aura
+    aura.process_event(DamageEvent(1.0))
+    generation = aura.generation
+
+    aura.cast_delay.base = 5.0
+
+    assert aura.generation > generation
+    assert aura.changes_since(generation) == AuraChange.CAST_DELAY
+    assert aura.changes_since(aura.generation) == 0
+
+
+def test_generation_advances_once_between_reads(fixture: ChangesFixture) -> None:
+    aura = fixture.aura
+    generation = aura.generation
+
+    aura.process_event(DamageEvent(1.0))
+    aura.process_event(DamageEvent(1.0))
+    aura.cast_delay.base = 5.0
+
+    assert aura.generation == generation + 1
+    assert aura.changes_since(generation) == AuraChange.MAGIC | AuraChange.CAST_DELAY
+
+
+def test_collect_changes_clears_mask(fixture: ChangesFixture) -> None:
+    fixture.aura.process_event(DamageEvent(1.0))
+
+    assert fixture.aura.collect_changes() == AuraChange.MAGIC
+    assert fixture.aura.changes == 0
@@ -10,9 +10,10 @@ from aura.aura import (
     AddSpellEvent,
     RemoveSpellEvent,
     EventListener,
+    EventPool,
     Spell,
 )
-from conftest import AuraFixture, MockEventListener
+from conftest import AuraFixture, FreezingEventListener, MockEventListener
 
 
 class EventsFixture(AuraFixture):
@@ -232,3 +233,650 @@ def test_event_listeners_can_be_removed_from_list(fixture):
     fixture.aura.event_listeners.remove(listener)
 
     assert listener not in fixture.aura.event_listeners
+
+
+# Event Handler Tests
+
+
+class RecordingSpell(Spell):
+    """Records the events passed to modify_event."""
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.events: list[AuraEvent] = []
+
+    def update(self, aura: Aura, elapsed_time: float) -> bool:
+        return False
+
+    def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+        self.events.append(event)
+
+
+class HealRecordingSpell(RecordingSpell):
+    HANDLED_EVENTS = (HealEvent,)
+
+
+def test_spell_handles_event_defaults():
+    """Test which events spells handle when HANDLED_EVENTS is not declared."""
+    assert Spell.handles_event(DamageEvent) is False
+    assert RecordingSpell.handles_event(DamageEvent) is True
+    assert RecordingSpell.handles_event(AuraEvent) is True
+
+
+def test_spell_handles_declared_events():
+    """Test that declared event types and their subclasses are handled."""
+
+    class CriticalHealEvent(HealEvent):
+        pass
+
+    assert HealRecordingSpell.handles_event(HealEvent) is True
+    assert HealRecordingSpell.handles_event(CriticalHealEvent) is True
+    assert HealRecordingSpell.handles_event(DamageEvent) is False
+
+
+def test_modify_event_only_called_for_handled_events(fixture):
+    """Test that spells only receive the event types they handle."""
+    spell = HealRecordingSpell()
+    fixture.aura.add_spell(spell)
+    heal_event = HealEvent(amount=5.0)
+
+    fixture.aura.process_event(DamageEvent(amount=5.0))
+    fixture.aura.process_event(heal_event)
+
+    assert spell.events == [heal_event]
+
+
+def test_handlers_follow_spell_changes(fixture):
+    """Test that spells added or removed after an event type was processed are handled."""
+    spell = RecordingSpell()
+    fixture.aura.process_event(DamageEvent(amount=1.0))
+
+    fixture.aura.add_spell(spell)
+    first_event = DamageEvent(amount=1.0)
+    fixture.aura.process_event(first_event)
+    fixture.aura.remove_spell(spell)
+    fixture.aura.process_event(DamageEvent(amount=1.0))
+
+    assert first_event in spell.events
+    assert len([e for e in spell.events if isinstance(e, DamageEvent)]) == 1
+
+
+# Event Pool Tests
+
+
+def test_event_pool_creates_events():
+    """Test that an empty pool creates initialized, pooled events."""
+    pool = EventPool(DamageEvent)
+
+    event = pool.acquire(10.0)
+
+    assert isinstance(event, DamageEvent)
+    assert event.amount == 10.0
+    assert event.is_pooled is True
+    assert pool.created == 1
+
+
+def test_event_pool_reuses_released_events():
+    """Test that released events are reset and reused."""
+    pool = EventPool(DamageEvent)
+    event = pool.acquire(10.0)
+    event.is_canceled = True
+
+    pool.release(event)
+    reused = pool.acquire(5.0)
+
+    assert reused is event
+    assert reused.amount == 5.0
+    assert reused.is_canceled is False
+    assert pool.created == 1
+
+
+def test_event_pool_ignores_events_from_elsewhere():
+    """Test that events not acquired from the pool are not added to it."""
+    pool = EventPool(DamageEvent)
+
+    pool.release(DamageEvent(10.0))
+
+    assert len(pool) == 0
+
+
+def test_freeze_unpooled_event_returns_same_event():
+    """Test that freezing an event that is not pooled returns it unchanged."""
+    event = HealEvent(amount=5.0)
+
+    assert event.freeze() is event
+
+
+def test_freeze_pooled_event_returns_copy():
+    """Test that freezing a pooled event returns an independent copy."""
+    pool = EventPool(HealEvent)
+    event = pool.acquire(5.0)
+
+    frozen = event.freeze()
+    pool.release(event)
+    pool.acquire(1.0)
+
+    assert frozen is not event
+    assert frozen.is_pooled is False
+    assert frozen.amount == 5.0
+
+
+def test_process_event_releases_pooled_event(fixture):
+    """Test that the aura releases pooled events after processing them."""
+    listener = FreezingEventListener()
+    fixture.aura.event_listeners.append(listener)
+    event = fixture.aura.acquire_event(DamageEvent, 10.0)
+
+    fixture.aura.process_event(event)
+
+    assert event.is_pooled is False
+    assert len(fixture.aura.event_pool(DamageEvent)) == 1
+    assert listener.last_event is not event
+    assert listener.last_event.amount == 10.0
+
+
+def test_process_event_releases_canceled_pooled_event(fixture):
+    """Test that canceled pooled events are released as well."""
+
+    class CancelingSpell(Spell):
+        HANDLED_EVENTS = (DamageEvent,)
+
+        def __init__(self):
+            super().__init__([])
+
+        def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+            event.is_canceled = True
+
+    fixture.aura.add_spell(CancelingSpell())
+
+    fixture.aura.process_event(fixture.aura.acquire_event(DamageEvent, 10.0))
+
+    assert len(fixture.aura.event_pool(DamageEvent)) == 1
+
+
+def test_damage_over_time_reuses_events(fixture):
+    """Test that a damage over time spell stops allocating events once warmed up."""
+    from aura.spell.elemental.ignite import IgniteSpell
+
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=100.0))
+
+    for _ in range(50):
+        fixture.aura.update(0.1)
+
+    assert fixture.aura.event_pool(DamageEvent).created == 1
+
+
+# Event Queue Tests
+
+
+class ChainingListener(EventListener):
+    """Raises a new damage event for every damage event it receives."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.received = 0
+
+    def on_spell_event(self, aura: Aura, event: AuraEvent) -> None:
+        if isinstance(event, DamageEvent):
+            self.received += 1
+            if self.received < self.limit:
+                aura.process_event(DamageEvent(amount=0.0))
+
+
+def test_events_raised_during_processing_are_queued(fixture):
+    """Test that events raised while processing an event are handled after it."""
+    first = DamageEvent(amount=1.0)
+    second = HealEvent(amount=1.0)
+
+    class ReactingSpell(Spell):
+        HANDLED_EVENTS = (DamageEvent,)
+
+        def __init__(self) -> None:
+            super().__init__([])
+
+        def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+            aura.process_event(second)
+            # The heal has not been applied yet
+            assert not fixture.listener.was_event_received(aura, second)
+
+    fixture.aura.add_spell(ReactingSpell())
+    fixture.listener.events.clear()
+
+    fixture.aura.process_event(first)
+
+    assert [event for _, event in fixture.listener.events] == [first, second]
+
+
+def test_event_chains_do_not_recurse(fixture):
+    """Test that long chains of events do not grow the call stack."""
+    listener = ChainingListener(limit=5000)
+    fixture.aura.event_listeners.append(listener)
+    fixture.aura.max_events_per_drain = 10000
+
+    fixture.aura.process_event(DamageEvent(amount=0.0))
+
+    assert listener.received == 5000
+    assert fixture.aura.pending_events == 0
+
+
+def test_event_queue_drain_is_capped(fixture):
+    """Test that events past the drain cap stay queued until the next drain."""
+    listener = ChainingListener(limit=25)
+    fixture.aura.event_listeners.append(listener)
+    fixture.aura.max_events_per_drain = 10
+
+    fixture.aura.process_event(DamageEvent(amount=0.0))
+
+    assert listener.received == 10
+    assert fixture.aura.pending_events == 1
+
+    fixture.aura.update(0.0)
+
+    assert listener.received == 20
+    assert fixture.aura.pending_events == 1
+
+
+def test_damage_from_spell_updates_is_coalesced(fixture):
+    """Test that damage over time from several spells is applied as one event."""
+    from aura.spell.elemental.ignite import IgniteSpell
+
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=5.0))
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=20.0, duration=5.0))
+    fixture.listener.events.clear()
+    initial_magic = fixture.aura.magic.value
+
+    fixture.aura.update(1.0)
+
+    damage_events = [
+        e for _, e in fixture.listener.events if isinstance(e, DamageEvent)
+    ]
+    assert len(damage_events) == 1
+    assert damage_events[0].amount == 30.0
+    assert fixture.aura.magic.value == initial_magic - 30.0
+
+
+def test_damage_coalescing_can_be_disabled(fixture):
+    """Test that damage events are kept separate when coalescing is disabled."""
+    from aura.spell.elemental.ignite import IgniteSpell
+
+    fixture.aura.coalesce_damage = False
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=5.0))
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=20.0, duration=5.0))
+    fixture.listener.events.clear()
+
+    fixture.aura.update(1.0)
+
+    damage_events = [
+        e for _, e in fixture.listener.events if isinstance(e, DamageEvent)
+    ]
+    assert [event.amount for event in damage_events] == [10.0, 20.0]
+
+
+def test_instant_damage_during_an_update_is_not_coalesced(fixture):
+    """Test that only damage over time is merged, not the instant hits of the same
+    update."""
+    from aura.spell.elemental.ignite import IgniteSpell
+    from aura.spell.elemental.rock import RockSpell
+
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=5.0))
+    fixture.aura.add_spell(RockSpell(damage=5.0))
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=20.0, duration=5.0))
+    listener = FreezingEventListener()
+    fixture.aura.event_listeners.append(listener)
+
+    fixture.aura.update(1.0)
+
+    damage_events = [e for _, e in listener.events if isinstance(e, DamageEvent)]
+    assert [event.amount for event in damage_events] == [30.0, 5.0]
+
+
+def test_expiring_spell_applies_to_events_of_its_last_update(fixture):
+    """Test that a spell expiring during an update still modifies the events raised
+    by the spells updated after it."""
+    from aura.spell.elemental.ignite import IgniteSpell
+    from aura.spell.elemental.vulnerable import VulnerableSpell
+
+    vulnerable = VulnerableSpell(damage_multiplier=2.0, duration=0.1)
+    fixture.aura.add_spell(vulnerable)
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=5.0))
+    initial_magic = fixture.aura.magic.value
+
+    fixture.aura.update(0.1)
+
+    assert fixture.aura.magic.value == pytest.approx(initial_magic - 2.0)
+    assert vulnerable not in fixture.aura.spells
+
+
+def test_timed_multiplier_applies_to_events_of_its_last_update(fixture):
+    """Test that a TIMED multiplier expired by the timing wheel still modifies the
+    events of the update that expires it."""
+    from aura.spell.ambient_magic_regen import AmbientMagicRegenSpell
+    from aura.spell.elemental.charge import ChargeSpell
+    from aura.spell.elemental.ignite import IgniteSpell
+    from aura.spell.elemental.shock import ShockSpell
+
+    fixture.aura.coalesce_damage = False
+    charge = ChargeSpell(healing_multiplier=3.0, duration=0.1)
+    shock = ShockSpell(heal_reduction_percentage=0.5, duration=0.1)
+    fixture.aura.magic.value = 0.0
+    for spell in (charge, shock):
+        fixture.aura.add_spell(spell)
+    fixture.aura.add_spell(AmbientMagicRegenSpell(amount_per_second=10.0))
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=5.0, duration=5.0))
+
+    fixture.aura.update(0.1)
+
+    # Healing of 1.0 tripled and halved, less 0.5 of Ignite damage
+    assert fixture.aura.magic.value == pytest.approx(1.0)
+    assert charge not in fixture.aura.spells
+    assert shock not in fixture.aura.spells
+
+
+def test_removing_a_removed_spell_is_ignored(fixture):
+    """Test that queued removals of a spell that is already gone do nothing."""
+    fixture.aura.add_spell(fixture.dummy_spell)
+    fixture.aura.remove_spell(fixture.dummy_spell)
+    fixture.listener.events.clear()
+
+    fixture.aura.remove_spell(fixture.dummy_spell)
+
+    assert len(fixture.aura.spells) == 0
+    assert fixture.listener.events == []
+
+
+# Spell Batch Tests
+
+
+class BatchListener(EventListener):
+    def __init__(self) -> None:
+        self.batches = []
+
+    def on_spell_events(self, aura: Aura, events: list[AuraEvent]) -> None:
+        self.batches.append(list(events))
+
+
+class CancelAddSpell(Spell):
+    """Cancels adding the spells it was given."""
+
+    HANDLED_EVENTS = (AddSpellEvent,)
+
+    def __init__(self, *canceled: Spell) -> None:
+        super().__init__([])
+        self.canceled = canceled
+        self.seen = []
+
+    def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+        self.seen.append(event.spell)
+        if event.spell in self.canceled:
+            event.is_canceled = True
+
+
+def test_add_spells_adds_and_starts_each_spell(fixture):
+    """Test that add_spells adds every spell and notifies listeners of each."""
+    started = []
+
+    class StartedSpell(Spell):
+        def start(self, aura: Aura) -> None:
+            started.append(self)
+
+    spells = [StartedSpell([]), StartedSpell([]), StartedSpell([])]
+
+    fixture.aura.add_spells(spells)
+
+    assert list(fixture.aura.spells) == spells
+    assert started == spells
+    assert [event.spell for _, event in fixture.listener.events] == spells
+
+
+def test_add_spells_cancels_each_event_separately(fixture):
+    """Test that a spell canceling one event of a batch leaves the others."""
+    kept = Spell([])
+    canceled = Spell([])
+    blocker = CancelAddSpell(canceled)
+    fixture.aura.add_spell(blocker)
+    batch_listener = BatchListener()
+    fixture.aura.event_listeners.append(batch_listener)
+
+    fixture.aura.add_spells([canceled, kept])
+
+    assert list(fixture.aura.spells) == [blocker, kept]
+    assert [[event.spell for event in batch] for batch in batch_listener.batches] == [
+        [kept]
+    ]
+
+
+def test_spells_of_a_batch_do_not_modify_its_events(fixture):
+    """Test that the events of a batch pass through the spells active before it."""
+    other = Spell([])
+    blocker = CancelAddSpell(other)
+
+    fixture.aura.add_spells([blocker, other])
+
+    assert list(fixture.aura.spells) == [blocker, other]
+    assert blocker.seen == []
+
+
+def test_remove_spells_ignores_missing_spells(fixture):
+    """Test that remove_spells removes active spells and skips the others."""
+    first = Spell([])
+    second = Spell([])
+    fixture.aura.add_spells([first, second])
+    batch_listener = BatchListener()
+    fixture.aura.event_listeners.append(batch_listener)
+
+    fixture.aura.remove_spells([first, Spell([]), second, first])
+
+    assert len(fixture.aura.spells) == 0
+    assert len(batch_listener.batches) == 1
+    assert [event.spell for event in batch_listener.batches[0]] == [first, second]
+
+
+def test_empty_batches_do_nothing(fixture):
+    """Test that empty batches raise no events."""
+    batch_listener = BatchListener()
+    fixture.aura.event_listeners.append(batch_listener)
+
+    fixture.aura.add_spells([])
+    fixture.aura.remove_spells(iter(()))
+
+    assert batch_listener.batches == []
+    assert fixture.aura.pending_events == 0
+
+
+def test_batch_raised_during_processing_is_queued(fixture):
+    """Test that a batch raised while processing an event is handled after it."""
+    added = [Spell([]), Spell([])]
+
+    class BatchingSpell(Spell):
+        HANDLED_EVENTS = (DamageEvent,)
+
+        def __init__(self) -> None:
+            super().__init__([])
+
+        def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+            aura.add_spells(added)
+            assert added[0] not in aura.spells
+
+    fixture.aura.add_spell(BatchingSpell())
+    fixture.listener.events.clear()
+    damage = DamageEvent(amount=1.0)
+
+    fixture.aura.process_event(damage)
+
+    assert [event for _, event in fixture.listener.events][0] is damage
+    assert [event.spell for _, event in fixture.listener.events[1:]] == added
+
+
+def test_batch_metrics(fixture):
+    """Test that batched events are counted like single events."""
+    from aura.metrics import AuraMetrics
+
+    metrics = AuraMetrics()
+    fixture.aura.metrics = metrics
+    canceled = Spell([])
+    fixture.aura.add_spell(CancelAddSpell(canceled))
+
+    fixture.aura.add_spells([Spell([]), canceled])
+
+    assert metrics.events[AddSpellEvent] == 3
+    assert metrics.canceled[AddSpellEvent] == 1
+    assert metrics.canceled_by[CancelAddSpell] == 1
+    assert metrics.spells_added == 2
+    assert metrics.spells_absorbed == 1
+
+
+# Multiplier Chain Tests
+
+
+class PureMultiplierSpell(Spell):
+    """Doubles damage per level, counting the calls to modify_event."""
+
+    PURE_MULTIPLIER = True
+    HANDLED_EVENTS = (DamageEvent,)
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.calls = 0
+
+    def event_multiplier(self, event_type: type) -> float:
+        return 2.0 * self.level
+
+    def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+        self.calls += 1
+        event.amount *= self.event_multiplier(type(event))
+
+    def _update_level(self, level: int) -> None:
+        pass
+
+
+class AmountRecordingSpell(Spell):
+    HANDLED_EVENTS = (DamageEvent,)
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.amounts = []
+
+    def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+        self.amounts.append(event.amount)
+
+
+def test_pure_multipliers_are_folded(fixture):
+    """Test that pure multipliers scale events without modify_event calls."""
+    first = PureMultiplierSpell()
+    second = PureMultiplierSpell()
+    recording = AmountRecordingSpell()
+    fixture.aura.add_spell(recording)
+    fixture.aura.add_spell(first)
+    fixture.aura.add_spell(second)
+    event = DamageEvent(amount=1.0)
+
+    fixture.aura.process_event(event)
+
+    assert event.amount == 4.0
+    # Stateful handlers see the amount after the multipliers
+    assert recording.amounts == [4.0]
+    assert first.calls == 0
+    assert second.calls == 0
+
+
+def test_folded_factor_follows_level_changes(fixture):
+    """Test that changing the level of a pure multiplier refolds the factor."""
+    spell = PureMultiplierSpell()
+    fixture.aura.add_spell(spell)
+    fixture.aura.process_event(DamageEvent(amount=1.0))
+
+    spell.level = 3
+    event = DamageEvent(amount=1.0)
+    fixture.aura.process_event(event)
+
+    assert event.amount == 6.0
+
+
+def test_folded_factor_follows_spell_changes(fixture):
+    """Test that adding and removing pure multipliers refolds the factor."""
+    spell = PureMultiplierSpell()
+    fixture.aura.add_spell(spell)
+    fixture.aura.process_event(DamageEvent(amount=1.0))
+
+    fixture.aura.remove_spell(spell)
+    event = DamageEvent(amount=1.0)
+    fixture.aura.process_event(event)
+
+    assert event.amount == 1.0
+
+
+def test_multiplier_changed_refolds_the_factor(fixture):
+    """Test that multiplier_changed invalidates the folded factors."""
+    from aura.spell.elemental.earth_shield import EarthShieldSpell
+    from aura.spell.elemental.vulnerable import VulnerableSpell
+
+    fixture.aura.add_spell(VulnerableSpell(damage_multiplier=2.0, duration=10.0))
+    before = DamageEvent(amount=1.0)
+    fixture.aura.process_event(before)
+    fixture.aura.add_spell(EarthShieldSpell(reduction=0.5, max_hits=3, duration=10.0))
+
+    # Removes the shield, which turns the damage multiplier off
+    fixture.aura.update(0.1)
+    after = DamageEvent(amount=1.0)
+    fixture.aura.process_event(after)
+
+    assert before.amount == 2.0
+    assert after.amount == 1.0
+
+
+def test_assigning_a_multiplier_field_refolds_the_factor(fixture):
+    """Test that assigning the factor of a built-in multiplier is picked up."""
+    from aura.spell.elemental.charge import ChargeSpell
+
+    spell = ChargeSpell(healing_multiplier=2.0, duration=10.0)
+    fixture.aura.add_spell(spell)
+    fixture.aura.process_event(HealEvent(amount=1.0))
+
+    spell.healing_multiplier = 3.0
+    event = HealEvent(amount=1.0)
+    fixture.aura.process_event(event)
+
+    assert event.amount == 3.0
+
+
+def test_multiplier_changes_only_refold_their_chains(fixture):
+    """Test that a multiplier changing in one aura leaves the factors of others."""
+    other = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    changed = PureMultiplierSpell()
+    kept = PureMultiplierSpell()
+    fixture.aura.add_spell(changed)
+    other.add_spell(kept)
+    fixture.aura.process_event(DamageEvent(amount=1.0))
+    other.process_event(DamageEvent(amount=1.0))
+    chain = other._handlers[DamageEvent]
+    factor = chain.factor
+
+    changed.level = 2
+    assert not chain.refresh()
+
+    assert chain.factor is factor
+    assert fixture.aura._handlers[DamageEvent].refresh()
+
+
+class PingEvent(AuraEvent):
+    """An event without an amount."""
+
+
+class AnyEventMultiplierSpell(PureMultiplierSpell):
+    HANDLED_EVENTS = (AuraEvent,)
+
+
+def test_pure_multipliers_skip_events_without_amount(fixture):
+    """Test that multipliers handling every event pass the ones without an amount."""
+    fixture.aura.add_spell(AnyEventMultiplierSpell())
+    listener = MockEventListener()
+    fixture.aura.event_listeners.append(listener)
+    ping = PingEvent()
+    damage = DamageEvent(amount=1.0)
+
+    fixture.aura.process_event(ping)
+    fixture.aura.process_event(damage)
+
+    assert listener.was_event_received(fixture.aura, ping)
+    assert listener.was_event_received(fixture.aura, damage)
+    assert damage.amount == 2.0
@@ -1,7 +1,10 @@
 import random
 
 import pytest
-from aura.aura import Aura, Spell
+from aura.aura import Aura, AuraEvent, DamageEvent, HealEvent, Spell
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ignite import IgniteSpell
 from conftest import AuraFixture
 
 
@@ -77,3 +80,110 @@ def test_remove_spell_calls_stop(fixture: AuraFixture) -> None:
     aura.remove_spell(test_spell)
 
     assert test_spell.stopped is True
+
+
+def test_built_in_spells_have_no_instance_dict() -> None:
+    from aura.bench.memory import LOADOUT
+
+    for create_spell in LOADOUT:
+        spell = create_spell()
+        assert not hasattr(spell, "__dict__"), type(spell).__name__
+
+
+def test_subclass_without_slots_can_add_attributes() -> None:
+    spell = LifecycleTrackingSpell()
+
+    spell.custom_attribute = 42
+
+    assert spell.custom_attribute == 42
+
+
+class HealingSpell(Spell):
+    HANDLED_EVENTS = (HealEvent,)
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.events: list[AuraEvent] = []
+
+    def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+        self.events.append(event)
+
+    def _update_level(self, level: int) -> None:
+        pass
+
+
+def test_overriding_modify_event_resets_handled_events(fixture: AuraFixture) -> None:
+    class AnyEventSpell(HealingSpell):
+        def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+            self.events.append(event)
+
+    class DamageOnlySpell(HealingSpell):
+        HANDLED_EVENTS = (DamageEvent,)
+
+        def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+            self.events.append(event)
+
+    spells = [HealingSpell(), AnyEventSpell(), DamageOnlySpell()]
+    for spell in spells:
+        fixture.aura.add_spell(spell)
+    for spell in spells:
+        spell.events.clear()
+    damage = DamageEvent(1.0)
+    heal = HealEvent(1.0)
+
+    fixture.aura.process_event(damage)
+    fixture.aura.process_event(heal)
+
+    assert [spell.events for spell in spells] == [[heal], [damage, heal], [damage]]
+
+
+def test_overriding_update_resets_timed(fixture: AuraFixture) -> None:
+    class CountingHasteSpell(HasteSpell):
+        updates = 0
+
+        def update(self, aura: Aura, elapsed_time: float) -> bool:
+            CountingHasteSpell.updates += 1
+            return super().update(aura, elapsed_time)
+
+    assert HasteSpell.TIMED
+    assert not CountingHasteSpell.TIMED
+    fixture.aura.add_spell(CountingHasteSpell(duration=1.0, cast_delay_percentage=0.5))
+
+    fixture.aura.update(0.5)
+    fixture.aura.update(0.5)
+    fixture.aura.update(0.5)
+
+    assert CountingHasteSpell.updates == 2
+    assert len(fixture.aura.spells) == 0
+
+
+def test_overriding_modify_event_resets_pure_multiplier(fixture: AuraFixture) -> None:
+    class BoostedChargeSpell(ChargeSpell):
+        def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+            super().modify_event(aura, event)
+            event.amount += 1.0
+
+    assert ChargeSpell.PURE_MULTIPLIER
+    assert not BoostedChargeSpell.PURE_MULTIPLIER
+    fixture.aura.add_spell(BoostedChargeSpell(healing_multiplier=2.0, duration=1.0))
+    heal = HealEvent(1.0)
+
+    fixture.aura.process_event(heal)
+
+    assert heal.amount == 3.0
+
+
+def test_overriding_update_resets_damage_over_time() -> None:
+    class LoggingIgniteSpell(IgniteSpell):
+        def update(self, aura: Aura, elapsed_time: float) -> bool:
+            return super().update(aura, elapsed_time)
+
+    class TickingIgniteSpell(IgniteSpell):
+        DAMAGE_OVER_TIME = True
+
+        def update(self, aura: Aura, elapsed_time: float) -> bool:
+            return super().update(aura, elapsed_time)
+
+    assert IgniteSpell.DAMAGE_OVER_TIME
+    assert not LoggingIgniteSpell.DAMAGE_OVER_TIME
+    assert TickingIgniteSpell.DAMAGE_OVER_TIME
@@ -0,0 +1,46 @@
+import pytest
+from aura.aura import Aura, Spell
+from aura.bench.memory import (
+    ALLOCATION_BUDGETS,
+    LOADOUT,
+    STEADY_LOADOUTS,
+    bytes_per_spell,
+    bytes_per_value_modifier,
+    update_allocations,
+)
+
+
+class AllocatingSpell(Spell):
+    """Builds a list every update, the kind of regression the budgets catch."""
+
+    def __init__(self) -> None:
+        super().__init__(tags=[])
+
+    def update(self, aura: Aura, elapsed_time: float) -> bool:
+        expired = [spell for spell in aura.spells if spell is not self]
+        return len(expired) < 0
+
+
+@pytest.mark.parametrize("name", sorted(STEADY_LOADOUTS))
+def test_update_allocation_budget(name: str) -> None:
+    allocations = update_allocations(STEADY_LOADOUTS[name], ticks=120)
+
+    assert allocations["peak_bytes_per_tick"] <= ALLOCATION_BUDGETS[name]
+
+
+def test_per_update_allocation_is_detected() -> None:
+    allocations = update_allocations([LOADOUT[1], AllocatingSpell], ticks=20)
+
+    assert allocations["peak_bytes_per_tick"] > 0
+
+
+def test_bytes_per_spell_type() -> None:
+    sizes = bytes_per_spell(samples=20)
+
+    assert len(sizes) == len(LOADOUT)
+    assert "RegenSpell" in sizes
+    assert all(size > 0 for size in sizes.values())
+
+
+def test_bytes_per_value_modifier() -> None:
+    assert bytes_per_value_modifier(samples=20) > 0
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+from aura.bench.regression import (
+    BENCHMARKS,
+    DEFAULT_BASELINE,
+    BenchmarkStats,
+    compare,
+    load_baseline,
+    measure,
+    run_suite,
+    save_baseline,
+)
+
+
+def test_stats_are_robust_to_outliers() -> None:
+    stats = BenchmarkStats([10.0, 11.0, 9.0, 10.0, 1000.0])
+
+    assert stats.median == 10.0
+    assert stats.mad == 1.0
+    assert stats.noise == pytest.approx(1.4826)
+
+
+def test_normalized_stats() -> None:
+    stats = BenchmarkStats([10.0, 20.0, 30.0])
+
+    normalized = stats.normalized(BenchmarkStats([5.0, 5.0, 5.0]))
+
+    assert normalized.samples == [2.0, 4.0, 6.0]
+    assert normalized.median == 4.0
+
+
+def test_measure_counts_time_per_operation() -> None:
+    stats = measure(lambda: None, operations=4, repeats=3, min_time=0.0001)
+
+    assert len(stats.samples) == 3
+    assert stats.median > 0
+
+
+def test_compare_flags_slowdown_past_threshold() -> None:
+    results = {
+        "steady": BenchmarkStats([1.1, 1.0, 1.2]),
+        "slower": BenchmarkStats([2.0, 2.1, 1.9]),
+        "new": BenchmarkStats([1.0]),
+    }
+
+    regressions = {
+        result.name: result
+        for result in compare(results, {"steady": 1.0, "slower": 1.0}, 1.5)
+    }
+
+    assert sorted(regressions) == ["slower", "steady"]
+    assert not regressions["steady"].regressed
+    assert regressions["slower"].regressed
+    assert regressions["slower"].ratio == pytest.approx(2.0)
+
+
+def test_compare_tolerates_noise() -> None:
+    noisy = BenchmarkStats([1.0, 1.6, 2.2])
+
+    (result,) = compare({"noisy": noisy}, {"noisy": 1.0}, 1.5)
+
+    assert result.ratio > 1.5
+    assert not result.regressed
+
+
+def test_baseline_round_trip(tmp_path) -> None:
+    path = str(tmp_path / "baseline.json")
+
+    save_baseline(path, {"a": BenchmarkStats([1.0, 3.0, 2.0])}, 1.25)
+
+    assert load_baseline(path) == ({"a": 2.0}, 1.25)
+
+
+def test_default_baseline_outside_project_root(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    baseline, threshold = load_baseline(DEFAULT_BASELINE)
+
+    assert {benchmark.name for benchmark in BENCHMARKS} <= set(baseline)
+    assert threshold > 1.0
+
+
+def test_load_invalid_baseline(tmp_path) -> None:
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"threshold": 1.5}))
+
+    with pytest.raises(ValueError):
+        load_baseline(str(path))
+
+
+def test_world_update_scales_linearly() -> None:
+    """Test that the cost per aura of a world tick holds up to 50k auras."""
+    small, large = run_suite(
+        ["world/auras=1000,spells=1", "world/auras=50000,spells=1"],
+        repeats=3,
+        min_time=0.0001,
+    ).values()
+
+    assert large.median < small.median * 2.5
+
+
+def test_run_suite_selected_benchmarks() -> None:
+    names = [BENCHMARKS[0].name, "combo/check"]
+
+    results = run_suite(names, repeats=3, min_time=0.0001)
+
+    assert list(results) == names
+    for stats in results.values():
+        assert stats.median > 0
+
+
+def test_run_suite_unknown_benchmark() -> None:
+    with pytest.raises(ValueError):
+        run_suite(["missing"])
+
+
+def test_benchmark_names_are_unique() -> None:
+    names = [benchmark.name for benchmark in BENCHMARKS]
+
+    assert len(set(names)) == len(names)
@@ -0,0 +1,190 @@
+import json
+
+import pytest
+from aura.bench.scenarios import SCENARIOS, create_scenario, run_scenario
+from aura.cli import main
+
+RUN_ARGUMENTS = ["--auras", "20", "--ticks", "3"]
+
+
+def test_bench_reports_every_scenario(capsys) -> None:
+    assert main(["bench", *RUN_ARGUMENTS, "--allocation-ticks", "2"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert sorted(report) == sorted(SCENARIOS)
+    for result in report.values():
+        assert result["ticks"] == 3
+        assert result["ticks_per_second"] > 0
+        assert "events_per_second" in result
+        assert "peak_bytes_per_tick" in result
+
+
+def test_bench_selected_scenario(tmp_path) -> None:
+    output = tmp_path / "bench.json"
+
+    main(
+        ["bench", "--scenario", "pause_storm", *RUN_ARGUMENTS, "--output", str(output)]
+    )
+
+    assert list(json.loads(output.read_text())) == ["pause_storm"]
+
+
+def test_profile_stats(capsys) -> None:
+    main(["profile", "dot_heavy", *RUN_ARGUMENTS, "--limit", "5"])
+
+    assert "cumulative" in capsys.readouterr().out
+
+
+def test_profile_collapsed_stacks(capsys) -> None:
+    main(["profile", "shield_heavy", *RUN_ARGUMENTS, "--format", "collapsed"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines
+    for line in lines:
+        stack, microseconds = line.rsplit(" ", 1)
+        assert int(microseconds) > 0
+    assert any("world:AuraWorld.update" in line for line in lines)
+
+
+def test_profile_spell_costs(capsys) -> None:
+    main(["profile", "combo_churn", *RUN_ARGUMENTS, "--format", "spells"])
+
+    output = capsys.readouterr().out
+    assert output.startswith("method")
+    assert "IgniteSpell.update" in output
+
+
+def test_profile_spell_collapsed_stacks(tmp_path) -> None:
+    output = tmp_path / "spells.folded"
+
+    main(
+        [
+            "profile",
+            "dot_heavy",
+            *RUN_ARGUMENTS,
+            "--format",
+            "spells-collapsed",
+            "--output",
+            str(output),
+        ]
+    )
+
+    for line in output.read_text().splitlines():
+        stack, microseconds = line.rsplit(" ", 1)
+        assert "." in stack
+        assert int(microseconds) > 0
+
+
+def test_simulate_scenario_file(tmp_path, capsys) -> None:
+    scenario_file = tmp_path / "scenario.json"
+    scenario_file.write_text(
+        json.dumps({"scenario": "combo_churn", "auras": 30, "ticks": 4, "seed": 3})
+    )
+
+    main(["simulate", str(scenario_file)])
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["scenario"] == "combo_churn"
+    assert report["auras"] == 30
+    assert report["ticks"] == 4
+
+
+@pytest.mark.parametrize(
+    "content", ["not json", '{"auras": 10}', '{"scenario": "dot_heavy", "speed": 2}']
+)
+def test_simulate_invalid_scenario_file(tmp_path, content: str) -> None:
+    scenario_file = tmp_path / "scenario.json"
+    scenario_file.write_text(content)
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["simulate", str(scenario_file)])
+
+    assert exit_info.value.code == 2
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_scenarios_are_reproducible(name: str) -> None:
+    first = create_scenario(name, aura_count=25, seed=4)
+    second = create_scenario(name, aura_count=25, seed=4)
+
+    run = run_scenario(first, ticks=10)
+    run_scenario(second, ticks=10)
+
+    assert run.events > 0
+    assert [aura.magic.value for aura in first.auras] == [
+        aura.magic.value for aura in second.auras
+    ]
+    assert [len(aura.spells) for aura in first.auras] == [
+        len(aura.spells) for aura in second.auras
+    ]
+
+
+PERF_ARGUMENTS = [
+    "--benchmark",
+    "combo/check",
+    "--repeats",
+    "3",
+    "--min-time",
+    "0.0001",
+]
+
+
+def test_perf_update_then_check(tmp_path, capsys) -> None:
+    baseline = str(tmp_path / "baseline.json")
+    assert main(["perf", *PERF_ARGUMENTS, "--baseline", baseline, "--update"]) == 0
+    capsys.readouterr()
+
+    status = main(
+        ["perf", *PERF_ARGUMENTS, "--baseline", baseline, "--threshold", "100"]
+    )
+
+    report = json.loads(capsys.readouterr().out)
+    assert status == 0
+    assert report["combo/check"]["regressed"] is False
+    assert report["combo/check"]["baseline"] > 0
+
+
+def test_perf_fails_on_regression(tmp_path, capsys) -> None:
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"benchmarks": {"combo/check": 1e-9}}))
+
+    status = main(["perf", *PERF_ARGUMENTS, "--baseline", str(baseline)])
+
+    assert status == 1
+    assert json.loads(capsys.readouterr().out)["combo/check"]["regressed"] is True
+
+
+def test_perf_missing_baseline(tmp_path) -> None:
+    with pytest.raises(SystemExit):
+        main(["perf", *PERF_ARGUMENTS, "--baseline", str(tmp_path / "missing.json")])
+
+
+def test_unknown_scenario() -> None:
+    with pytest.raises(ValueError):
+        create_scenario("missing")
+
+
+def test_script_entry_point(monkeypatch, capsys) -> None:
+    import aura
+
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "aura",
+            "bench",
+            "--scenario",
+            "dot_heavy",
+            "--auras",
+            "5",
+            "--ticks",
+            "1",
+            "--allocation-ticks",
+            "1",
+        ],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        aura.main()
+
+    assert exit_info.value.code == 0
+    assert "dot_heavy" in json.loads(capsys.readouterr().out)
@@ -62,3 +62,10 @@ class MockEventListener(EventListener):
         if self.events:
             return self.events[-1][1]
         return None
+
+
+class FreezingEventListener(MockEventListener):
+    """Keeps frozen copies of the events, which may be pooled and reused."""
+
+    def on_spell_event(self, aura: Aura, event: AuraEvent) -> None:
+        self.events.append((aura, event.freeze()))
@@ -0,0 +1,173 @@
+import struct
+
+import pytest
+from aura.aura import Aura, AuraEvent, DamageEvent, HealEvent
+from aura.journal import JournalReader, JournalRecorder, state_hash
+from aura.snapshot import pack_auras
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.shock import ShockSpell
+from aura.values import ValueModifier
+from conftest import AuraFixture, NoopSpell
+
+TICKS = 40
+KEYFRAME_INTERVAL = 8
+
+
+class JournalFixture:
+    def __init__(self, path, compress: bool = False) -> None:
+        self.path = str(path / "journal.bin")
+        self.auras: list[Aura] = [AuraFixture().aura for _ in range(3)]
+        # Uneven clocks and modifiers make the keyframes anchor durations
+        self.auras[0].magic.max.modifiers.add(ValueModifier(1.5, duration=0.35))
+        self.auras[1].update(0.123)
+        self.states: list[bytes] = []
+        with JournalRecorder(
+            self.path, self.auras, KEYFRAME_INTERVAL, compress
+        ) as recorder:
+            self.states.append(pack_auras(self.auras))
+            for tick in range(TICKS):
+                self.record_tick(recorder, tick)
+                recorder.update(0.1)
+                self.states.append(pack_auras(self.auras))
+        self.final_hash = state_hash(self.auras)
+
+    def record_tick(self, recorder: JournalRecorder, tick: int) -> None:
+        first, second, third = self.auras
+        recorder.process_event(first, DamageEvent(0.5 + tick % 3))
+        recorder.process_event(second, HealEvent(1.25))
+        if tick % 10 == 0:
+            recorder.add_spell(first, IgniteSpell(damage_per_second=2.0, duration=0.7))
+            recorder.add_spell(
+                second, HasteSpell(duration=0.45, cast_delay_percentage=0.5)
+            )
+            recorder.add_spell(third, RegenSpell(regen_rate=3.0, duration=2.0))
+        if tick % 10 == 3:
+            recorder.add_spell(
+                second, ChargeSpell(healing_multiplier=2.0, duration=0.3)
+            )
+            recorder.remove_spell(third, next(iter(third.spells)))
+        if tick % 7 == 0:
+            recorder.cast_spell(
+                first, ShockSpell(heal_reduction_percentage=0.5, duration=1.0)
+            )
+
+
+@pytest.fixture
+def fixture(tmp_path) -> JournalFixture:
+    return JournalFixture(tmp_path)
+
+
+def test_replay_matches_recording(fixture: JournalFixture) -> None:
+    with JournalReader(fixture.path) as reader:
+        result = reader.replay()
+
+    assert reader.tick_count == TICKS
+    assert reader.final_hash == fixture.final_hash
+    assert result.ticks == TICKS
+    assert result.entries > TICKS
+    assert result.entries_per_second > 0
+    assert pack_auras(result.auras) == fixture.states[-1]
+
+
+def test_keyframes(fixture: JournalFixture) -> None:
+    with JournalReader(fixture.path) as reader:
+        assert reader.keyframes == list(range(0, TICKS + 1, KEYFRAME_INTERVAL))
+
+
+@pytest.mark.parametrize("tick", [0, 5, KEYFRAME_INTERVAL, 21, TICKS])
+def test_seek(fixture: JournalFixture, tick: int) -> None:
+    with JournalReader(fixture.path) as reader:
+        auras = reader.seek(tick)
+
+    assert pack_auras(auras) == fixture.states[tick]
+
+
+def test_replay_range(fixture: JournalFixture) -> None:
+    with JournalReader(fixture.path) as reader:
+        result = reader.replay(start=5, stop=30)
+
+    assert result.ticks == 25
+    assert pack_auras(result.auras) == fixture.states[30]
+
+
+def test_compressed_journal(tmp_path) -> None:
+    fixture = JournalFixture(tmp_path, compress=True)
+
+    with JournalReader(fixture.path) as reader:
+        result = reader.replay()
+
+    assert pack_auras(result.auras) == fixture.states[-1]
+
+
+def test_replay_detects_divergence(fixture: JournalFixture) -> None:
+    with open(fixture.path, "rb") as file:
+        data = file.read()
+    recorded = struct.pack("<BId", 2, 0, 1.5)
+    assert recorded in data
+    with open(fixture.path, "wb") as file:
+        file.write(data.replace(recorded, struct.pack("<BId", 2, 0, 1.75), 1))
+
+    with JournalReader(fixture.path) as reader:
+        with pytest.raises(ValueError):
+            reader.replay()
+        # Seeking does not verify
+        reader.seek(TICKS)
+
+
+def test_replay_detects_final_state_mismatch(fixture: JournalFixture) -> None:
+    with open(fixture.path, "r+b") as file:
+        file.seek(-12, 2)
+        file.write(bytes(8))
+
+    with JournalReader(fixture.path) as reader:
+        with pytest.raises(ValueError):
+            reader.replay()
+        reader.replay(verify=False)
+
+
+def test_journal_without_index(fixture: JournalFixture) -> None:
+    with open(fixture.path, "rb") as file:
+        data = file.read()
+    # Cut into the last chunk, as if the recording stopped while writing it
+    index_offset = struct.unpack_from("<Q", data, len(data) - 28)[0]
+    with open(fixture.path, "wb") as file:
+        file.write(data[: index_offset - 4])
+
+    with JournalReader(fixture.path) as reader:
+        assert reader.tick_count is None
+        assert reader.keyframes == list(range(0, TICKS, KEYFRAME_INTERVAL))
+        result = reader.replay()
+
+    # The entries of the last complete chunk reach the final tick
+    assert pack_auras(result.auras) == fixture.states[TICKS]
+    with JournalReader(fixture.path) as reader:
+        with pytest.raises(ValueError):
+            reader.seek(TICKS + 1)
+
+
+def test_record_unsupported_event(tmp_path) -> None:
+    aura = AuraFixture().aura
+    with JournalRecorder(str(tmp_path / "journal.bin"), [aura]) as recorder:
+        with pytest.raises(ValueError):
+            recorder.process_event(aura, AuraEvent())
+        with pytest.raises(ValueError):
+            recorder.add_spell(aura, NoopSpell(tags=[]))
+        recorder.process_event(aura, DamageEvent(1.0))
+        recorder.update(0.1)
+
+    with JournalReader(str(tmp_path / "journal.bin")) as reader:
+        result = reader.replay()
+
+    assert len(result.auras[0].spells) == 0
+    assert result.entries == 2
+
+
+def test_read_other_file(tmp_path) -> None:
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"NOPE" + bytes(40))
+
+    with pytest.raises(ValueError):
+        JournalReader(str(path))
@@ -0,0 +1,201 @@
+import pytest
+from aura.aura import AddSpellEvent, Aura, DamageEvent, HealEvent, RemoveSpellEvent
+from aura.metrics import AuraMetrics, LogHistogram
+from aura.spell.combo.combo import SpellCombinations
+from aura.spell.combo.combust import CombustCombination
+from aura.spell.elemental.absorb import AbsorbSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.vulnerable import VulnerableSpell
+from aura.world import AuraWorld
+
+
+class MetricsFixture:
+    def __init__(self) -> None:
+        self.aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+        self.metrics = AuraMetrics()
+        self.aura.metrics = self.metrics
+
+
+@pytest.fixture
+def fixture() -> MetricsFixture:
+    return MetricsFixture()
+
+
+def test_histogram_percentiles() -> None:
+    histogram = LogHistogram()
+    for nanoseconds in [100] * 90 + [5000] * 9 + [70000]:
+        histogram.record(nanoseconds)
+
+    assert histogram.count == 100
+    assert histogram.sum == 9000 + 45000 + 70000
+    assert histogram.percentile(50) == 128
+    assert histogram.percentile(90) == 128
+    assert histogram.percentile(99) == 8192
+    assert histogram.percentile(100) == 131072
+
+
+def test_empty_histogram() -> None:
+    histogram = LogHistogram()
+
+    assert histogram.percentile(99) == 0
+    assert histogram.buckets() == []
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = LogHistogram()
+    histogram.record(0)
+    histogram.record(3)
+    histogram.record(3)
+
+    assert histogram.buckets() == [(1, 1), (2, 1), (4, 3)]
+
+
+def test_histogram_merge() -> None:
+    first = LogHistogram()
+    first.record(10)
+    second = LogHistogram()
+    second.record(1000)
+
+    first.merge(second)
+
+    assert first.count == 2
+    assert first.sum == 1010
+    assert first.percentile(100) == 1024
+
+
+def test_counts_events_by_type(fixture: MetricsFixture) -> None:
+    fixture.aura.process_event(DamageEvent(1.0))
+    fixture.aura.process_event(DamageEvent(1.0))
+    fixture.aura.process_event(HealEvent(1.0))
+
+    assert fixture.metrics.events == {DamageEvent: 2, HealEvent: 1}
+    assert fixture.metrics.canceled == {}
+
+
+def test_counts_spells_added_and_removed(fixture: MetricsFixture) -> None:
+    spell = RegenSpell(regen_rate=1.0, duration=10.0)
+    fixture.aura.add_spell(spell)
+    fixture.aura.remove_spell(spell)
+    fixture.aura.remove_spell(spell)
+
+    assert fixture.metrics.spells_added == 1
+    assert fixture.metrics.spells_removed == 1
+    assert fixture.metrics.canceled == {RemoveSpellEvent: 1}
+    assert fixture.metrics.canceled_by == {}
+
+
+def test_counts_absorbed_spells(fixture: MetricsFixture) -> None:
+    fixture.aura.add_spell(AbsorbSpell(duration=10.0))
+
+    fixture.aura.add_spell(VulnerableSpell(damage_multiplier=2.0, duration=10.0))
+
+    assert fixture.metrics.spells_absorbed == 1
+    assert fixture.metrics.canceled == {AddSpellEvent: 1}
+    assert fixture.metrics.canceled_by == {AbsorbSpell: 1}
+    assert fixture.metrics.spells_added == 1
+
+
+def test_counts_combinations(fixture: MetricsFixture) -> None:
+    combinations = SpellCombinations()
+    combinations.add(CombustCombination())
+    fixture.aura.event_listeners.append(combinations)
+
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+
+    assert fixture.metrics.combinations == {CombustCombination: 1}
+
+
+def test_records_update_durations(fixture: MetricsFixture) -> None:
+    fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+
+    for _ in range(3):
+        fixture.aura.update(0.1)
+
+    assert fixture.metrics.tick_ns.count == 3
+    assert fixture.metrics.tick_ns.sum > 0
+
+
+def test_metrics_can_be_turned_off(fixture: MetricsFixture) -> None:
+    fixture.aura.metrics = None
+
+    fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+    fixture.aura.update(0.1)
+
+    assert fixture.metrics.spells_added == 0
+    assert fixture.metrics.tick_ns.count == 0
+
+
+def test_as_dict(fixture: MetricsFixture) -> None:
+    fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+    fixture.aura.update(0.1)
+
+    report = fixture.metrics.as_dict()
+
+    assert report["events"] == {"AddSpellEvent": 1}
+    assert report["spells_added"] == 1
+    assert report["ticks"] == 1
+    assert report["tick_ns_p99"] >= report["tick_ns_p50"] > 0
+
+
+def test_prometheus(fixture: MetricsFixture) -> None:
+    fixture.aura.process_event(DamageEvent(1.0))
+    fixture.aura.update(0.1)
+
+    text = fixture.metrics.prometheus()
+
+    lines = text.splitlines()
+    assert "# TYPE aura_events_total counter" in lines
+    assert 'aura_events_total{type="DamageEvent"} 1' in lines
+    assert "aura_spells_added_total 0" in lines
+    assert "# TYPE aura_tick_seconds histogram" in lines
+    assert 'aura_tick_seconds_bucket{le="+Inf"} 1' in lines
+    assert "aura_tick_seconds_count 1" in lines
+
+
+def test_world_metrics() -> None:
+    world = AuraWorld()
+    first = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    world.add(first)
+
+    world.enable_metrics()
+    second = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    world.add(second)
+    first.process_event(DamageEvent(1.0))
+    second.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+    world.update(0.1)
+    world.update(0.1)
+
+    metrics = world.collect_metrics()
+    assert metrics.events == {DamageEvent: 1, AddSpellEvent: 1}
+    assert metrics.spells_added == 1
+    assert metrics.tick_ns.count == 2
+
+
+def test_world_keeps_counts_of_removed_auras() -> None:
+    world = AuraWorld()
+    world.enable_metrics()
+    aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    world.add(aura)
+    aura.process_event(DamageEvent(1.0))
+
+    world.remove(aura)
+
+    assert aura.metrics is None
+    assert world.collect_metrics().events == {DamageEvent: 1}
+
+
+def test_world_metrics_off() -> None:
+    world = AuraWorld()
+    aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    world.add(aura)
+    world.enable_metrics()
+
+    world.enable_metrics(False)
+    aura.process_event(DamageEvent(1.0))
+    world.update(0.1)
+
+    assert aura.metrics is None
+    assert world.metrics is None
+    assert world.collect_metrics().events == {}
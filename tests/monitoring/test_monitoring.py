@@ -0,0 +1,150 @@
+import sys
+
+import pytest
+from aura.aura import Aura
+from aura.monitoring import SpellMonitor
+from aura.spell.combo.combo import SpellCombinations
+from aura.spell.combo.combust import CombustCombination
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from conftest import NoopSpell
+
+
+class InheritedRegenSpell(RegenSpell):
+    pass
+
+
+class FailingSpell(NoopSpell):
+    def __init__(self) -> None:
+        super().__init__(tags=[])
+
+    def update(self, aura, elapsed_time: float) -> bool:
+        raise RuntimeError("update failed")
+
+
+class MonitorFixture:
+    def __init__(self) -> None:
+        self.aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+        self.aura.magic.value = 50.0
+        self.monitor = SpellMonitor()
+
+    def costs(self) -> dict:
+        return {cost.name: cost for cost in self.monitor.costs}
+
+
+@pytest.fixture
+def fixture():
+    fixture = MonitorFixture()
+    yield fixture
+    fixture.monitor.stop()
+
+
+def test_counts_calls_by_spell_class(fixture: MonitorFixture) -> None:
+    with fixture.monitor:
+        fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+        fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+        for _ in range(3):
+            fixture.aura.update(0.1)
+
+    costs = fixture.costs()
+    assert costs["RegenSpell.update"].calls == 3
+    assert costs["IgniteSpell.update"].calls == 3
+    assert costs["RegenSpell.start"].calls == 1
+    assert costs["IgniteSpell.update"].total_ns > 0
+
+
+def test_inherited_methods_are_attributed_to_receiver(fixture: MonitorFixture) -> None:
+    fixture.aura.add_spell(InheritedRegenSpell(regen_rate=1.0, duration=10.0))
+
+    with fixture.monitor:
+        fixture.aura.update(0.1)
+
+    assert list(fixture.costs()) == ["InheritedRegenSpell.update"]
+
+
+def test_listeners_and_combinations(fixture: MonitorFixture) -> None:
+    combinations = SpellCombinations()
+    combinations.add(CombustCombination())
+    fixture.aura.event_listeners.append(combinations)
+
+    with fixture.monitor:
+        fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+
+    costs = fixture.costs()
+    assert costs["SpellCombinations.on_spell_event"].calls == 1
+    assert costs["CombustCombination.check"].calls == 1
+    listener = costs["SpellCombinations.on_spell_event"]
+    assert listener.total_ns >= listener.self_ns
+
+
+def test_collapsed_stacks_nest_calls(fixture: MonitorFixture) -> None:
+    combinations = SpellCombinations()
+    combinations.add(CombustCombination())
+    fixture.aura.event_listeners.append(combinations)
+
+    with fixture.monitor:
+        for _ in range(200):
+            fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+
+    stacks = dict(
+        line.rsplit(" ", 1) for line in fixture.monitor.collapsed().splitlines()
+    )
+    assert "SpellCombinations.on_spell_event;CombustCombination.check" in stacks
+
+
+def test_stop_removes_instrumentation(fixture: MonitorFixture) -> None:
+    fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+    with fixture.monitor:
+        fixture.aura.update(0.1)
+    assert not fixture.monitor.running
+
+    fixture.aura.update(0.1)
+
+    assert fixture.costs()["RegenSpell.update"].calls == 1
+    assert sys.monitoring.get_tool(sys.monitoring.PROFILER_ID) is None
+
+
+def test_exceptions_leave_monitored_calls(fixture: MonitorFixture) -> None:
+    spell = FailingSpell()
+    fixture.aura.add_spell(spell)
+
+    with fixture.monitor:
+        with pytest.raises(RuntimeError):
+            fixture.aura.update(0.1)
+        fixture.aura.remove_spell(spell)
+        fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+        fixture.aura.update(0.1)
+
+    costs = fixture.costs()
+    assert costs["FailingSpell.update"].calls == 1
+    assert costs["RegenSpell.update"].calls == 1
+    assert "FailingSpell.update;RegenSpell" not in fixture.monitor.collapsed()
+
+
+def test_table_is_sorted_by_total_time(fixture: MonitorFixture) -> None:
+    with fixture.monitor:
+        fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+        fixture.aura.update(0.1)
+
+    lines = fixture.monitor.table().splitlines()
+    totals = [cost.total_ns for cost in fixture.monitor.costs]
+    assert lines[0].split()[0] == "method"
+    assert len(lines) == len(totals) + 1
+    assert totals == sorted(totals, reverse=True)
+
+
+def test_reset(fixture: MonitorFixture) -> None:
+    with fixture.monitor:
+        fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+
+    fixture.monitor.reset()
+
+    assert fixture.monitor.costs == []
+    assert fixture.monitor.collapsed() == "\n"
+
+
+def test_start_twice(fixture: MonitorFixture) -> None:
+    fixture.monitor.start()
+
+    with pytest.raises(ValueError):
+        fixture.monitor.start()
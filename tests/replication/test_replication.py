@@ -0,0 +1,190 @@
+import struct
+
+import pytest
+from aura.aura import Aura, DamageEvent
+from aura.replication import DELTA_VERSION, DeltaDecoder, DeltaEncoder
+from aura.snapshot import pack_aura
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ice_shield import IceShieldSpell
+from aura.spell.elemental.freeze import FreezeSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.values import ValueModifier
+from aura.world import AuraWorld
+from conftest import AuraFixture, MockCaster
+
+
+def replicated_state(aura: Aura) -> bytes:
+    """Packs the replicated state, leaving out the clock and settings deltas do not
+    carry."""
+    aura.max_events_per_drain = 1000
+    aura.coalesce_damage = True
+    data = bytearray(pack_aura(aura))
+    # The clocks of sleeping auras stand still
+    struct.pack_into("<d", data, struct.calcsize("<4sHI"), 0.0)
+    return bytes(data)
+
+
+class ReplicationFixture:
+    def __init__(self, aura_count: int = 3) -> None:
+        self.world = AuraWorld()
+        self.auras: list[Aura] = [AuraFixture().aura for _ in range(aura_count)]
+        for aura in self.auras:
+            self.world.add(aura)
+        self.caster = MockCaster()
+        self.encoder = DeltaEncoder()
+        self.decoder = DeltaDecoder(self.caster)
+        self.send(self.auras)
+
+    def send(self, changed) -> bytes:
+        delta = self.encoder.encode(changed)
+        self.encoder.acknowledge(self.decoder.decode(delta))
+        return delta
+
+    def tick(self, elapsed_time: float) -> bytes:
+        self.world.update(elapsed_time)
+        # Replicas move on with the same time, the delta corrects what changed
+        for replica in self.decoder.auras.values():
+            replica.update(elapsed_time)
+        return self.send(aura for aura, _ in self.world.collect_changes())
+
+    def assert_replicated(self) -> None:
+        assert len(self.decoder.auras) == len(self.auras)
+        for aura in self.auras:
+            replica = self.decoder.auras[self.encoder.key(aura)]
+            assert replicated_state(replica) == replicated_state(aura)
+
+
+@pytest.fixture
+def fixture() -> ReplicationFixture:
+    return ReplicationFixture()
+
+
+def test_first_delta_sends_full_state(fixture: ReplicationFixture) -> None:
+    fixture.assert_replicated()
+    assert fixture.encoder.unacknowledged == 0
+
+
+def test_delta_replicates_changes(fixture: ReplicationFixture) -> None:
+    first, second, third = fixture.auras
+    first.add_spell(IgniteSpell(damage_per_second=2.0, duration=3.0))
+    second.add_spell(HasteSpell(duration=2.0, cast_delay_percentage=0.5))
+    third.magic.max.modifiers.add(ValueModifier(2.0, duration=1.5))
+    third.process_event(DamageEvent(3.0))
+
+    for _ in range(8):
+        fixture.tick(0.5)
+        fixture.assert_replicated()
+
+
+def test_spell_removed_between_ticks(fixture: ReplicationFixture) -> None:
+    first, second, _ = fixture.auras
+    regen = RegenSpell(regen_rate=4.0, duration=10.0)
+    ignite = IgniteSpell(damage_per_second=2.0, duration=10.0)
+    first.process_event(DamageEvent(50.0))
+    first.add_spell(regen)
+    second.add_spell(ignite)
+    fixture.tick(0.5)
+
+    # The replicas still update the spells before the delta removes them
+    first.remove_spell(regen)
+    second.remove_spell(ignite)
+    fixture.tick(0.5)
+
+    fixture.assert_replicated()
+
+
+def test_delta_size_follows_changes(fixture: ReplicationFixture) -> None:
+    fixture.world.collect_changes()
+    assert len(fixture.tick(1.0)) == len(fixture.send([]))
+
+    fixture.auras[0].process_event(DamageEvent(1.0))
+    delta = fixture.tick(1.0)
+
+    assert len(delta) == len(fixture.send([])) + struct.calcsize("<IBdd")
+
+
+def test_unacknowledged_changes_are_resent(fixture: ReplicationFixture) -> None:
+    aura = fixture.auras[0]
+    aura.process_event(DamageEvent(1.0))
+    fixture.encoder.encode([aura])
+    aura.cast_delay.base = 3.0
+    lost = fixture.encoder.encode([aura])
+
+    fixture.send([])
+
+    assert fixture.encoder.unacknowledged == 0
+    fixture.assert_replicated()
+    # Applying a delta older than the last applied one has no effect
+    aura.process_event(DamageEvent(1.0))
+    fixture.send([aura])
+    fixture.decoder.decode(lost)
+    fixture.assert_replicated()
+
+
+def test_acknowledging_old_delta_keeps_newer_changes(
+    fixture: ReplicationFixture,
+) -> None:
+    aura = fixture.auras[0]
+    aura.process_event(DamageEvent(1.0))
+    first = fixture.encoder.encode([aura])
+    aura.process_event(DamageEvent(1.0))
+    fixture.encoder.encode([aura])
+
+    fixture.encoder.acknowledge(fixture.decoder.decode(first))
+
+    assert fixture.encoder.unacknowledged == 1
+    fixture.send([])
+    fixture.assert_replicated()
+
+
+def test_remove_aura(fixture: ReplicationFixture) -> None:
+    aura = fixture.auras.pop()
+    key = fixture.encoder.key(aura)
+    fixture.world.remove(aura)
+
+    fixture.encoder.remove(aura)
+    fixture.send([])
+
+    assert key not in fixture.decoder.auras
+    fixture.assert_replicated()
+
+
+def test_replicated_ice_shield_uses_caster(fixture: ReplicationFixture) -> None:
+    aura = fixture.auras[0]
+    aura.add_spell(
+        IceShieldSpell(
+            reduction=0.5,
+            max_hits=1,
+            duration=5.0,
+            freeze_spell=FreezeSpell(duration=1.0, cast_delay_modifier=2.0),
+            caster=fixture.caster,
+        )
+    )
+
+    fixture.tick(0.1)
+
+    replica = fixture.decoder.auras[fixture.encoder.key(aura)]
+    shield = replica.spells.get_by_class(IceShieldSpell)[0]
+    assert shield._caster is fixture.caster
+
+
+def test_decode_rejects_other_data() -> None:
+    with pytest.raises(ValueError):
+        DeltaDecoder().decode(b"AURA" + bytes(10))
+
+
+def test_decode_rejects_other_versions(fixture: ReplicationFixture) -> None:
+    delta = bytearray(fixture.encoder.encode([]))
+    struct.pack_into("<H", delta, 4, DELTA_VERSION + 1)
+
+    with pytest.raises(ValueError):
+        DeltaDecoder().decode(bytes(delta))
+
+
+def test_decode_rejects_truncated_data(fixture: ReplicationFixture) -> None:
+    fixture.auras[0].process_event(DamageEvent(1.0))
+    delta = fixture.encoder.encode(fixture.auras)
+
+    with pytest.raises(ValueError):
+        DeltaDecoder().decode(delta[:-4])
@@ -0,0 +1,338 @@
+import struct
+
+import pytest
+from aura.aura import Aura, Spell
+from aura.snapshot import (
+    CUSTOM_CODES,
+    FORMAT_VERSION,
+    SnapshotContext,
+    SpellCodec,
+    pack_aura,
+    pack_auras,
+    register_spell_codec,
+    spell_codec,
+    unpack_aura,
+    unpack_auras,
+)
+from aura.spell.ambient_magic_regen import AmbientMagicRegenSpell
+from aura.spell.combo.combo import SpellCombinations
+from aura.spell.combo.invigorate import InvigorateCombination
+from aura.spell.elemental.absorb import AbsorbSpell
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.earth_shield import EarthShieldSpell
+from aura.spell.elemental.flash import FlashSpell
+from aura.spell.elemental.freeze import FreezeSpell
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.heal import HealSpell
+from aura.spell.elemental.ice_shield import IceShieldSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.pause import PauseSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.spell.elemental.rock import RockSpell
+from aura.spell.elemental.shadow import ShadowSpell
+from aura.spell.elemental.shock import ShockSpell
+from aura.spell.elemental.slice import SliceSpell
+from aura.spell.elemental.unpause import UnpauseSpell
+from aura.spell.elemental.vulnerable import VulnerableSpell
+from aura.spell.elemental.warmth import WarmthSpell
+from aura.spell.elemental.weaken import WeakenSpell
+from aura.spell.elemental.weight import WeightSpell
+from aura.values import ValueModifier
+from conftest import AuraFixture, MockCaster, NoopSpell
+
+CASTER = MockCaster()
+
+BUILT_IN_SPELLS = {
+    "absorb": lambda: AbsorbSpell(duration=4.0),
+    "ambient_regen": lambda: AmbientMagicRegenSpell(amount_per_second=2.0),
+    "charge": lambda: ChargeSpell(healing_multiplier=1.5, duration=4.0),
+    "earth_shield": lambda: EarthShieldSpell(reduction=0.5, max_hits=3, duration=4.0),
+    "flash": lambda: FlashSpell(duration=4.0),
+    "freeze": lambda: FreezeSpell(duration=4.0, cast_delay_modifier=2.0),
+    "haste": lambda: HasteSpell(duration=4.0, cast_delay_percentage=0.25),
+    "heal": lambda: HealSpell(healing=10.0),
+    "ice_shield": lambda: IceShieldSpell(
+        reduction=0.5,
+        max_hits=3,
+        duration=4.0,
+        freeze_spell=FreezeSpell(duration=2.0, cast_delay_modifier=1.5),
+        caster=CASTER,
+    ),
+    "ignite": lambda: IgniteSpell(damage_per_second=5.0, duration=4.0),
+    "pause": lambda: PauseSpell(duration=4.0),
+    "regen": lambda: RegenSpell(regen_rate=5.0, duration=4.0),
+    "rock": lambda: RockSpell(damage=10.0),
+    "shadow": lambda: ShadowSpell(duration=4.0),
+    "shock": lambda: ShockSpell(heal_reduction_percentage=0.25, duration=4.0),
+    "slice": lambda: SliceSpell(damage=10.0),
+    "unpause": lambda: UnpauseSpell(),
+    "vulnerable": lambda: VulnerableSpell(damage_multiplier=1.5, duration=4.0),
+    "warmth": lambda: WarmthSpell(),
+    "weaken": lambda: WeakenSpell(reduction=0.25, duration=4.0),
+    "weight": lambda: WeightSpell(
+        acceleration_threshold=1.0, damage_per_second=5.0, duration=4.0
+    ),
+}
+
+
+def spell_state(spell: Spell) -> dict:
+    """Returns the packed fields of a spell, which cover all of its state."""
+    codec = spell_codec(type(spell))
+    return {
+        "level": spell.level,
+        "fields": codec.encode(spell, SnapshotContext(Aura(0.0, 1.0, 1.0))),
+    }
+
+
+def aura_state(aura: Aura) -> tuple:
+    return (
+        aura.magic.value,
+        aura.magic.min,
+        aura.magic.max.value,
+        aura.cast_delay.value,
+        [spell.name for spell in aura.spells],
+    )
+
+
+class SnapshotFixture(AuraFixture):
+    def __init__(self) -> None:
+        super().__init__()
+        self.aura.magic.value = self.max_magic / 2
+
+
+@pytest.fixture
+def fixture() -> SnapshotFixture:
+    return SnapshotFixture()
+
+
+def test_empty_aura_round_trip(fixture: SnapshotFixture) -> None:
+    fixture.aura.coalesce_damage = False
+    fixture.aura.max_events_per_drain = 12
+
+    restored = unpack_aura(pack_aura(fixture.aura))
+
+    assert aura_state(restored) == aura_state(fixture.aura)
+    assert restored.coalesce_damage is False
+    assert restored.max_events_per_drain == 12
+
+
+@pytest.mark.parametrize("name", BUILT_IN_SPELLS)
+def test_built_in_spell_round_trip(fixture: SnapshotFixture, name: str) -> None:
+    spell = BUILT_IN_SPELLS[name]()
+    spell.level = 3
+    aura = fixture.aura
+    aura._attach_spell(spell)
+    spell.start(aura)
+    aura.wheel.advance(1.5)
+
+    restored = unpack_aura(pack_aura(aura), caster=CASTER)
+
+    assert aura_state(restored) == aura_state(aura)
+    restored_spell = next(iter(restored.spells))
+    assert type(restored_spell) is type(spell)
+    assert spell_state(restored_spell) == spell_state(spell)
+
+
+def test_modifiers_round_trip(fixture: SnapshotFixture) -> None:
+    aura = fixture.aura
+    aura.magic.max.modifiers.add(ValueModifier(2.0, duration=5.0))
+    aura.cast_delay.modifiers.add(ValueModifier(0.5, duration=3.0))
+    aura.update(1.0)
+
+    restored = unpack_aura(pack_aura(aura))
+
+    assert aura_state(restored) == aura_state(aura)
+    modifier = next(iter(restored.cast_delay.modifiers))
+    assert modifier.multiplier == 0.5
+    assert modifier.duration.remaining == 2.0
+
+    restored.update(2.0)
+    assert restored.cast_delay.value == restored.cast_delay.base
+    assert len(restored.magic.max.modifiers) == 1
+
+
+def test_spell_modifier_shared_with_values(fixture: SnapshotFixture) -> None:
+    fixture.aura.add_spell(HasteSpell(duration=4.0, cast_delay_percentage=0.5))
+
+    restored = unpack_aura(pack_aura(fixture.aura))
+
+    haste = restored.spells.get_by_class(HasteSpell)[0]
+    assert list(restored.cast_delay.modifiers) == [haste._modifier]
+    restored.remove_spell(haste)
+    assert restored.cast_delay.value == restored.cast_delay.base
+
+
+def test_restored_aura_continues_like_original(fixture: SnapshotFixture) -> None:
+    aura = fixture.aura
+    aura.add_spell(IgniteSpell(damage_per_second=5.0, duration=3.0))
+    aura.add_spell(ChargeSpell(healing_multiplier=2.0, duration=2.0))
+    aura.add_spell(AmbientMagicRegenSpell(amount_per_second=1.0))
+    aura.add_spell(FreezeSpell(duration=2.5, cast_delay_modifier=2.0))
+    aura.update(1.0)
+
+    restored = unpack_aura(pack_aura(aura))
+    for _ in range(4):
+        aura.update(0.5)
+        restored.update(0.5)
+        assert aura_state(restored) == aura_state(aura)
+
+
+def test_restore_does_not_start_spells(fixture: SnapshotFixture) -> None:
+    class StartCountingSpell(NoopSpell):
+        starts = 0
+
+        def __init__(self) -> None:
+            super().__init__(tags=[])
+
+        def start(self, aura: Aura) -> None:
+            StartCountingSpell.starts += 1
+
+    register_spell_codec(
+        SpellCodec(
+            StartCountingSpell,
+            CUSTOM_CODES,
+            "",
+            lambda spell, context: (),
+            lambda values, context: StartCountingSpell(),
+        )
+    )
+    fixture.aura.add_spell(StartCountingSpell())
+
+    restored = unpack_aura(pack_aura(fixture.aura))
+
+    assert StartCountingSpell.starts == 1
+    assert len(restored.spells.get_by_class(StartCountingSpell)) == 1
+
+
+def test_invigorate_refreshes_restored_modifier(fixture: SnapshotFixture) -> None:
+    combinations = SpellCombinations()
+    combinations.add(InvigorateCombination(1.5, duration=10.0))
+    fixture.aura.event_listeners.append(combinations)
+    base_max_magic = fixture.aura.magic.max.base
+    for _ in range(3):
+        fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=1.0))
+    fixture.aura.update(2.0)
+
+    restored = unpack_aura(pack_aura(fixture.aura), combinations=combinations)
+    for _ in range(3):
+        restored.add_spell(RegenSpell(regen_rate=1.0, duration=1.0))
+
+    assert len(restored.magic.max.modifiers) == 1
+    assert restored.magic.max.value == pytest.approx(base_max_magic * 1.5)
+    restored.update(9.0)
+    # Refreshed by the second trigger, so it outlasts the original duration
+    assert restored.magic.max.value == pytest.approx(base_max_magic * 1.5)
+
+
+def test_custom_spell_codec(fixture: SnapshotFixture) -> None:
+    class ChargesSpell(NoopSpell):
+        def __init__(self, charges: int) -> None:
+            super().__init__(tags=[])
+            self.charges = charges
+
+    register_spell_codec(
+        SpellCodec(
+            ChargesSpell,
+            CUSTOM_CODES + 1,
+            "i",
+            lambda spell, context: (spell.charges,),
+            lambda values, context: ChargesSpell(*values),
+        )
+    )
+    fixture.aura.add_spell(ChargesSpell(7))
+
+    restored = unpack_aura(pack_aura(fixture.aura))
+
+    assert restored.spells.get_by_class(ChargesSpell)[0].charges == 7
+
+
+def test_register_codec_with_used_code() -> None:
+    codec = SpellCodec(NoopSpell, 10, "", lambda s, c: (), lambda v, c: None)
+
+    with pytest.raises(ValueError):
+        register_spell_codec(codec)
+
+
+def test_pack_spell_without_codec(fixture: SnapshotFixture) -> None:
+    fixture.aura.add_spell(NoopSpell(tags=[]))
+
+    with pytest.raises(ValueError):
+        pack_aura(fixture.aura)
+
+
+def test_spell_added_twice_is_restored_once(fixture: SnapshotFixture) -> None:
+    spell = SliceSpell(damage=1.0)
+    other = RockSpell(damage=1.0)
+    fixture.aura._attach_spell(spell)
+    fixture.aura._attach_spell(other)
+    fixture.aura._attach_spell(spell)
+
+    restored = unpack_aura(pack_aura(fixture.aura))
+
+    first, second, third = restored.spells
+    assert first is third
+    assert second is not first
+
+
+def test_pack_many_auras() -> None:
+    auras = [AuraFixture().aura for _ in range(5)]
+    auras[2].add_spell(RegenSpell(regen_rate=5.0, duration=4.0))
+
+    restored = unpack_auras(pack_auras(auras))
+
+    assert [aura_state(aura) for aura in restored] == [
+        aura_state(aura) for aura in auras
+    ]
+
+
+def test_unpack_rejects_other_data() -> None:
+    with pytest.raises(ValueError):
+        unpack_auras(b"NOPE" + bytes(10))
+
+
+def test_unpack_rejects_other_versions(fixture: SnapshotFixture) -> None:
+    data = bytearray(pack_aura(fixture.aura))
+    struct.pack_into("<H", data, 4, FORMAT_VERSION + 1)
+
+    with pytest.raises(ValueError):
+        unpack_aura(bytes(data))
+
+
+# A version 1 snapshot of an aura with 42 of 100 magic, a 0.5 max magic modifier,
+# a RegenSpell and a HasteSpell, all 0.5 seconds into 2 or 3 second durations
+V1_SNAPSHOT = bytes.fromhex(
+    "41555241010001000000000000000000454000000000000000000000000000005940000000000000"
+    "f03fe803000001010001000200000000000000e03f0000000000000040000000000000e03f000000"
+    "000000e03f0000000000000040000000000000e03f0c000100000000000000000008400000000000"
+    "00e03f000000000000104000000000000010400700010000000000000000000040000000000000e0"
+    "3f000000000000e03f000000000000e03f01000000000000000000e03f0000000000000040000000"
+    "000000e03f"
+)
+
+
+def test_unpack_version_1_snapshot() -> None:
+    aura = unpack_aura(V1_SNAPSHOT)
+
+    assert aura.wheel.now == 0.0
+    assert aura.magic.value == 42.0
+    assert aura.magic.max.value == 50.0
+    assert aura.cast_delay.value == 0.5
+    regen, haste = aura.spells
+    assert isinstance(regen, RegenSpell)
+    assert isinstance(haste, HasteSpell)
+    assert regen.duration.elapsed == 0.5
+    assert haste.duration.elapsed == 0.5
+
+    aura.update(1.5)
+
+    assert len(aura.spells) == 1
+    assert aura.magic.max.value == 100.0
+    assert aura.cast_delay.value == 1.0
+
+
+def test_unpack_rejects_truncated_data(fixture: SnapshotFixture) -> None:
+    fixture.aura.add_spell(RegenSpell(regen_rate=5.0, duration=4.0))
+    data = pack_aura(fixture.aura)
+
+    with pytest.raises(ValueError):
+        unpack_aura(data[:-4])
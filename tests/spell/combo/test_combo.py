@@ -1,7 +1,9 @@
 import pytest
 from aura.aura import AddSpellEvent, Aura, RemoveSpellEvent
 from aura.spell.combo.combo import SpellCombination, SpellCombinations
+from aura.spell.elemental.elements import ElementTags
 from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
 from conftest import AuraFixture
 
 
@@ -187,3 +189,129 @@ def test_as_event_listener_integration(fixture: AuraFixture):
 
     assert mock_combo.check_called
     assert mock_combo.last_aura is fixture.aura
+
+
+class IngredientCombination(SpellCombination):
+    """Records the counts it is checked with."""
+
+    def __init__(self, ingredients, check_on_remove: bool = False):
+        self.INGREDIENTS = ingredients
+        self.CHECK_ON_REMOVE = check_on_remove
+        self.checks = []
+
+    def check(self, aura: Aura, counts=None) -> bool:
+        self.checks.append(dict(counts))
+        return False
+
+
+def test_combination_checked_only_for_its_ingredients(fixture: AuraFixture):
+    """Test that combinations with ingredients are only checked for matching spells."""
+    combinations = SpellCombinations()
+    ignite_combo = IngredientCombination((IgniteSpell,))
+    fire_combo = IngredientCombination((ElementTags.FIRE,))
+    regen_combo = IngredientCombination((RegenSpell,))
+    any_combo = MockSpellCombination()
+    for combo in (ignite_combo, fire_combo, regen_combo, any_combo):
+        combinations.add(combo)
+    fixture.aura.event_listeners.append(combinations)
+
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=5.0))
+
+    assert len(ignite_combo.checks) == 1
+    assert len(fire_combo.checks) == 1
+    assert regen_combo.checks == []
+    assert any_combo.check_called
+
+
+def test_ingredient_counts_follow_added_and_removed_spells(fixture: AuraFixture):
+    """Test that the per-aura counts track the spells matching each ingredient."""
+    combinations = SpellCombinations()
+    combo = IngredientCombination((RegenSpell, ElementTags.FIRE))
+    combinations.add(combo)
+    aura = fixture.aura
+    aura.event_listeners.append(combinations)
+    regen1 = RegenSpell(regen_rate=1.0, duration=5.0)
+    regen2 = RegenSpell(regen_rate=1.0, duration=5.0)
+
+    aura.add_spell(regen1)
+    aura.add_spell(regen2)
+    # Copies of an active spell are not counted again
+    aura.add_spell(regen2)
+    aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=5.0))
+
+    assert combo.checks[-1] == {RegenSpell: 2, ElementTags.FIRE: 1}
+    assert combinations.count(aura, RegenSpell) == 2
+
+    aura.remove_spell(regen1)
+    aura.remove_spell(regen2)
+
+    assert combinations.count(aura, RegenSpell) == 1
+    assert combinations.count(aura, ElementTags.FIRE) == 1
+    assert len(combo.checks) == 4
+
+
+def test_count_rejects_unknown_ingredient(fixture: AuraFixture):
+    """Test that only declared ingredients are counted."""
+    combinations = SpellCombinations()
+    combinations.add(IngredientCombination((RegenSpell,)))
+
+    with pytest.raises(ValueError):
+        combinations.count(fixture.aura, IgniteSpell)
+
+
+def test_counts_start_from_spells_added_before_listening(fixture: AuraFixture):
+    """Test that counts include the spells an aura had before the manager listened."""
+    aura = fixture.aura
+    aura.add_spell(RegenSpell(regen_rate=1.0, duration=5.0))
+    aura.add_spell(RegenSpell(regen_rate=1.0, duration=5.0))
+    combinations = SpellCombinations()
+    combo = IngredientCombination((RegenSpell,))
+    combinations.add(combo)
+    aura.event_listeners.append(combinations)
+
+    aura.add_spell(RegenSpell(regen_rate=1.0, duration=5.0))
+
+    assert combo.checks == [{RegenSpell: 3}]
+
+
+def test_check_on_remove(fixture: AuraFixture):
+    """Test that combinations setting CHECK_ON_REMOVE are checked on removals."""
+    combinations = SpellCombinations()
+    on_remove = IngredientCombination((IgniteSpell,), check_on_remove=True)
+    on_add = IngredientCombination((IgniteSpell,))
+    combinations.add(on_remove)
+    combinations.add(on_add)
+    aura = fixture.aura
+    aura.event_listeners.append(combinations)
+    ignite = IgniteSpell(damage_per_second=1.0, duration=5.0)
+    aura.add_spell(ignite)
+
+    aura.remove_spell(ignite)
+
+    assert on_remove.checks == [{IgniteSpell: 1}, {IgniteSpell: 0}]
+    assert on_add.checks == [{IgniteSpell: 1}]
+
+
+def test_batch_checks_each_combination_once(fixture: AuraFixture):
+    """Test that a batch of added spells checks affected combinations once."""
+    combinations = SpellCombinations()
+    regen_combo = IngredientCombination((RegenSpell,))
+    ignite_combo = IngredientCombination((IgniteSpell,))
+    any_combo = MockSpellCombination()
+    for combo in (regen_combo, ignite_combo, any_combo):
+        combinations.add(combo)
+    aura = fixture.aura
+    aura.add_spell(RegenSpell(regen_rate=1.0, duration=5.0))
+    aura.event_listeners.append(combinations)
+    regens = [RegenSpell(regen_rate=1.0, duration=5.0) for _ in range(3)]
+
+    aura.add_spells(regens)
+
+    assert regen_combo.checks == [{RegenSpell: 4, IgniteSpell: 0}]
+    assert ignite_combo.checks == []
+    assert any_combo.check_called
+
+    aura.remove_spells(regens[:2])
+
+    assert combinations.count(aura, RegenSpell) == 2
+    assert len(regen_combo.checks) == 1
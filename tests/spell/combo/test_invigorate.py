@@ -200,3 +200,26 @@ def test_invigorate_check_returns_false_with_insufficient_regen_spells(
 
     result = standalone_combo.check(aura)
     assert result is False
+
+
+def test_invigorate_modifier_follows_each_aura_clock(fixture: InvigorateFixture):
+    """Test that each aura gets its own modifier, timed by its own clock."""
+    first = fixture.aura
+    second = AuraFixture().aura
+    second_max_magic = second.magic.max.value
+    second.event_listeners.append(fixture.combos)
+    first.update(3.0)
+
+    for aura in (first, second):
+        for _ in range(3):
+            aura.add_spell(RegenSpell(regen_rate=5.0, duration=1.0))
+    first_modifier = next(iter(first.magic.max.modifiers))
+    second_modifier = next(iter(second.magic.max.modifiers))
+
+    assert first_modifier is not second_modifier
+
+    first.update(fixture.duration)
+    second.update(fixture.duration)
+
+    assert first.magic.max.value == pytest.approx(fixture.original_max_magic)
+    assert second.magic.max.value == pytest.approx(second_max_magic)
@@ -0,0 +1,321 @@
+import pytest
+from aura.aura import Aura, SpellTags
+from aura.spell.combo.combo import SpellCombinations
+from aura.spell.combo.combust import CombustCombination
+from aura.spell.combo.invigorate import InvigorateCombination
+from aura.spell.combo.pattern import Count, PatternNetwork, Recipe
+from aura.spell.elemental.elements import ElementTags
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.values import ValueModifier
+from conftest import AuraFixture
+
+
+def combust(aura: Aura, matched) -> bool:
+    ignites = matched[0]
+    total_damage_per_second = sum(ignite.damage_per_second for ignite in ignites)
+    max_duration = max(ignite.duration.length for ignite in ignites)
+    for ignite in ignites:
+        aura.remove_spell(ignite)
+    aura.add_spell(
+        IgniteSpell(damage_per_second=total_damage_per_second, duration=max_duration)
+    )
+    return True
+
+
+def invigorate(max_magic_multiplier: float, duration: float):
+    modifier = ValueModifier(max_magic_multiplier, duration)
+
+    def action(aura: Aura, matched) -> bool:
+        modifier.duration.reset()
+        return aura.magic.max.modifiers.add(modifier)
+
+    return action
+
+
+class RecordingRecipe(Recipe):
+    def __init__(self, conditions, check_on_remove: bool = False) -> None:
+        super().__init__("Recording", conditions, self.record, check_on_remove)
+        self.matches = []
+
+    def record(self, aura: Aura, matched) -> bool:
+        self.matches.append(matched)
+        return True
+
+
+class PatternFixture(AuraFixture):
+    def __init__(self) -> None:
+        super().__init__()
+        self.network = PatternNetwork()
+        self.aura.event_listeners.append(self.network)
+
+    def listen(self, *conditions, check_on_remove: bool = False) -> RecordingRecipe:
+        recipe = RecordingRecipe(conditions, check_on_remove)
+        self.network.add(recipe)
+        return recipe
+
+
+@pytest.fixture
+def fixture() -> PatternFixture:
+    return PatternFixture()
+
+
+def run_ignites(aura: Aura) -> list[tuple[float, float]]:
+    aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=5.0))
+    aura.add_spell(IgniteSpell(damage_per_second=15.0, duration=7.0))
+    aura.add_spell(IgniteSpell(damage_per_second=5.0, duration=3.0))
+    aura.update(1.0)
+    aura.add_spell(IgniteSpell(damage_per_second=2.0, duration=9.0))
+    return [
+        (ignite.damage_per_second, ignite.duration.remaining)
+        for ignite in aura.spells.get_by_class(IgniteSpell)
+    ]
+
+
+def test_combust_as_recipe_matches_combination(fixture: PatternFixture) -> None:
+    combinations = SpellCombinations()
+    combinations.add(CombustCombination())
+    expected_aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    expected_aura.event_listeners.append(combinations)
+    fixture.network.add(Recipe("Combust", [Count(IgniteSpell, at_least=2)], combust))
+
+    assert run_ignites(fixture.aura) == run_ignites(expected_aura)
+    assert len(fixture.aura.spells) == 1
+
+
+def run_regens(aura: Aura) -> list[float]:
+    max_magic = []
+    aura.add_spell(RegenSpell(regen_rate=5.0, duration=1))
+    aura.add_spell(RegenSpell(regen_rate=5.0, duration=5))
+    aura.add_spell(RegenSpell(regen_rate=8.0, duration=5))
+    max_magic.append(aura.magic.max.value)
+    aura.update(4)
+    max_magic.append(aura.magic.max.value)
+    aura.add_spell(RegenSpell(regen_rate=12.0, duration=5))
+    aura.update(8)
+    max_magic.append(aura.magic.max.value)
+    aura.update(10)
+    max_magic.append(aura.magic.max.value)
+    return max_magic
+
+
+def test_invigorate_as_recipe_matches_combination(fixture: PatternFixture) -> None:
+    combinations = SpellCombinations()
+    combinations.add(InvigorateCombination(1.5, duration=10.0))
+    expected_aura = Aura(
+        min_magic=fixture.min_magic,
+        max_magic=fixture.max_magic,
+        cast_delay=fixture.cast_delay,
+    )
+    expected_aura.event_listeners.append(combinations)
+    fixture.network.add(
+        Recipe("Invigorate", [Count(RegenSpell, at_least=3)], invigorate(1.5, 10.0))
+    )
+
+    max_magic = run_regens(fixture.aura)
+
+    assert max_magic == run_regens(expected_aura)
+    assert max_magic[0] == pytest.approx(fixture.max_magic * 1.5)
+    assert max_magic[-1] == pytest.approx(fixture.max_magic)
+
+
+def test_recipe_fires_once_all_conditions_hold(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(
+        Count(ElementTags.FIRE, at_least=2), Count(SpellTags.BUFF, at_least=1)
+    )
+    first = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    second = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    haste = HasteSpell(duration=10.0, cast_delay_percentage=0.1)
+
+    fixture.aura.add_spell(first)
+    fixture.aura.add_spell(haste)
+    assert fixture.network.progress(fixture.aura, recipe) == (1, 2)
+    assert recipe.matches == []
+
+    fixture.aura.add_spell(second)
+
+    assert fixture.network.progress(fixture.aura, recipe) == (2, 2)
+    assert recipe.matches == [[[first, second], [haste]]]
+
+
+def test_unrelated_spells_do_not_fire_recipe(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(Count(RegenSpell, at_least=0))
+
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+
+    assert recipe.matches == []
+
+
+def test_min_level_only_counts_spells_of_that_level(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(Count(IgniteSpell, at_least=2, min_level=2))
+    strong = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    strong.level = 2
+    weak = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    stronger = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    stronger.level = 3
+
+    fixture.aura.add_spell(strong)
+    fixture.aura.add_spell(weak)
+    assert recipe.matches == []
+
+    fixture.aura.add_spell(stronger)
+
+    assert recipe.matches == [[[strong, stronger]]]
+
+
+def test_within_only_counts_recent_spells(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(Count(RegenSpell, at_least=3, within=1.0))
+    regens = [RegenSpell(regen_rate=1.0, duration=10.0) for _ in range(4)]
+
+    fixture.aura.add_spell(regens[0])
+    fixture.aura.add_spell(regens[1])
+    fixture.aura.update(2.0)
+    fixture.aura.add_spell(regens[2])
+    assert recipe.matches == []
+    assert fixture.network.progress(fixture.aura, recipe) == (0, 1)
+
+    fixture.aura.update(0.5)
+    fixture.aura.add_spell(regens[3])
+    fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+
+    assert len(recipe.matches) == 1
+    assert recipe.matches[0][0][:2] == [regens[2], regens[3]]
+
+
+def test_within_fires_for_spells_added_on_fresh_aura(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(Count(IgniteSpell, at_least=2, within=1.0))
+    first = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    second = IgniteSpell(damage_per_second=1.0, duration=10.0)
+
+    fixture.aura.add_spell(first)
+    fixture.aura.add_spell(second)
+
+    assert recipe.matches == [[[first, second]]]
+
+
+def test_within_counts_spells_present_before_the_recipe(
+    fixture: PatternFixture,
+) -> None:
+    first = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    fixture.aura.add_spell(first)
+    fixture.aura.update(5.0)
+    recipe = fixture.listen(Count(IgniteSpell, at_least=2, within=1.0))
+
+    second = IgniteSpell(damage_per_second=1.0, duration=20.0)
+    fixture.aura.add_spell(second)
+
+    assert recipe.matches == [[[first, second]]]
+
+
+def test_within_expiry_keeps_holding_count(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(Count(IgniteSpell, at_least=2, within=1.0))
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+    fixture.aura.update(2.0)
+    fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+    fixture.aura.update(2.0)
+
+    third = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    fixture.aura.add_spell(third)
+    assert fixture.network.progress(fixture.aura, recipe) == (0, 1)
+    fourth = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    fixture.aura.add_spell(fourth)
+
+    assert fixture.network.progress(fixture.aura, recipe) == (1, 1)
+    assert recipe.matches == [[[third, fourth]]]
+
+
+def test_at_most_with_check_on_remove(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(
+        Count(RegenSpell, at_least=1),
+        Count(IgniteSpell, at_least=0, at_most=0),
+        check_on_remove=True,
+    )
+    ignite = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    regen = RegenSpell(regen_rate=1.0, duration=10.0)
+    fixture.aura.add_spell(ignite)
+    fixture.aura.add_spell(regen)
+    assert recipe.matches == []
+
+    fixture.aura.remove_spell(ignite)
+
+    assert recipe.matches == [[[regen], []]]
+
+
+def test_removal_does_not_fire_without_check_on_remove(
+    fixture: PatternFixture,
+) -> None:
+    recipe = fixture.listen(Count(IgniteSpell, at_least=0, at_most=0))
+    ignite = IgniteSpell(damage_per_second=1.0, duration=10.0)
+    fixture.aura.add_spell(ignite)
+
+    fixture.aura.remove_spell(ignite)
+
+    assert recipe.matches == []
+    assert fixture.network.progress(fixture.aura, recipe) == (1, 1)
+
+
+def test_copies_are_counted_once(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(Count(IgniteSpell, at_least=2))
+    ignite = IgniteSpell(damage_per_second=1.0, duration=10.0)
+
+    fixture.aura.add_spell(ignite)
+    fixture.aura.add_spell(ignite)
+
+    assert recipe.matches == []
+
+
+def test_spells_added_before_listening_are_counted() -> None:
+    aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    first = RegenSpell(regen_rate=1.0, duration=10.0)
+    aura.add_spell(first)
+    recipe = RecordingRecipe([Count(RegenSpell, at_least=2)])
+    aura.event_listeners.append(PatternNetwork([recipe]))
+
+    second = RegenSpell(regen_rate=1.0, duration=10.0)
+    aura.add_spell(second)
+
+    assert recipe.matches == [[[first, second]]]
+
+
+def test_shared_conditions_feed_every_recipe(fixture: PatternFixture) -> None:
+    pair = fixture.listen(Count(RegenSpell, at_least=2))
+    trio = fixture.listen(Count(RegenSpell, at_least=3))
+
+    for _ in range(3):
+        fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+
+    assert len(fixture.network._memories) == 1
+    assert len(pair.matches) == 2
+    assert len(trio.matches) == 1
+
+
+def test_invalid_patterns() -> None:
+    with pytest.raises(ValueError):
+        Count(IgniteSpell, at_least=-1)
+    with pytest.raises(ValueError):
+        Count(IgniteSpell, at_least=2, at_most=1)
+    with pytest.raises(ValueError):
+        Count(IgniteSpell, within=0.0)
+    with pytest.raises(ValueError):
+        Recipe("Empty", [], lambda aura, matched: True)
+    with pytest.raises(ValueError):
+        PatternNetwork().progress(
+            Aura(min_magic=0.0, max_magic=1.0, cast_delay=1.0),
+            Recipe("Other", [Count(IgniteSpell)], lambda aura, matched: True),
+        )
+
+
+def test_batch_fires_completed_recipe_once(fixture: PatternFixture) -> None:
+    recipe = fixture.listen(Count(RegenSpell, at_least=2))
+    other = fixture.listen(Count(IgniteSpell, at_least=1))
+    regens = [RegenSpell(regen_rate=1.0, duration=10.0) for _ in range(3)]
+
+    fixture.aura.add_spells(regens)
+
+    assert recipe.matches == [[regens]]
+    assert other.matches == []
+
+    fixture.aura.remove_spells(regens[:2])
+
+    assert fixture.network.progress(fixture.aura, recipe) == (0, 1)
@@ -0,0 +1,193 @@
+import random
+
+import pytest
+from aura.timing import TimingWheel
+
+
+class WheelFixture:
+    def __init__(self) -> None:
+        self.wheel = TimingWheel(resolution=0.01)
+        self.fired: list[str] = []
+
+    def schedule(self, deadline: float, name: str):
+        return self.wheel.schedule(deadline, lambda: self.fired.append(name))
+
+
+@pytest.fixture
+def fixture() -> WheelFixture:
+    return WheelFixture()
+
+
+def test_initialization(fixture: WheelFixture) -> None:
+    assert fixture.wheel.now == 0.0
+    assert fixture.wheel.resolution == 0.01
+    assert len(fixture.wheel) == 0
+
+
+def test_advance_moves_clock(fixture: WheelFixture) -> None:
+    fixture.wheel.advance(0.5)
+    fixture.wheel.advance(0.25)
+
+    assert fixture.wheel.now == 0.75
+
+
+def test_timer_fires_at_deadline(fixture: WheelFixture) -> None:
+    timer = fixture.schedule(1.0, "a")
+
+    assert fixture.wheel.advance(0.5) == 0
+    assert fixture.fired == []
+    assert timer.is_active
+
+    assert fixture.wheel.advance(0.5) == 1
+    assert fixture.fired == ["a"]
+    assert not timer.is_active
+    assert len(fixture.wheel) == 0
+
+
+def test_timer_fires_once(fixture: WheelFixture) -> None:
+    fixture.schedule(1.0, "a")
+
+    fixture.wheel.advance(2.0)
+    fixture.wheel.advance(2.0)
+
+    assert fixture.fired == ["a"]
+
+
+def test_timers_fire_in_deadline_order(fixture: WheelFixture) -> None:
+    fixture.schedule(3.0, "c")
+    fixture.schedule(1.001, "b")
+    fixture.schedule(1.0, "a")
+    fixture.schedule(500.0, "d")
+
+    fixture.wheel.advance(1000.0)
+
+    assert fixture.fired == ["a", "b", "c", "d"]
+
+
+def test_deadline_reached_by_summed_frames(fixture: WheelFixture) -> None:
+    fixture.schedule(1.0, "a")
+
+    for _ in range(10):
+        fixture.wheel.advance(0.1)
+
+    assert fixture.fired == ["a"]
+
+
+def test_past_deadline_fires_on_next_advance(fixture: WheelFixture) -> None:
+    fixture.wheel.advance(5.0)
+    fixture.schedule(1.0, "a")
+
+    fixture.wheel.advance(0.0)
+
+    assert fixture.fired == ["a"]
+
+
+def test_cancel(fixture: WheelFixture) -> None:
+    timer = fixture.schedule(1.0, "a")
+
+    fixture.wheel.cancel(timer)
+    fixture.wheel.advance(2.0)
+
+    assert fixture.fired == []
+    assert not timer.is_active
+    assert len(fixture.wheel) == 0
+
+
+def test_cancel_from_callback(fixture: WheelFixture) -> None:
+    later = fixture.schedule(1.0, "later")
+    fixture.wheel.schedule(0.5, lambda: fixture.wheel.cancel(later))
+
+    fixture.wheel.advance(1.0)
+
+    assert fixture.fired == []
+
+
+def test_schedule_from_callback(fixture: WheelFixture) -> None:
+    fixture.wheel.schedule(0.5, lambda: fixture.schedule(0.75, "a"))
+
+    fixture.wheel.advance(1.0)
+
+    assert fixture.fired == ["a"]
+
+
+def test_far_deadlines_cascade(fixture: WheelFixture) -> None:
+    fixture.schedule(100000.0, "far")
+
+    fixture.wheel.advance(99999.0)
+    assert fixture.fired == []
+
+    fixture.wheel.advance(1.0)
+    assert fixture.fired == ["far"]
+
+
+def test_schedule_after_advances_past_horizon(fixture: WheelFixture) -> None:
+    fixture.schedule(100000.0, "far")
+    for _ in range(100):
+        fixture.wheel.advance(1 / 60)
+
+    fixture.schedule(2.0, "near")
+    fixture.wheel.advance(0.3)
+    assert fixture.fired == []
+    fixture.wheel.advance(0.04)
+    assert fixture.fired == ["near"]
+
+
+def test_schedule_after_idle_advances(fixture: WheelFixture) -> None:
+    for _ in range(1000):
+        fixture.wheel.advance(1 / 60)
+
+    fixture.schedule(fixture.wheel.now + 0.02, "a")
+    fixture.wheel.advance(0.01)
+    assert fixture.fired == []
+    fixture.wheel.advance(0.01)
+    assert fixture.fired == ["a"]
+
+
+def test_matches_sorted_deadlines() -> None:
+    rng = random.Random(7)
+    wheel = TimingWheel(resolution=0.01)
+    fired: list[tuple[float, float]] = []
+    deadlines = [rng.uniform(0.0, 2000.0) for _ in range(500)]
+    for deadline in deadlines:
+        wheel.schedule(deadline, lambda d=deadline: fired.append((d, wheel.now)))
+
+    while len(wheel):
+        wheel.advance(rng.uniform(0.0, 5.0))
+
+    assert [deadline for deadline, _ in fired] == sorted(deadlines)
+    for deadline, now in fired:
+        assert deadline <= now + TimingWheel.EPSILON
+        assert now - deadline <= 5.0
+
+
+def test_reset_moves_clock(fixture: WheelFixture) -> None:
+    fixture.wheel.reset(12.345)
+    fixture.schedule(12.5, "a")
+
+    fixture.wheel.advance(0.15)
+    assert fixture.fired == []
+    fixture.wheel.advance(0.005)
+    assert fixture.fired == ["a"]
+
+
+def test_reset_with_timers(fixture: WheelFixture) -> None:
+    fixture.schedule(1.0, "a")
+
+    with pytest.raises(ValueError):
+        fixture.wheel.reset(5.0)
+
+
+def test_jump_keeps_timers(fixture: WheelFixture) -> None:
+    fixture.schedule(5.0, "near")
+    fixture.schedule(100.0, "far")
+    fixture.wheel.advance(0.5)
+
+    # Past the cascade of the near timer without firing it
+    fixture.wheel._jump(4.9)
+    fixture.schedule(4.95, "scheduled")
+    fixture.wheel.advance(0.2)
+
+    assert fixture.wheel.now == pytest.approx(5.1)
+    assert fixture.fired == ["scheduled", "near"]
+    fixture.wheel.advance(95.0)
+    assert fixture.fired == ["scheduled", "near", "far"]
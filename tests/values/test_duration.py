@@ -1,4 +1,5 @@
 import pytest
+from aura.timing import TimingWheel
 from aura.values import Duration
 
 
@@ -143,8 +144,93 @@ def test_length_setter_can_cause_expiration():
 def test_length_setter_negative_remaining():
     duration = Duration(length=10.0)
     duration.update(8.0)
-    
+
     # Set length to less than elapsed
     duration.length = 5.0
     assert duration.remaining == 0.0  # Should not be negative
     assert duration.is_expired is True
+
+
+def test_bound_duration_follows_clock():
+    wheel = TimingWheel()
+    duration = Duration(length=10.0)
+    duration.bind(wheel)
+
+    wheel.advance(4.0)
+    assert duration.elapsed == 4.0
+    assert duration.remaining == 6.0
+    assert duration.update(100.0) is False
+
+    wheel.advance(6.0)
+    assert duration.is_expired is True
+
+
+def test_bind_keeps_elapsed():
+    wheel = TimingWheel()
+    wheel.advance(20.0)
+    duration = Duration(length=10.0)
+    duration.update(3.0)
+
+    duration.bind(wheel)
+    wheel.advance(2.0)
+
+    assert duration.elapsed == pytest.approx(5.0)
+
+
+def test_bound_duration_calls_on_expire():
+    wheel = TimingWheel()
+    expired = []
+    duration = Duration(length=2.0)
+    duration.bind(wheel, lambda: expired.append(duration))
+
+    wheel.advance(1.0)
+    assert expired == []
+
+    wheel.advance(1.0)
+    assert expired == [duration]
+
+
+def test_bound_reset_reschedules():
+    wheel = TimingWheel()
+    expired = []
+    duration = Duration(length=2.0)
+    duration.bind(wheel, lambda: expired.append(duration))
+
+    wheel.advance(1.5)
+    duration.reset()
+    wheel.advance(1.5)
+
+    assert duration.elapsed == 1.5
+    assert expired == []
+    wheel.advance(0.5)
+    assert expired == [duration]
+
+
+def test_bound_length_change_reschedules():
+    wheel = TimingWheel()
+    expired = []
+    duration = Duration(length=2.0)
+    duration.bind(wheel, lambda: expired.append(duration))
+
+    duration.length = 5.0
+    wheel.advance(3.0)
+    assert expired == []
+
+    wheel.advance(2.0)
+    assert expired == [duration]
+
+
+def test_unbind():
+    wheel = TimingWheel()
+    expired = []
+    duration = Duration(length=2.0)
+    duration.bind(wheel, lambda: expired.append(duration))
+
+    wheel.advance(1.0)
+    duration.unbind()
+    wheel.advance(5.0)
+
+    assert expired == []
+    assert duration.is_bound is False
+    assert duration.elapsed == 1.0
+    assert duration.update(1.0) is True
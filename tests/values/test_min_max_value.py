@@ -68,3 +68,41 @@ def test_update_triggers_max_modifier_update():
     assert m.max.value == 40.0
     m.update(1.5)  # Update with elapsed time greater than modifier duration
     assert m.max.value == 20.0
+
+
+def test_value_changed_callback(mocker):
+    value_changed = mocker.Mock()
+    m = MinMaxValue(value=10, min=0, max=20, value_changed=value_changed)
+
+    m.value = 15
+    m.value = 15
+    m.value = 25
+    m.value = 30
+
+    assert value_changed.call_count == 2
+
+
+def test_value_changed_callback_on_min_update(mocker):
+    value_changed = mocker.Mock()
+    m = MinMaxValue(value=10, min=0, max=20, value_changed=value_changed)
+
+    m.min = 5
+    assert value_changed.call_count == 1
+    m.min = 15
+    assert value_changed.call_count == 2
+
+
+def test_max_changed_callback(mocker):
+    value_changed = mocker.Mock()
+    max_changed = mocker.Mock()
+    m = MinMaxValue(
+        value=10, min=0, max=20, value_changed=value_changed, max_changed=max_changed
+    )
+
+    m.max.modifiers.add(ValueModifier(2.0, duration=1.0))
+    assert max_changed.call_count == 1
+    assert value_changed.call_count == 0
+
+    m.max.base = 4
+    assert max_changed.call_count == 2
+    assert value_changed.call_count == 1
@@ -1,6 +1,7 @@
 from unittest.mock import Mock
 import pytest
 from pytest_mock import MockerFixture
+from aura.timing import TimingWheel
 from aura.values import ValueModifier, ValueModifiers
 
 
@@ -166,3 +167,55 @@ def test_no_callback_provided():
     mgr.update(0.2)
 
     assert len(mgr) == 0
+
+
+def test_bound_modifiers_expire_on_wheel(mock_callback):
+    """Test that modifiers bound to a wheel expire when the wheel reaches their end."""
+    wheel = TimingWheel()
+    mgr = ValueModifiers(mock_callback)
+    mgr.bind(wheel)
+    short = ValueModifier(2.0, 1.0)
+    long = ValueModifier(3.0, 5.0)
+    mgr.add(short)
+    mgr.add(long)
+    mock_callback.reset_mock()
+
+    mgr.update(10.0)  # Ignored once bound
+    assert len(mgr) == 2
+
+    wheel.advance(1.0)
+    assert list(mgr) == [long]
+    mock_callback.assert_called_once()
+
+    wheel.advance(4.0)
+    assert len(mgr) == 0
+
+
+def test_bind_existing_modifiers(mock_callback):
+    """Test that binding keeps the time the existing modifiers already ran."""
+    wheel = TimingWheel()
+    mgr = ValueModifiers(mock_callback)
+    modifier = ValueModifier(2.0, 2.0)
+    mgr.add(modifier)
+    mgr.update(1.5)
+
+    mgr.bind(wheel)
+    wheel.advance(0.5)
+
+    assert len(mgr) == 0
+
+
+def test_removed_modifier_unbinds(mock_callback):
+    """Test that a removed modifier stops following the wheel."""
+    wheel = TimingWheel()
+    mgr = ValueModifiers(mock_callback)
+    mgr.bind(wheel)
+    modifier = ValueModifier(2.0, 2.0)
+    mgr.add(modifier)
+
+    wheel.advance(1.0)
+    mgr.remove(modifier)
+
+    assert modifier.duration.is_bound is False
+    assert modifier.duration.elapsed == 1.0
+    assert len(wheel) == 0
@@ -0,0 +1,227 @@
+import time
+
+import pytest
+from aura.aura import Aura, DamageEvent
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.watchdog import TickOverrun, TickWatchdog
+from aura.world import AuraWorld
+from conftest import NoopSpell
+
+BUDGET_NS = 1_000_000
+
+
+def busy_wait(nanoseconds: int) -> None:
+    end = time.perf_counter_ns() + nanoseconds
+    while time.perf_counter_ns() < end:
+        pass
+
+
+class SlowSpell(NoopSpell):
+    def __init__(self, delay_ns: int = 2 * BUDGET_NS) -> None:
+        super().__init__([])
+        self.delay_ns = delay_ns
+        self.elapsed: list[float] = []
+
+    def update(self, aura, elapsed_time: float) -> bool:
+        self.elapsed.append(elapsed_time)
+        busy_wait(self.delay_ns)
+        return False
+
+
+class SlowExpiringSpell(SlowSpell):
+    def update(self, aura, elapsed_time: float) -> bool:
+        super().update(aura, elapsed_time)
+        return True
+
+
+class SlowShieldSpell(NoopSpell):
+    HANDLED_EVENTS = (DamageEvent,)
+
+    def modify_event(self, aura, event) -> None:
+        busy_wait(2 * BUDGET_NS)
+
+
+class DamagingSpell(NoopSpell):
+    def update(self, aura, elapsed_time: float) -> bool:
+        aura.process_event(DamageEvent(1.0))
+        return False
+
+
+class WatchdogFixture:
+    def __init__(self) -> None:
+        self.aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+        self.overruns: list[TickOverrun] = []
+        self.defer = False
+        self.watchdog = TickWatchdog(
+            budget_ns=BUDGET_NS, capacity=3, on_overrun=self.on_overrun
+        )
+
+    def on_overrun(self, overrun: TickOverrun) -> bool:
+        self.overruns.append(overrun)
+        return self.defer
+
+
+@pytest.fixture
+def fixture() -> WatchdogFixture:
+    return WatchdogFixture()
+
+
+def test_update_within_budget_is_not_recorded(fixture: WatchdogFixture) -> None:
+    fixture.aura.add_spell(RegenSpell(regen_rate=1.0, duration=10.0))
+
+    assert fixture.watchdog.update(fixture.aura, 0.1) is False
+
+    assert fixture.watchdog.overruns == []
+    assert fixture.overruns == []
+    assert fixture.watchdog.overrun_count == 0
+
+
+def test_overrun_records_composition_and_slowest_update(
+    fixture: WatchdogFixture,
+) -> None:
+    for _ in range(3):
+        fixture.aura.add_spell(IgniteSpell(damage_per_second=1.0, duration=10.0))
+    fixture.aura.add_spell(SlowSpell())
+
+    fixture.watchdog.update(fixture.aura, 0.1)
+
+    [overrun] = fixture.watchdog.overruns
+    assert fixture.overruns == [overrun]
+    assert overrun.aura is fixture.aura
+    assert overrun.budget_ns == BUDGET_NS
+    assert overrun.elapsed_ns > BUDGET_NS
+    assert overrun.spells == {"IgniteSpell": 3, "SlowSpell": 1}
+    assert overrun.slowest is not None
+    assert overrun.slowest.name == "SlowSpell.update"
+    assert overrun.slowest.elapsed_ns >= 2 * BUDGET_NS
+    assert overrun.deferred is False
+
+
+def test_overrun_reports_slow_modify_event(fixture: WatchdogFixture) -> None:
+    fixture.aura.add_spell(SlowShieldSpell([]))
+    fixture.aura.add_spell(DamagingSpell([]))
+
+    fixture.watchdog.update(fixture.aura, 0.1)
+
+    [overrun] = fixture.watchdog.overruns
+    assert overrun.slowest.name == "SlowShieldSpell.modify_event"
+
+
+def test_spell_hooks_are_not_timed_outside_the_watchdog(
+    fixture: WatchdogFixture,
+) -> None:
+    fixture.aura.add_spell(SlowSpell())
+    fixture.watchdog.update(fixture.aura, 0.1)
+
+    assert fixture.aura._hook_timer is None
+
+
+def test_ring_buffer_keeps_most_recent_overruns(fixture: WatchdogFixture) -> None:
+    fixture.aura.add_spell(SlowSpell())
+
+    for _ in range(5):
+        fixture.watchdog.update(fixture.aura, 0.1)
+
+    assert fixture.watchdog.overruns == fixture.overruns[2:]
+    assert fixture.watchdog.overrun_count == 5
+
+    fixture.watchdog.clear()
+
+    assert fixture.watchdog.overruns == []
+    assert fixture.watchdog.overrun_count == 0
+
+
+def test_callback_defers_overrun(fixture: WatchdogFixture) -> None:
+    fixture.aura.add_spell(SlowSpell())
+    fixture.defer = True
+
+    assert fixture.watchdog.update(fixture.aura, 0.1) is True
+    assert fixture.watchdog.overruns[0].deferred is True
+
+
+def test_invalid_configuration() -> None:
+    with pytest.raises(ValueError):
+        TickWatchdog(budget_ns=0)
+    with pytest.raises(ValueError):
+        TickWatchdog(budget_ns=BUDGET_NS, capacity=0)
+
+
+def test_world_defers_aura_to_next_tick(fixture: WatchdogFixture) -> None:
+    world = AuraWorld()
+    slow = SlowSpell()
+    fixture.aura.add_spell(slow)
+    other = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+    counted = SlowSpell(delay_ns=0)
+    other.add_spell(counted)
+    world.add(fixture.aura)
+    world.add(other)
+    world.watchdog = fixture.watchdog
+    fixture.defer = True
+
+    world.update(0.1)
+    world.update(0.2)
+    assert world.is_awake(fixture.aura)
+    world.update(0.3)
+
+    # Skipped the second tick and caught up on the third
+    assert slow.elapsed == [0.1, pytest.approx(0.5)]
+    assert counted.elapsed == [0.1, 0.2, 0.3]
+    assert [overrun.aura for overrun in fixture.overruns] == [
+        fixture.aura,
+        fixture.aura,
+    ]
+
+
+def test_removed_aura_forgets_deferral(fixture: WatchdogFixture) -> None:
+    world = AuraWorld()
+    slow = SlowSpell()
+    fixture.aura.add_spell(slow)
+    world.add(fixture.aura)
+    world.watchdog = fixture.watchdog
+    fixture.defer = True
+    world.update(0.1)
+    world.update(0.1)
+
+    world.remove(fixture.aura)
+    world.add(fixture.aura)
+    fixture.defer = False
+    world.update(0.1)
+
+    assert slow.elapsed == [0.1, 0.1]
+
+
+def test_sleeping_aura_forgets_deferral(fixture: WatchdogFixture) -> None:
+    world = AuraWorld()
+    fixture.aura.add_spell(SlowExpiringSpell())
+    world.add(fixture.aura)
+    world.watchdog = fixture.watchdog
+    fixture.defer = True
+    world.update(0.1)
+
+    assert not world.is_awake(fixture.aura)
+    assert not world._deferred
+
+    counted = SlowSpell(delay_ns=0)
+    fixture.aura.add_spell(counted)
+    world.update(0.2)
+
+    assert counted.elapsed == [0.2]
+
+
+def test_world_catches_up_after_watchdog_is_removed(
+    fixture: WatchdogFixture,
+) -> None:
+    world = AuraWorld()
+    slow = SlowSpell(delay_ns=0)
+    fixture.aura.add_spell(slow)
+    world.add(fixture.aura)
+    world.watchdog = TickWatchdog(budget_ns=1, on_overrun=lambda overrun: True)
+    world.update(0.1)
+
+    world.watchdog = None
+    world.update(0.1)
+    world.update(0.1)
+    world.update(0.1)
+
+    assert slow.elapsed == [0.1, pytest.approx(0.2), 0.1]
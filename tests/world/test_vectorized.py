@@ -0,0 +1,215 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from aura.aura import Aura, DamageEvent, HealEvent
+from aura.spell.ambient_magic_regen import AmbientMagicRegenSpell
+from aura.spell.elemental.charge import ChargeSpell
+from aura.spell.elemental.earth_shield import EarthShieldSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.spell.elemental.regen import RegenSpell
+from aura.values import ValueModifier
+from aura.vectorized import VectorizedWorld
+from aura.watchdog import TickWatchdog
+from aura.world import AuraWorld
+from conftest import MockEventListener
+
+
+def loadout(aura: Aura, index: int) -> None:
+    """Adds a mix of over time spells, different for each index."""
+    aura.magic.value = 10.0 + index * 7.0 % 90.0
+    aura.add_spell(RegenSpell(regen_rate=4.0 + index % 3, duration=2.0 + index % 5))
+    aura.add_spell(IgniteSpell(damage_per_second=3.0 + index % 4, duration=1.5))
+    if index % 2:
+        aura.add_spell(AmbientMagicRegenSpell(amount_per_second=1.5))
+    if index % 3 == 0:
+        aura.add_spell(IgniteSpell(damage_per_second=2.0, duration=3.0 + index % 2))
+    if index % 4 == 0:
+        aura.add_spell(ChargeSpell(healing_multiplier=1.5, duration=1.0))
+    if index % 5 == 0:
+        aura.magic.max.modifiers.add(ValueModifier(0.5, duration=0.8))
+    aura.coalesce_damage = index % 7 != 0
+
+
+class VectorizedFixture:
+    def __init__(self, aura_count: int = 24) -> None:
+        self.world = VectorizedWorld()
+        self.reference = AuraWorld()
+        self.auras: list[Aura] = []
+        self.expected: list[Aura] = []
+        for index in range(aura_count):
+            for world, auras in (
+                (self.world, self.auras),
+                (self.reference, self.expected),
+            ):
+                aura = Aura(min_magic=0.0, max_magic=100.0, cast_delay=1.0)
+                loadout(aura, index)
+                world.add(aura)
+                auras.append(aura)
+
+    def update(self, elapsed_time: float, ticks: int = 1) -> None:
+        for _ in range(ticks):
+            self.world.update(elapsed_time)
+            self.reference.update(elapsed_time)
+
+    def assert_matches(self) -> None:
+        self.world.sync()
+        for aura, expected in zip(self.auras, self.expected):
+            assert aura.magic.value == expected.magic.value
+            assert aura.magic.max.value == expected.magic.max.value
+            assert aura.wheel.now == expected.wheel.now
+            assert [type(spell) for spell in aura.spells] == [
+                type(spell) for spell in expected.spells
+            ]
+            for spell, expected_spell in zip(aura.spells, expected.spells):
+                if hasattr(spell, "duration"):
+                    assert spell.duration.elapsed == expected_spell.duration.elapsed
+
+
+@pytest.fixture
+def fixture() -> VectorizedFixture:
+    return VectorizedFixture()
+
+
+def test_update_vectorizes_auras(fixture: VectorizedFixture) -> None:
+    fixture.update(0.1)
+
+    assert fixture.world.vectorized_count > 0
+    assert fixture.world.awake_count == len(fixture.auras)
+    for aura in fixture.auras:
+        assert fixture.world.is_awake(aura)
+
+
+def test_update_matches_aura_world(fixture: VectorizedFixture) -> None:
+    """Test that spells expiring and timers firing give the same results."""
+    for elapsed_time in (0.0166, 0.1, 0.033, 0.25):
+        fixture.update(elapsed_time, ticks=10)
+
+        fixture.assert_matches()
+
+
+def test_update_matches_without_sync(fixture: VectorizedFixture) -> None:
+    fixture.update(0.0166, ticks=200)
+
+    fixture.assert_matches()
+    assert fixture.world.vectorized_count == 0
+
+
+def test_event_releases_aura(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05, ticks=3)
+    aura = fixture.auras[1]
+    assert aura in fixture.world._vectorized
+
+    for target in (aura, fixture.expected[1]):
+        target.process_event(DamageEvent(5.0))
+        target.process_event(HealEvent(2.0))
+
+    assert aura not in fixture.world._vectorized
+    assert aura.magic.value == fixture.expected[1].magic.value
+    fixture.update(0.05, ticks=3)
+    fixture.assert_matches()
+
+
+def test_spell_changes_release_aura(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05, ticks=3)
+
+    for auras in (fixture.auras, fixture.expected):
+        auras[2].add_spell(EarthShieldSpell(reduction=0.5, max_hits=3, duration=5.0))
+        auras[3].add_spell(ChargeSpell(healing_multiplier=2.0, duration=5.0))
+        auras[4].remove_spell(auras[4].spells.get_by_class(RegenSpell)[0])
+    fixture.update(0.05, ticks=3)
+
+    # Shields do more than scale the damage
+    assert fixture.auras[2] not in fixture.world._vectorized
+    assert fixture.auras[3] in fixture.world._vectorized
+    fixture.assert_matches()
+
+
+def test_multiplier_changes_sync(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05, ticks=3)
+
+    for aura in (fixture.auras[0], fixture.expected[0]):
+        aura.spells.get_by_class(ChargeSpell)[0].level = 3
+    fixture.update(0.05, ticks=3)
+
+    fixture.assert_matches()
+
+
+def test_listeners_keep_object_path(fixture: VectorizedFixture) -> None:
+    aura = fixture.auras[5]
+    aura.event_listeners.append(MockEventListener())
+
+    fixture.update(0.05, ticks=3)
+
+    assert aura not in fixture.world._vectorized
+    assert fixture.world.is_awake(aura)
+
+
+def test_metrics_keep_object_path(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05)
+
+    fixture.world.enable_metrics()
+    fixture.update(0.05)
+
+    assert fixture.world.vectorized_count == 0
+    assert fixture.world.collect_metrics().events[DamageEvent] > 0
+
+
+def test_sync_writes_back(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05, ticks=3)
+    aura = fixture.auras[1]
+    magic = aura.magic.value
+
+    fixture.world.sync()
+
+    assert fixture.world.vectorized_count == 0
+    assert aura.magic.value != magic
+    assert aura.magic.value == fixture.expected[1].magic.value
+
+
+def test_collect_changes_syncs(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05)
+    fixture.world.collect_changes()
+
+    fixture.update(0.05)
+    changes = dict(fixture.world.collect_changes())
+
+    assert set(changes) == set(fixture.auras)
+
+
+def test_remove_writes_back(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05, ticks=3)
+    aura = fixture.auras[1]
+
+    fixture.world.remove(aura)
+
+    assert aura.magic.value == fixture.expected[1].magic.value
+    magic = aura.magic.value
+    fixture.update(0.05)
+    assert aura not in fixture.world
+    assert not fixture.world.is_awake(aura)
+    assert aura.magic.value == magic
+
+
+def test_watchdog_uses_object_path(fixture: VectorizedFixture) -> None:
+    fixture.update(0.05)
+    fixture.world.watchdog = TickWatchdog(budget_ns=10**9)
+
+    fixture.update(0.05, ticks=3)
+
+    assert fixture.world.vectorized_count == 0
+    fixture.assert_matches()
+
+
+def test_multiplier_changes_only_release_their_auras(
+    fixture: VectorizedFixture,
+) -> None:
+    fixture.update(0.05, ticks=3)
+    assert fixture.auras[4] in fixture.world._vectorized
+
+    for aura in (fixture.auras[0], fixture.expected[0]):
+        aura.spells.get_by_class(ChargeSpell)[0].healing_multiplier = 3.0
+    fixture.update(0.05)
+
+    assert fixture.auras[4] in fixture.world._vectorized
+    fixture.assert_matches()
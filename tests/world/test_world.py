@@ -0,0 +1,279 @@
+import pytest
+from aura.aura import (
+    Aura,
+    AuraChange,
+    AuraEvent,
+    DamageEvent,
+    EventListener,
+    HealEvent,
+    Spell,
+)
+from aura.metrics import AuraMetrics
+from aura.spell.elemental.haste import HasteSpell
+from aura.spell.elemental.ignite import IgniteSpell
+from aura.values import ValueModifier
+from aura.world import AuraWorld
+from conftest import AuraFixture
+
+
+class WorldFixture:
+    def __init__(self, aura_count: int = 3) -> None:
+        self.world = AuraWorld()
+        self.auras: list[Aura] = [AuraFixture().aura for _ in range(aura_count)]
+        for aura in self.auras:
+            self.world.add(aura)
+
+
+@pytest.fixture
+def fixture() -> WorldFixture:
+    return WorldFixture()
+
+
+def test_add_auras(fixture: WorldFixture) -> None:
+    assert len(fixture.world) == len(fixture.auras)
+    assert list(fixture.world) == fixture.auras
+    for aura in fixture.auras:
+        assert aura in fixture.world
+
+
+def test_add_aura_twice(fixture: WorldFixture) -> None:
+    fixture.world.add(fixture.auras[0])
+
+    assert len(fixture.world) == len(fixture.auras)
+
+
+def test_remove_aura(fixture: WorldFixture) -> None:
+    removed = fixture.auras[0]
+
+    fixture.world.remove(removed)
+
+    assert removed not in fixture.world
+    assert len(fixture.world) == len(fixture.auras) - 1
+    assert set(fixture.world) == set(fixture.auras[1:])
+
+
+def test_remove_missing_aura(fixture: WorldFixture) -> None:
+    fixture.world.remove(AuraFixture().aura)
+
+    assert len(fixture.world) == len(fixture.auras)
+
+
+def test_update_matches_aura_update(fixture: WorldFixture) -> None:
+    reference = [
+        Aura(aura.magic.min, aura.magic.max.base, aura.cast_delay.base)
+        for aura in fixture.auras
+    ]
+    for aura in fixture.auras + reference:
+        aura.magic.value = 50.0
+        aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+        aura.add_spell(HasteSpell(duration=1.0, cast_delay_percentage=0.5))
+        aura.magic.max.modifiers.add(ValueModifier(2.0, duration=1.5))
+
+    for _ in range(5):
+        fixture.world.update(0.5)
+        for aura in reference:
+            aura.update(0.5)
+
+    for aura, expected in zip(fixture.auras, reference):
+        assert aura.magic.value == expected.magic.value
+        assert aura.magic.max.value == expected.magic.max.value
+        assert aura.cast_delay.value == expected.cast_delay.value
+        assert len(aura.spells) == len(expected.spells) == 0
+
+
+def test_update_records_aura_metrics(fixture: WorldFixture) -> None:
+    aura = fixture.auras[0]
+    aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+    aura.metrics = AuraMetrics()
+
+    fixture.world.update(0.5)
+    fixture.world.update(0.5)
+
+    assert aura.metrics.tick_ns.count == 2
+
+
+class HealingListener(EventListener):
+    """Raises three heal events for each damage event."""
+
+    def on_spell_event(self, aura: Aura, event: AuraEvent) -> None:
+        if isinstance(event, DamageEvent):
+            for _ in range(3):
+                aura.process_event(HealEvent(1.0))
+
+
+def test_update_drains_events_past_the_cap(fixture: WorldFixture) -> None:
+    aura = fixture.auras[0]
+    aura.max_events_per_drain = 1
+    aura.event_listeners.append(HealingListener())
+    aura.process_event(DamageEvent(1.0))
+    assert aura.pending_events == 3
+
+    fixture.world.update(0.1)
+
+    assert aura.pending_events == 2
+    assert fixture.world.is_awake(aura)
+
+
+def test_update_after_remove(fixture: WorldFixture) -> None:
+    removed = fixture.auras[1]
+    removed.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+    kept = fixture.auras[2]
+    kept.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+    removed_magic = removed.magic.value
+    kept_magic = kept.magic.value
+
+    fixture.world.remove(removed)
+    fixture.world.update(1.0)
+
+    assert removed.magic.value == removed_magic
+    assert kept.magic.value == kept_magic - 10.0
+
+
+def test_update_reports_timings(fixture: WorldFixture) -> None:
+    fixture.world.update(0.1)
+
+    timings = fixture.world.last_tick
+    assert timings.aura_count == len(fixture.auras)
+    assert timings.total_ns >= timings.values_ns + timings.spells_ns
+    assert timings.ns_per_aura == timings.total_ns / len(fixture.auras)
+
+
+def test_process_event_many(fixture: WorldFixture) -> None:
+    initial = [aura.magic.value for aura in fixture.auras]
+
+    applied = fixture.world.process_event_many(fixture.auras, lambda: DamageEvent(5.0))
+
+    assert applied == len(fixture.auras)
+    for aura, magic in zip(fixture.auras, initial):
+        assert aura.magic.value == magic - 5.0
+
+
+def test_process_event_many_counts_canceled(fixture: WorldFixture) -> None:
+    class CancelingSpell(Spell):
+        def __init__(self) -> None:
+            super().__init__(tags=[])
+
+        def modify_event(self, aura: Aura, event: AuraEvent) -> None:
+            event.is_canceled = True
+
+    fixture.auras[0].add_spell(CancelingSpell())
+
+    applied = fixture.world.process_event_many(fixture.auras, lambda: DamageEvent(5.0))
+
+    assert applied == len(fixture.auras) - 1
+
+
+def test_idle_auras_sleep(fixture: WorldFixture) -> None:
+    assert fixture.world.awake_count == 0
+
+    fixture.world.update(1.0)
+
+    assert fixture.world.last_tick.awake_count == 0
+    for aura in fixture.auras:
+        assert not fixture.world.is_awake(aura)
+
+
+def test_add_spell_wakes_aura(fixture: WorldFixture) -> None:
+    aura = fixture.auras[0]
+    magic = aura.magic.value
+
+    aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+
+    assert fixture.world.is_awake(aura)
+    assert fixture.world.awake_count == 1
+    fixture.world.update(1.0)
+    assert aura.magic.value == magic - 10.0
+
+
+def test_aura_sleeps_once_spells_expire(fixture: WorldFixture) -> None:
+    aura = fixture.auras[0]
+    aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+    aura.add_spell(HasteSpell(duration=3.0, cast_delay_percentage=0.5))
+
+    fixture.world.update(2.0)
+    assert fixture.world.is_awake(aura)
+
+    fixture.world.update(1.0)
+    assert not fixture.world.is_awake(aura)
+    assert len(aura.spells) == 0
+
+
+def test_modifier_wakes_aura(fixture: WorldFixture) -> None:
+    aura = fixture.auras[0]
+    original_max = aura.magic.max.value
+
+    aura.magic.max.modifiers.add(ValueModifier(2.0, duration=1.0))
+
+    assert fixture.world.is_awake(aura)
+    fixture.world.update(1.0)
+    assert aura.magic.max.value == original_max
+    assert not fixture.world.is_awake(aura)
+
+
+def test_event_wakes_aura(fixture: WorldFixture) -> None:
+    aura = fixture.auras[0]
+
+    aura.process_event(DamageEvent(1.0))
+
+    assert fixture.world.is_awake(aura)
+    fixture.world.update(0.1)
+    assert not fixture.world.is_awake(aura)
+
+
+def test_removed_aura_leaves_tick_set(fixture: WorldFixture) -> None:
+    aura = fixture.auras[0]
+    aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+
+    fixture.world.remove(aura)
+
+    assert fixture.world.awake_count == 0
+    aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+    assert fixture.world.awake_count == 0
+
+
+def test_aura_added_with_spells_is_awake() -> None:
+    aura = AuraFixture().aura
+    aura.add_spell(IgniteSpell(damage_per_second=10.0, duration=2.0))
+    world = AuraWorld()
+
+    world.add(aura)
+
+    assert world.is_awake(aura)
+
+
+def test_collect_changes(fixture: WorldFixture) -> None:
+    fixture.world.collect_changes()
+    first, second, third = fixture.auras
+    third.cast_delay.base = 2.0
+    first.process_event(DamageEvent(1.0))
+    third.process_event(DamageEvent(1.0))
+
+    changes = fixture.world.collect_changes()
+
+    assert changes == [
+        (third, AuraChange.CAST_DELAY | AuraChange.MAGIC),
+        (first, AuraChange.MAGIC),
+    ]
+    assert fixture.world.collect_changes() == []
+
+
+def test_collect_changes_skips_removed_auras(fixture: WorldFixture) -> None:
+    fixture.world.collect_changes()
+    aura = fixture.auras[0]
+    aura.process_event(DamageEvent(1.0))
+
+    fixture.world.remove(aura)
+
+    assert fixture.world.collect_changes() == []
+    aura.process_event(DamageEvent(1.0))
+    assert fixture.world.collect_changes() == []
+
+
+def test_added_aura_changes_are_collected() -> None:
+    aura = AuraFixture().aura
+    aura.cast_delay.base = 2.0
+    world = AuraWorld()
+
+    world.add(aura)
+
+    assert world.collect_changes() == [(aura, AuraChange.CAST_DELAY)]